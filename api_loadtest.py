@@ -0,0 +1,213 @@
+import argparse
+import asyncio
+import base64
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from urllib.parse import quote, urlsplit
+
+from benchmark import FIRST_NAMES, percentile
+
+
+class Client:
+    """One keep-alive HTTP/1.1 connection, reopened after errors."""
+
+    def __init__(self, host, port, authorization):
+        self.host = host
+        self.port = port
+        self.authorization = authorization
+        self.reader = self.writer = None
+
+    async def request(self, method, target, payload=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = b"" if payload is None else json.dumps(payload).encode()
+        head = (f"{method} {target} HTTP/1.1\r\nHost: {self.host}\r\n"
+                f"Authorization: {self.authorization}\r\nContent-Length: {len(body)}\r\n"
+                + ("Content-Type: application/json\r\n" if body else "") + "\r\n")
+        try:
+            self.writer.write(head.encode("latin-1") + body)
+            await self.writer.drain()
+            status = int((await self.reader.readline()).split()[1])
+            length, closing = 0, False
+            while True:
+                line = await self.reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                name = name.strip().lower()
+                if name == "content-length":
+                    length = int(value)
+                elif name == "connection" and value.strip().lower() == "close":
+                    closing = True
+            data = await self.reader.readexactly(length)
+        except (ConnectionError, IndexError, ValueError, asyncio.IncompleteReadError):
+            self.close()
+            raise
+        if closing:
+            self.close()
+        return status, data
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+class Results:
+    def __init__(self):
+        self.latencies = {}  # operation -> [seconds]
+        self.statuses = {}   # operation -> {status: count}
+
+    def add(self, operation, seconds, status):
+        self.latencies.setdefault(operation, []).append(seconds)
+        counts = self.statuses.setdefault(operation, {})
+        counts[status] = counts.get(status, 0) + 1
+
+    def summary(self, elapsed):
+        summary = {}
+        for operation, samples in sorted(self.latencies.items()):
+            ordered = sorted(samples)
+            summary[operation] = {
+                "count": len(ordered),
+                "rps": len(ordered) / elapsed,
+                "p50_ms": percentile(ordered, 50) * 1000,
+                "p95_ms": percentile(ordered, 95) * 1000,
+                "p99_ms": percentile(ordered, 99) * 1000,
+                "max_ms": ordered[-1] * 1000,
+                "statuses": {str(status): count for status, count in sorted(self.statuses[operation].items())}
+            }
+        return summary
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r} (one of {', '.join(OPERATIONS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# Operations: (worker state, rng, highest emp_id) -> (method, target, payload)
+def op_list(state, rng, max_id):
+    # Scroll: follow the cursor of the previous page, start over at the end
+    target = "/employees?limit=100"
+    if state.get("cursor"):
+        target += "&cursor=" + state["cursor"]
+    return "GET", target, None
+
+
+def op_get(state, rng, max_id):
+    return "GET", f"/employees/{rng.randint(1, max_id)}", None
+
+
+def op_search(state, rng, max_id):
+    name = rng.choice(FIRST_NAMES)
+    return "GET", f"/employees/search?limit=20&q={quote(name[:rng.randint(2, len(name))])}", None
+
+
+def op_filter(state, rng, max_id):
+    post = rng.choice(["Developer", "Manager", "HR", "Intern"])
+    return "GET", f"/employees?limit=100&post={post}&sort=salary&desc=1", None
+
+
+def op_promote(state, rng, max_id):
+    ids = [rng.randint(1, max_id) for _ in range(rng.randint(1, 5))]
+    return "POST", "/employees/promote", {"ids": ids, "salary": rng.randint(20000, 100000)}
+
+
+OPERATIONS = {"list": op_list, "get": op_get, "search": op_search, "filter": op_filter, "promote": op_promote}
+
+
+async def worker(index, args, authorization, results, deadline, max_id):
+    url = urlsplit(args.url)
+    client = Client(url.hostname, url.port or 80, authorization)
+    rng = random.Random(args.seed + index)
+    names, weights = zip(*args.mix.items())
+    state = {}
+    while time.perf_counter() < deadline:
+        operation = rng.choices(names, weights)[0]
+        method, target, payload = OPERATIONS[operation](state, rng, max_id)
+        started = time.perf_counter()
+        try:
+            status, data = await client.request(method, target, payload)
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+            status, data = 0, b""  # Connection refused or dropped
+            await asyncio.sleep(0.05)
+        results.add(operation, time.perf_counter() - started, status)
+        if operation == "list":
+            state["cursor"] = json.loads(data).get("next_cursor") if status == 200 else None
+    client.close()
+
+
+async def highest_id(args, authorization):
+    """Largest emp_id, so lookups hit existing rows (needs a role that may sort)."""
+    url = urlsplit(args.url)
+    client = Client(url.hostname, url.port or 80, authorization)
+    try:
+        status, data = await client.request("GET", "/employees?limit=1&sort=emp_id&desc=1")
+        employees = json.loads(data).get("employees") if status == 200 else None
+        return employees[0]["emp_id"] if employees else 1000
+    finally:
+        client.close()
+
+
+async def load_test(args):
+    token = base64.b64encode(f"{args.user}:{args.password}".encode()).decode()
+    authorization = f"Basic {token}"
+    max_id = args.max_id or await highest_id(args, authorization)
+    results = Results()
+    started = time.perf_counter()
+    deadline = started + args.duration
+    await asyncio.gather(*(worker(i, args, authorization, results, deadline, max_id)
+                           for i in range(args.concurrency)))
+    return results.summary(time.perf_counter() - started)
+
+
+def report(summary, out=print):
+    total = sum(result["count"] for result in summary.values())
+    out(f"{'operation':10} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+        f"{'max ms':>8}  statuses")
+    for operation, result in summary.items():
+        statuses = " ".join(f"{status}:{count}" for status, count in result["statuses"].items())
+        out(f"{operation:10} {result['count']:9,} {result['rps']:9,.0f} {result['p50_ms']:8.1f} "
+            f"{result['p95_ms']:8.1f} {result['p99_ms']:8.1f} {result['max_ms']:8.1f}  {statuses}")
+    out(f"{'total':10} {total:9,} {sum(r['rps'] for r in summary.values()):9,.0f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the employee HTTP API (employee_api.py)")
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="API base URL")
+    parser.add_argument("--user", default="admin", help="login (default admin)")
+    parser.add_argument("--password", default="admin123")
+    parser.add_argument("--concurrency", type=int, default=64, help="parallel keep-alive connections (default 64)")
+    parser.add_argument("--duration", type=float, default=10, help="seconds to run (default 10)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("list=4,get=4,search=1,filter=1"),
+                        help="operation weights, e.g. list=4,get=4,search=1,filter=1,promote=1 "
+                             "(promote writes to the database; default: read-only)")
+    parser.add_argument("--max-id", type=int, help="highest emp_id to look up (default: asked from the API)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"{args.concurrency} connections for {args.duration:g}s against {args.url}")
+    summary = asyncio.run(load_test(args))
+    report(summary)
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    failed = sum(count for result in summary.values()
+                 for status, count in result["statuses"].items() if not status.startswith("2"))
+    if failed:
+        print(f"{failed} request(s) failed", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import hashlib
+import importlib.util
+import os
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+RAW_MAGIC = b"EMPIMG01"
+RAW_HEADER = struct.Struct("<8s4sII")  # magic, mode, width, height
+
+
+def pil_available():
+    """Whether Pillow is installed, without importing it."""
+    return importlib.util.find_spec("PIL") is not None
+
+
+def default_cache_dir():
+    """ASSET_CACHE_DIR, or a per-user cache directory."""
+    if os.getenv("ASSET_CACHE_DIR"):
+        return Path(os.getenv("ASSET_CACHE_DIR"))
+    base = os.getenv("XDG_CACHE_HOME") or os.getenv("LOCALAPPDATA") or Path.home() / ".cache"
+    return Path(base) / "employee-management" / "assets"
+
+
+class AssetCache:
+    """Resized page images, cached in memory (LRU) and on disk.
+
+    Entries are keyed by (file, mtime, file size, target size), so editing
+    an asset or asking for a new size simply misses. A memory hit returns
+    the resized PIL image directly; a disk hit reads the pixels back as raw
+    bytes, so neither path decodes the PNG or resamples it again. Only a
+    full miss opens the original and runs the LANCZOS resize.
+
+    Lookups are thread safe so images can be prepared off the Tk thread;
+    a caller asking for an image another thread is still building waits
+    for that result instead of resampling it twice. ``photo`` must still
+    be called on the Tk thread.
+    """
+
+    def __init__(self, directory=None, max_bytes=64 * 1024 * 1024,
+                 max_disk_bytes=256 * 1024 * 1024):
+        self.directory = Path(directory) if directory is not None else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.images = OrderedDict()  # key -> resized PIL image, least recent first
+        self.bytes = 0
+        self.lock = threading.Lock()
+        self.building = {}  # key -> Event set once the image is remembered
+        self.hits = self.disk_hits = self.misses = 0
+        self.disk_enabled = True
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            self.disk_enabled = False  # read-only home etc.; memory only
+
+    @staticmethod
+    def key(path, width, height=None):
+        """Cache key for ``path`` scaled to width x height (height None keeps the aspect ratio)."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        return (str(path), stat.st_mtime_ns, stat.st_size, int(width),
+                None if height is None else int(height))
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}.raw"
+
+    # Memory tier
+    def _remember(self, key, image):
+        size = len(image.getbands()) * image.width * image.height
+        with self.lock:
+            if key in self.images:
+                self.images.move_to_end(key)
+                return
+            self.images[key] = image
+            self.bytes += size
+            while self.bytes > self.max_bytes and len(self.images) > 1:
+                _, old = self.images.popitem(last=False)
+                self.bytes -= len(old.getbands()) * old.width * old.height
+
+    def _recall(self, key):
+        with self.lock:
+            image = self.images.get(key)
+            if image is not None:
+                self.images.move_to_end(key)
+            return image
+
+    # Disk tier
+    def _read_disk(self, key):
+        if not self.disk_enabled:
+            return None
+        from PIL import Image
+        try:
+            with open(self._disk_path(key), "rb") as fp:
+                magic, mode, width, height = RAW_HEADER.unpack(fp.read(RAW_HEADER.size))
+                if magic != RAW_MAGIC:
+                    return None
+                mode = mode.rstrip(b"\0").decode("ascii")
+                data = fp.read()
+            return Image.frombytes(mode, (width, height), data)
+        except (OSError, ValueError, struct.error):
+            return None  # missing or torn file; rebuild it
+
+    def _write_disk(self, key, image):
+        if not self.disk_enabled:
+            return
+        path = self._disk_path(key)
+        temp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp, "wb") as fp:
+                fp.write(RAW_HEADER.pack(RAW_MAGIC, image.mode.encode("ascii"),
+                                         image.width, image.height))
+                fp.write(image.tobytes())
+            os.replace(temp, path)  # readers never see a half-written file
+        except OSError:
+            try:
+                temp.unlink()
+            except OSError:
+                pass
+
+    def prune_disk(self):
+        """Delete the least recently written files until the disk tier fits max_disk_bytes."""
+        if not self.disk_enabled:
+            return
+        try:
+            entries = [(p.stat().st_mtime, p.stat().st_size, p) for p in self.directory.glob("*.raw")]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                path.unlink()
+                total -= size
+            except OSError:
+                pass
+
+    # Public API
+    def image(self, path, width, height=None):
+        """Return ``path`` resized to width x height as a PIL image.
+
+        With ``height=None`` the height follows the source aspect ratio.
+        """
+        key = self.key(path, width, height)
+        while True:
+            image = self._recall(key)
+            if image is not None:
+                self.hits += 1
+                return image
+            with self.lock:
+                done = self.building.get(key)
+                if done is None:
+                    self.building[key] = threading.Event()
+                    break
+            done.wait()  # Another thread is building it, e.g. the preloader
+
+        try:
+            image = self._build(key, path, width, height)
+            self._remember(key, image)
+        finally:
+            with self.lock:
+                self.building.pop(key).set()
+        return image
+
+    def _build(self, key, path, width, height):
+        from PIL import Image  # Imported here so startup does not pay for it
+
+        image = self._read_disk(key)
+        if image is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            with Image.open(path) as original:
+                if height is None:
+                    height = max(1, int(width * (original.height / original.width)))
+                if original.mode not in ("RGB", "RGBA"):
+                    original = original.convert("RGBA")
+                image = original.resize((int(width), int(height)), Image.LANCZOS)
+            self._write_disk(key, image)
+        return image
+
+    def photo(self, path, width, height=None):
+        """Return a Tk PhotoImage of ``path`` at the given size (Tk thread only)."""
+        from PIL import ImageTk
+        return ImageTk.PhotoImage(self.image(path, width, height))
+
+    def clear(self):
+        with self.lock:
+            self.images.clear()
+            self.bytes = 0
+
+
+_assets = None
+_assets_lock = threading.Lock()
+
+
+def get_asset_cache():
+    """Return the process-wide asset cache, creating it on first use."""
+    global _assets
+    with _assets_lock:
+        if _assets is None:
+            max_mb = int(os.getenv("ASSET_CACHE_MB", "64"))
+            _assets = AssetCache(max_bytes=max_mb * 1024 * 1024)
+            _assets.prune_disk()
+        return _assets
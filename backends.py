@@ -0,0 +1,264 @@
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+from functools import lru_cache
+from pathlib import Path
+
+
+SQLITE_SCHEMA = Path(__file__).resolve().parent / "database" / "sqlite_schema.sql"
+SQLITE_SCHEMA_VERSION = 4  # Last MySQL migration sqlite_schema.sql is equivalent to
+
+
+# Connection settings shared by create_connection and the pool
+def connection_settings():
+    return {
+        "host": os.getenv("DB_HOST", "localhost"),
+        "user": os.getenv("DB_USER", "root"),
+        "password": os.getenv("DB_PASSWORD", "Root"),
+        "database": os.getenv("DB_NAME", "emp")
+    }
+
+
+def default_data_dir():
+    """Per-user directory for the embedded database file."""
+    base = os.getenv("XDG_DATA_HOME") or os.getenv("LOCALAPPDATA") or Path.home() / ".local" / "share"
+    return Path(base) / "employee-management"
+
+
+class MySQLBackend:
+    """MySQL through mysql.connector, the default backend."""
+
+    name = "mysql"
+    prepared_statements = True
+
+    @property
+    def error(self):
+        import mysql.connector
+        return mysql.connector.Error
+
+    def connect(self):
+        import mysql.connector
+        return mysql.connector.connect(**connection_settings())
+
+    def pool_exhausted(self, message):
+        import mysql.connector
+        return mysql.connector.errors.PoolError(message)
+
+    def set_auto_increment(self, cursor, table, next_id):
+        cursor.execute(f"ALTER TABLE {table} AUTO_INCREMENT = {int(next_id)}")
+
+    def explain(self, con, query, params=None):
+        """EXPLAIN rows as dicts (type, key, Extra, ...)."""
+        cursor = con.cursor()
+        cursor.execute("EXPLAIN " + query, params)
+        columns = [d[0] for d in cursor.description]
+        plan = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        cursor.close()
+        return plan
+
+
+# Embedded SQLite
+@lru_cache(maxsize=512)
+def sqlite_sql(query):
+    """Rewrite the app's MySQL-flavoured SQL for SQLite: %s placeholders, CURRENT_TIMESTAMP."""
+    query = query.replace("%s", "?")
+    # MySQL's CURRENT_TIMESTAMP is session (local) time, SQLite's is UTC
+    return re.sub(r"\bCURRENT_TIMESTAMP\b", "datetime('now', 'localtime')", query)
+
+
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+
+
+class SQLiteCursor:
+    """sqlite3 cursor that accepts the SQL and cursor options employee_db.py passes to MySQL."""
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, query, params=None):
+        self.cursor.execute(sqlite_sql(query), tuple(params or ()))
+
+    def executemany(self, query, rows):
+        self.cursor.executemany(sqlite_sql(query), rows)
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchmany(self, size=1):
+        return self.cursor.fetchmany(size)
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def close(self):
+        self.cursor.close()
+
+    @property
+    def rowcount(self):
+        return self.cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self.cursor.lastrowid
+
+    @property
+    def description(self):
+        return self.cursor.description
+
+
+class SQLiteConnection:
+    """The slice of the mysql.connector connection API that employee_db.py uses."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.connection_id = id(raw)
+
+    def cursor(self, buffered=None, prepared=None):
+        # sqlite3 always streams rows and caches compiled statements itself
+        return SQLiteCursor(self.raw.cursor())
+
+    def commit(self):
+        self.raw.commit()
+
+    def rollback(self):
+        self.raw.rollback()
+
+    def close(self):
+        self.raw.close()
+
+    @property
+    def in_transaction(self):
+        return self.raw.in_transaction
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        self.raw.execute("SELECT 1").fetchall()  # A local file does not drop connections
+
+
+class SQLiteBackend:
+    """Embedded SQLite database file, for branch offices and tests without MySQL.
+
+    The file is created from database/sqlite_schema.sql (schema, seed rows,
+    indexes, triggers) on first connect. It runs in WAL mode so readers do
+    not block the writer, with synchronous=NORMAL (durable at checkpoints,
+    never corrupt), a memory-mapped file and a larger page cache per
+    connection. Writers wait up to ``busy_timeout_ms`` for the lock.
+    """
+
+    name = "sqlite"
+    prepared_statements = False  # sqlite3 keeps its own per-connection statement cache
+    error = sqlite3.Error
+
+    def __init__(self, path, mmap_mb=256, cache_mb=64, synchronous="NORMAL", busy_timeout_ms=5000):
+        if synchronous not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Unknown SQLite synchronous setting: {synchronous}")
+        self.path = Path(path)
+        self.mmap_mb = mmap_mb
+        self.cache_mb = cache_mb
+        self.synchronous = synchronous
+        self.busy_timeout_ms = busy_timeout_ms
+        self.lock = threading.Lock()
+        self.ready = False
+
+    def open(self):
+        raw = sqlite3.connect(str(self.path), timeout=self.busy_timeout_ms / 1000,
+                              check_same_thread=False, cached_statements=256)
+        raw.execute(f"PRAGMA synchronous = {self.synchronous}")
+        raw.execute(f"PRAGMA mmap_size = {int(self.mmap_mb) * 1024 * 1024}")
+        raw.execute(f"PRAGMA cache_size = {-int(self.cache_mb) * 1024}")  # negative means KiB
+        raw.execute("PRAGMA temp_store = MEMORY")
+        return raw
+
+    def connect(self):
+        with self.lock:
+            if not self.ready:
+                self.initialize()
+        return SQLiteConnection(self.open())
+
+    def initialize(self, rows=None):
+        """Create the database file from the schema script unless it already exists.
+
+        ``rows`` of (name, post, salary, email) replace the seed data and
+        are inserted before the indexes and triggers are created.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        raw = self.open()
+        try:
+            raw.execute("PRAGMA journal_mode = WAL")  # Persistent, recorded in the file
+            if raw.execute("PRAGMA user_version").fetchone()[0] == 0:
+                tables, rest = SQLITE_SCHEMA.read_text(encoding="utf-8").split("\n-- @seed\n", 1)
+                seed, indexes = rest.split("\n-- @indexes\n", 1)
+                raw.executescript(tables)
+                if rows is None:
+                    raw.executescript(seed)
+                else:
+                    raw.executemany(
+                        "INSERT INTO employees (name, post, salary, email) VALUES (?, ?, ?, ?)", rows
+                    )
+                    raw.commit()
+                raw.executescript(indexes)
+                raw.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+                raw.commit()
+            self.ready = True
+        finally:
+            raw.close()
+
+    def pool_exhausted(self, message):
+        return sqlite3.OperationalError(message)
+
+    def set_auto_increment(self, cursor, table, next_id):
+        # AUTOINCREMENT hands out max(seq, max rowid) + 1
+        cursor.execute("UPDATE sqlite_sequence SET seq = %s WHERE name = %s", (int(next_id) - 1, table))
+
+    def explain(self, con, query, params=None):
+        """EXPLAIN QUERY PLAN, mapped onto the MySQL columns explain_query_shapes reads."""
+        cursor = con.cursor()
+        cursor.execute("EXPLAIN QUERY PLAN " + query, params)
+        plan = []
+        for row in cursor.fetchall():
+            detail = row[-1]
+            step = {"table": None, "type": None, "key": None, "Extra": "", "detail": detail}
+            match = re.match(r"(SCAN|SEARCH) (?:TABLE )?(\w+)(?: USING (?:COVERING )?INDEX (\w+))?", detail)
+            if match:
+                step["table"] = match.group(2)
+                step["key"] = match.group(3)
+                if match.group(1) == "SEARCH":
+                    step["type"] = "range"
+                else:
+                    # Tables are clustered on the rowid like InnoDB on PRIMARY, so
+                    # a plain SCAN is a walk of the primary key in emp_id order
+                    step["type"] = "index"
+                    step["key"] = match.group(3) or "PRIMARY"
+            elif "TEMP B-TREE" in detail:
+                step["Extra"] = "Using filesort"
+            plan.append(step)
+        cursor.close()
+        return plan
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """Return the configured backend: DB_BACKEND=mysql (default) or sqlite."""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            name = os.getenv("DB_BACKEND", "mysql").lower()
+            if name == "mysql":
+                _backend = MySQLBackend()
+            elif name == "sqlite":
+                _backend = SQLiteBackend(
+                    os.getenv("DB_PATH") or default_data_dir() / f"{os.getenv('DB_NAME', 'emp')}.sqlite3",
+                    mmap_mb=int(os.getenv("SQLITE_MMAP_MB", "256")),
+                    cache_mb=int(os.getenv("SQLITE_CACHE_MB", "64")),
+                    synchronous=os.getenv("SQLITE_SYNCHRONOUS", "NORMAL").upper()
+                )
+            else:
+                raise ValueError(f"Unknown DB_BACKEND: {name} (expected mysql or sqlite)")
+        return _backend
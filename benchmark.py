@@ -0,0 +1,341 @@
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import employee_db
+from backends import connection_settings, default_data_dir, get_backend
+from employee_cache import EmployeeCache
+from employee_io import INSERT_EMPLOYEE
+from migrations import apply_migrations
+
+
+DUMP = Path(__file__).resolve().parent / "database" / "database.sql"
+
+FIRST_NAMES = (
+    "Alice", "Bob", "Charlie", "David", "Emma", "Frank", "Grace", "Henry", "Isabella", "Jack",
+    "Katie", "Liam", "Mia", "Noah", "Olivia", "Paul", "Quinn", "Ryan", "Sophia", "Thomas",
+    "Aarav", "Fatima", "Hiroshi", "Ines", "Kwame", "Lucia", "Mohammed", "Priya", "Sven", "Yara"
+)
+LAST_NAMES = (
+    "Johnson", "Smith", "Brown", "Lee", "Wilson", "White", "Hall", "Adams", "Clark", "Turner",
+    "Young", "King", "Scott", "Baker", "Carter", "Evans", "Harris", "Mitchell", "Roberts", "Walker",
+    "Garcia", "Khan", "Nakamura", "Okafor", "Patel", "Rossi", "Silva", "Novak", "Larsen", "Chen"
+)
+# (post, share of employees, mean salary); the first four are the seed data's posts
+POSTS = (
+    ("Developer", 0.40, 63000),
+    ("Intern", 0.20, 26500),
+    ("HR", 0.15, 57000),
+    ("Manager", 0.10, 87000),
+    ("Designer", 0.06, 52000),
+    ("QA Engineer", 0.05, 48000),
+    ("Sales", 0.04, 45000)
+)
+NULL_SALARY_SHARE = 0.01  # Salary is nullable in the schema
+
+
+def generate_employees(count, seed=1):
+    """Yield ``count`` (name, post, salary, email) rows shaped like the seed data.
+
+    Deterministic for a given seed, so two runs benchmark the same table.
+    """
+    rnd = random.Random(seed)
+    posts = [(post, mean) for post, _, mean in POSTS]
+    weights = [share for _, share, _ in POSTS]
+    for _ in range(count):
+        first = rnd.choice(FIRST_NAMES)
+        last = rnd.choice(LAST_NAMES)
+        post, mean = rnd.choices(posts, weights)[0]
+        salary = None
+        if rnd.random() >= NULL_SALARY_SHARE:
+            salary = max(10000, round(rnd.gauss(mean, mean * 0.12) / 500) * 500)
+        email = f"{first}.{last}{rnd.randint(1, 99)}@gmail.com".lower()
+        yield (f"{first} {last}", post, salary, email)
+
+
+def employees_ddl(dump=DUMP):
+    """The CREATE TABLE of ``employees`` from the SQL dump, without its AUTO_INCREMENT."""
+    text = Path(dump).read_text(encoding="utf-8")
+    match = re.search(r"CREATE TABLE `employees` \(.*?\)[^;]*;", text, re.S)
+    return re.sub(r"\s*AUTO_INCREMENT=\d+", "", match.group(0).rstrip(";"))
+
+
+def prepare_database(backend, database, rows, migrate=True, seed=1, chunk_size=10000, out=print):
+    """(Re)create ``database`` with ``rows`` synthetic employees, then apply the migrations.
+
+    Rows are loaded before the migrations so secondary indexes and
+    summary tables are built once in bulk rather than row by row.
+    """
+    if backend.name == "sqlite":
+        prepare_sqlite(backend, rows, seed, out)
+        return
+    settings = connection_settings()
+    settings.pop("database")
+    import mysql.connector
+    con = mysql.connector.connect(**settings)
+    cursor = con.cursor()
+    cursor.execute(f"DROP DATABASE IF EXISTS `{database}`")
+    cursor.execute(f"CREATE DATABASE `{database}`")
+    cursor.execute(f"USE `{database}`")
+    cursor.execute(employees_ddl())
+
+    started = time.perf_counter()
+    batch = []
+    for row in generate_employees(rows, seed):
+        batch.append(row)
+        if len(batch) == chunk_size:
+            cursor.executemany(INSERT_EMPLOYEE, batch)
+            con.commit()
+            batch = []
+    if batch:
+        cursor.executemany(INSERT_EMPLOYEE, batch)
+        con.commit()
+    elapsed = time.perf_counter() - started
+    out(f"Loaded {rows:,} employees in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+
+    if migrate:
+        apply_migrations(con, log=out)
+    cursor.close()
+    con.close()
+
+
+def prepare_sqlite(backend, rows, seed=1, out=print):
+    """Recreate the embedded database file with synthetic rows instead of the seed data."""
+    for suffix in ("", "-wal", "-shm"):
+        path = Path(f"{backend.path}{suffix}")
+        if path.exists():
+            path.unlink()
+    started = time.perf_counter()
+    backend.initialize(rows=generate_employees(rows, seed))
+    elapsed = time.perf_counter() - started
+    out(f"Loaded {rows:,} employees into {backend.path} in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, -(-len(ordered) * p // 100) - 1)]
+
+
+class Timings:
+    """Latency samples per named operation."""
+
+    def __init__(self):
+        self.samples = {}  # name -> [seconds]
+        self.rows = {}     # name -> rows returned in total
+
+    def measure(self, name, fn, repeat):
+        """Call fn(i) ``repeat`` times; an int or list result counts as rows."""
+        samples = self.samples.setdefault(name, [])
+        for i in range(repeat):
+            started = time.perf_counter()
+            result = fn(i)
+            samples.append(time.perf_counter() - started)
+            if isinstance(result, int) and not isinstance(result, bool):
+                self.rows[name] = self.rows.get(name, 0) + result
+            elif isinstance(result, (list, tuple)):
+                self.rows[name] = self.rows.get(name, 0) + len(result)
+
+    def summary(self):
+        results = {}
+        for name, samples in self.samples.items():
+            ordered = sorted(samples)
+            total = sum(ordered)
+            result = {
+                "count": len(ordered),
+                "p50_ms": percentile(ordered, 50) * 1000,
+                "p99_ms": percentile(ordered, 99) * 1000,
+                "mean_ms": total / len(ordered) * 1000,
+                "ops_per_sec": len(ordered) / total if total else None
+            }
+            if name in self.rows:
+                result["rows"] = self.rows[name]
+                result["rows_per_sec"] = self.rows[name] / total if total else None
+            results[name] = result
+        return results
+
+
+def run_suite(db, repeat=50, load_repeat=3, seed=2):
+    """Time every statement shape the GUI issues; returns a Timings."""
+    rnd = random.Random(seed)
+    timings = Timings()
+    low, high = db.fetchall("SELECT MIN(emp_id), MAX(emp_id) FROM employees")[0]
+    random_ids = [rnd.randint(low, high) for _ in range(repeat)]
+
+    # Full load, as done for the in-memory cache behind Filter/Find
+    cache = EmployeeCache()
+    cache.enable_search()
+
+    def full_load(i):
+        cache.load(db.stream(employee_db.select_employees_sql(), batch_size=5000))
+        return len(cache)
+    timings.measure("full load", full_load, load_repeat)
+
+    # Grid: first page, then keyset scrolling
+    timings.measure("grid first page", lambda i: employee_db.KeysetPaginator(db).next_page(), repeat)
+    scroller = [employee_db.KeysetPaginator(db)]
+
+    def next_page(i):
+        if scroller[0].exhausted:
+            scroller[0] = employee_db.KeysetPaginator(db)  # Wrap around on small tables
+        return scroller[0].next_page()
+    timings.measure("grid next page", next_page, repeat)
+
+    # Filter dialog against the database (paginator) and against the cache
+    for post, _, _ in POSTS[:4]:
+        conditions, params = employee_db.build_filter(post, "All")
+        timings.measure(f"filter post={post}",
+                        lambda i: employee_db.KeysetPaginator(db, conditions, params).next_page(), repeat)
+        timings.measure(f"cache filter post={post}", lambda i: len(cache.select(post=post)), repeat)
+    for salary_range in employee_db.SALARY_RANGES[1:]:
+        conditions, params = employee_db.build_filter("All", salary_range)
+        low_salary, high_salary, inclusive = employee_db.salary_bounds(salary_range)
+        timings.measure(f"filter salary={salary_range}",
+                        lambda i: employee_db.KeysetPaginator(db, conditions, params, "salary").next_page(),
+                        repeat)
+        timings.measure(f"cache filter salary={salary_range}",
+                        lambda i: len(cache.select(low=low_salary, high=high_salary,
+                                                   inclusive=inclusive, sort_field="salary")),
+                        repeat)
+
+    for sort_field in employee_db.SORT_FIELDS:
+        for descending in (False, True):
+            order = "desc" if descending else "asc"
+            timings.measure(f"sort {sort_field} {order}",
+                            lambda i: employee_db.KeysetPaginator(db, sort_field=sort_field,
+                                                           descending=descending).next_page(),
+                            repeat)
+
+    # Point lookups: Search Employee, the existence check, and Find
+    search_query = employee_db.select_employees_sql(["emp_id = %s"])
+    timings.measure("search by id", lambda i: db.fetchall(search_query, (random_ids[i],)), repeat)
+    timings.measure("employee exists", lambda i: db.check_employee_exists(random_ids[i]), repeat)
+    prefixes = [name[:3] for name in FIRST_NAMES] + [name[:2] for name in LAST_NAMES]
+    timings.measure("find (cache)", lambda i: cache.search(prefixes[i % len(prefixes)], 100), repeat)
+
+    # Writes: add, promote, then remove the same rows so the table size is unchanged
+    new_rows = list(generate_employees(repeat, seed))
+    added = []
+    timings.measure("insert", lambda i: added.append(db.execute_query(INSERT_EMPLOYEE, new_rows[i])), repeat)
+    timings.measure("promote",
+                    lambda i: db.update_employees([added[i]], {"post": "Manager",
+                                                               "salary": 90000 + i}),
+                    repeat)
+    remove = "delete + reset_auto_increment" if employee_db.id_mode() != "soft" else "soft delete"
+    timings.measure(remove, lambda i: db.delete_employees([added[i]]), repeat)
+    return timings
+
+
+def compare(results, baseline, tolerance=0.2, out=print):
+    """Print p50/p99 against a baseline run; returns the number of regressions."""
+    regressions = 0
+    out(f"\n{'operation':40} {'p50 base':>9} {'p50 now':>9} {'p99 base':>9} {'p99 now':>9}")
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        flags = []
+        for metric in ("p50_ms", "p99_ms"):
+            if old[metric] and result[metric] > old[metric] * (1 + tolerance):
+                flags.append(metric[:3])
+        regressions += bool(flags)
+        out(f"{name:40} {old['p50_ms']:9.2f} {result['p50_ms']:9.2f} "
+            f"{old['p99_ms']:9.2f} {result['p99_ms']:9.2f}"
+            + (f"  SLOWER ({', '.join(flags)})" if flags else ""))
+    return regressions
+
+
+def report(results, out=print):
+    out(f"\n{'operation':40} {'n':>5} {'p50 ms':>9} {'p99 ms':>9} {'ops/s':>10} {'rows/s':>12}")
+    for name, result in results.items():
+        rows_per_sec = result.get("rows_per_sec")
+        out(f"{name:40} {result['count']:5} {result['p50_ms']:9.2f} {result['p99_ms']:9.2f} "
+            f"{result['ops_per_sec'] or 0:10,.0f} "
+            f"{'' if rows_per_sec is None else f'{rows_per_sec:12,.0f}'}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic employees table and time the app's queries against it"
+    )
+    parser.add_argument("--rows", type=int, default=10000,
+                        help="employees to generate, e.g. 10000 to 10000000 (default 10000)")
+    parser.add_argument("--database", default="emp_bench",
+                        help="scratch database to (re)create (default emp_bench; a file in the "
+                             "data directory with DB_BACKEND=sqlite); never DB_NAME's data")
+    parser.add_argument("--reuse", action="store_true",
+                        help="benchmark the existing scratch database instead of regenerating it")
+    parser.add_argument("--no-migrate", action="store_true",
+                        help="skip the schema migrations (plain database.sql table)")
+    parser.add_argument("--repeat", type=int, default=50, help="samples per operation (default 50)")
+    parser.add_argument("--load-repeat", type=int, default=3, help="samples of the full load (default 3)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed of the generated data")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare with the JSON of an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="with --baseline, fraction a p50/p99 may grow before it counts "
+                             "as a regression (default 0.2)")
+    args = parser.parse_args(argv)
+    if args.no_migrate and os.getenv("DB_BACKEND", "mysql").lower() == "sqlite":
+        # sqlite_schema.sql already includes the migrations; there is no unmigrated SQLite schema
+        parser.error("--no-migrate is not supported with DB_BACKEND=sqlite")
+    return args
+
+
+def benchmark(argv=None):
+    args = parse_args(argv)
+    if args.database == os.getenv("DB_NAME", "emp") and not args.reuse:
+        sys.exit(f"Refusing to recreate {args.database}, the app's own database; pick another --database")
+
+    os.environ["DB_NAME"] = args.database  # The pool connects to the scratch database
+    if os.getenv("DB_BACKEND", "mysql").lower() == "sqlite":
+        os.environ["DB_PATH"] = str(default_data_dir() / f"{args.database}.sqlite3")
+    backend = get_backend()
+    if not args.reuse:
+        prepare_database(backend, args.database, args.rows, migrate=not args.no_migrate, seed=args.seed)
+
+    db = employee_db.DatabaseOperations(employee_db.get_pool(), show_errors=False)
+    try:
+        rows = db.fetchall("SELECT COUNT(*) FROM employees")[0][0]
+        print(f"Benchmarking {rows:,} employees in {args.database}")
+        results = run_suite(db, args.repeat, args.load_repeat).summary()
+    finally:
+        employee_db.get_pool().close_all()
+
+    report(results)
+    document = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "rows": rows,
+            "backend": backend.name,
+            "database": args.database,
+            "id_mode": employee_db.id_mode(),
+            "statement_cache_size": int(os.getenv("DB_STATEMENT_CACHE_SIZE", "64")),
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "platform": platform.platform()
+        },
+        "results": results
+    }
+    if args.json:
+        Path(args.json).write_text(json.dumps(document, indent=2), encoding="utf-8")
+        print(f"\nWrote {args.json}")
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        baseline_rows = baseline.get("meta", {}).get("rows")
+        if baseline_rows is None:
+            print(f"\nNote: baseline does not record its row count, this run has {rows:,}")
+        elif baseline_rows != rows:
+            print(f"\nNote: baseline has {baseline_rows:,} rows, this run {rows:,}")
+        if compare(results, baseline["results"], args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    benchmark()
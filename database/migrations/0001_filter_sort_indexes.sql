@@ -0,0 +1,15 @@
+-- Secondary indexes for the filter dialog and grid sorting.
+--
+-- InnoDB appends the primary key to every secondary index, so each of
+-- these is effectively (..., emp_id) and also serves the emp_id
+-- tie-breaker used by keyset pagination.
+--
+--   post = ? [AND salary range] ORDER BY salary    -> (post, salary)
+--   post = ? ORDER BY emp_id / ORDER BY post       -> (post)
+--   salary range / ORDER BY salary                 -> (salary)
+--   ORDER BY name                                  -> (name)
+
+CREATE INDEX idx_employees_post_salary ON employees (post, salary);
+CREATE INDEX idx_employees_post ON employees (post);
+CREATE INDEX idx_employees_salary ON employees (salary);
+CREATE INDEX idx_employees_name ON employees (name);
@@ -0,0 +1,7 @@
+-- Soft delete for DB_ID_MODE=soft: removing an employee stamps deleted_at
+-- instead of deleting the row, so the delete path never needs the
+-- ALTER TABLE ... AUTO_INCREMENT that takes a metadata lock, and emp_id
+-- values are never reused. `python main.py --compact` purges old rows.
+
+ALTER TABLE employees ADD COLUMN deleted_at TIMESTAMP NULL DEFAULT NULL;
+CREATE INDEX idx_employees_deleted_at ON employees (deleted_at);
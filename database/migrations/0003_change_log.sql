@@ -0,0 +1,26 @@
+-- Change log for delta sync between workstations.
+--
+-- Every insert, update (including a soft delete) and delete of an
+-- employee appends (change_id, emp_id) here from a trigger, whichever
+-- client or tool made the change. Each running app remembers the last
+-- change_id it has applied and polls only the rows changed after it, so
+-- a refresh costs O(changes) instead of O(employees).
+--
+-- Creating triggers needs the TRIGGER privilege (and SUPER, or
+-- log_bin_trust_function_creators=1, when binary logging is on).
+-- `python main.py --compact` also prunes entries older than --older-than.
+
+CREATE TABLE IF NOT EXISTS employee_changes (
+  change_id BIGINT NOT NULL AUTO_INCREMENT PRIMARY KEY,
+  emp_id INT NOT NULL,
+  op CHAR(1) NOT NULL,
+  changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  KEY idx_employee_changes_changed_at (changed_at)
+);
+
+CREATE TRIGGER employees_log_insert AFTER INSERT ON employees FOR EACH ROW
+  INSERT INTO employee_changes (emp_id, op) VALUES (NEW.emp_id, 'I');
+CREATE TRIGGER employees_log_update AFTER UPDATE ON employees FOR EACH ROW
+  INSERT INTO employee_changes (emp_id, op) VALUES (NEW.emp_id, 'U');
+CREATE TRIGGER employees_log_delete AFTER DELETE ON employees FOR EACH ROW
+  INSERT INTO employee_changes (emp_id, op) VALUES (OLD.emp_id, 'D');
@@ -0,0 +1,61 @@
+-- Materialized salary summary for the Analytics panel.
+--
+-- One row per (post, salary band) with the headcount and salary total of
+-- the live employees in it, kept current by triggers: every insert,
+-- update and delete adds or subtracts just the affected row, so the panel
+-- reads a few dozen rows instead of aggregating the whole table.
+--
+-- Bands 1-5 are the salary ranges of the Filter dialog, band 0 is "no
+-- salary"; salary_band() must match BAND_SQL in employee_analytics.py.
+-- post is '' for employees without one. Soft-deleted rows are not
+-- counted. Apply during a quiet period: writes made between creating the
+-- triggers and the initial fill below would be counted twice. Needs the
+-- privileges listed in 0003 plus CREATE ROUTINE.
+
+CREATE TABLE IF NOT EXISTS salary_summary (
+  post VARCHAR(100) NOT NULL,
+  band TINYINT NOT NULL,
+  headcount INT NOT NULL,
+  salary_total DECIMAL(20,2) NOT NULL,
+  PRIMARY KEY (post, band)
+);
+
+CREATE FUNCTION salary_band(salary DOUBLE) RETURNS TINYINT DETERMINISTIC NO SQL
+  RETURN CASE
+    WHEN salary IS NULL THEN 0
+    WHEN salary < 20000 THEN 1
+    WHEN salary <= 40000 THEN 2
+    WHEN salary <= 60000 THEN 3
+    WHEN salary <= 80000 THEN 4
+    ELSE 5
+  END;
+
+CREATE TRIGGER employees_summary_insert AFTER INSERT ON employees FOR EACH ROW
+  INSERT INTO salary_summary (post, band, headcount, salary_total)
+  SELECT COALESCE(NEW.post, ''), salary_band(NEW.salary), 1, COALESCE(NEW.salary, 0)
+  FROM DUAL WHERE NEW.deleted_at IS NULL
+  ON DUPLICATE KEY UPDATE headcount = headcount + 1,
+                          salary_total = salary_total + COALESCE(NEW.salary, 0);
+
+CREATE TRIGGER employees_summary_update AFTER UPDATE ON employees FOR EACH ROW
+  INSERT INTO salary_summary (post, band, headcount, salary_total)
+  SELECT d.post, d.band, d.n, d.total FROM (
+    SELECT COALESCE(OLD.post, '') AS post, salary_band(OLD.salary) AS band,
+           -1 AS n, -COALESCE(OLD.salary, 0) AS total
+    FROM DUAL WHERE OLD.deleted_at IS NULL
+    UNION ALL
+    SELECT COALESCE(NEW.post, ''), salary_band(NEW.salary), 1, COALESCE(NEW.salary, 0)
+    FROM DUAL WHERE NEW.deleted_at IS NULL
+  ) AS d
+  WHERE NOT (OLD.post <=> NEW.post AND OLD.salary <=> NEW.salary AND OLD.deleted_at <=> NEW.deleted_at)
+  ON DUPLICATE KEY UPDATE headcount = headcount + d.n, salary_total = salary_total + d.total;
+
+CREATE TRIGGER employees_summary_delete AFTER DELETE ON employees FOR EACH ROW
+  UPDATE salary_summary
+  SET headcount = headcount - 1, salary_total = salary_total - COALESCE(OLD.salary, 0)
+  WHERE post = COALESCE(OLD.post, '') AND band = salary_band(OLD.salary) AND OLD.deleted_at IS NULL;
+
+INSERT INTO salary_summary (post, band, headcount, salary_total)
+  SELECT COALESCE(post, ''), salary_band(salary), COUNT(*), COALESCE(SUM(salary), 0)
+  FROM employees WHERE deleted_at IS NULL
+  GROUP BY COALESCE(post, ''), salary_band(salary);
@@ -0,0 +1,128 @@
+-- Embedded SQLite schema (DB_BACKEND=sqlite): database.sql plus the
+-- effect of migrations 0001-0004, in SQLite syntax. Applied once when the
+-- database file is created; PRAGMA user_version records the last MySQL
+-- migration it matches.
+--
+-- Text columns are NOCASE so comparisons, GROUP BY and ORDER BY are
+-- case-insensitive like the MySQL collation. The @seed and @indexes
+-- marker lines split the script so a bulk load (benchmark.py) can
+-- replace the seed rows and run before indexes and triggers exist.
+
+CREATE TABLE employees (
+  emp_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name VARCHAR(100) COLLATE NOCASE DEFAULT NULL,
+  post VARCHAR(100) COLLATE NOCASE DEFAULT NULL,
+  salary FLOAT DEFAULT NULL,
+  email VARCHAR(255) COLLATE NOCASE DEFAULT NULL,
+  deleted_at TIMESTAMP NULL DEFAULT NULL
+);
+
+CREATE TABLE employee_changes (
+  change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+  emp_id INTEGER NOT NULL,
+  op CHAR(1) NOT NULL,
+  changed_at TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+
+CREATE TABLE salary_summary (
+  post VARCHAR(100) COLLATE NOCASE NOT NULL,
+  band INTEGER NOT NULL,
+  headcount INTEGER NOT NULL,
+  salary_total REAL NOT NULL,
+  PRIMARY KEY (post, band)
+);
+
+-- @seed
+INSERT INTO employees (emp_id, name, post, salary, email) VALUES
+  (1, 'Alice Johnson', 'Developer', 60000, 'alice.johnson69@gmail.com'),
+  (2, 'Bob Smith', 'Manager', 85000, 'bob.smith26@gmail.com'),
+  (3, 'Charlie Brown', 'HR', 55000, 'charlie.brown22@gmail.com'),
+  (4, 'David Lee', 'Intern', 25000, 'david.lee34@gmail.com'),
+  (5, 'Emma Wilson', 'Developer', 65000, 'emma.wilson2@gmail.com'),
+  (6, 'Frank White', 'Manager', 90000, 'frank.white9@gmail.com'),
+  (7, 'Grace Hall', 'HR', 58000, 'grace.hall42@gmail.com'),
+  (8, 'Henry Adams', 'Intern', 27000, 'henry.adams81@gmail.com'),
+  (9, 'Isabella Clark', 'Developer', 62000, 'isabella.clark81@gmail.com'),
+  (10, 'Jack Turner', 'Manager', 87000, 'jack.turner60@gmail.com'),
+  (11, 'Katie Young', 'HR', 56000, 'katie.young59@gmail.com'),
+  (12, 'Liam King', 'Intern', 26000, 'liam.king16@gmail.com'),
+  (13, 'Mia Scott', 'Developer', 63000, 'mia.scott4@gmail.com'),
+  (14, 'Noah Baker', 'Manager', 88000, 'noah.baker73@gmail.com'),
+  (15, 'Olivia Carter', 'HR', 57000, 'olivia.carter53@gmail.com'),
+  (16, 'Paul Evans', 'Intern', 28000, 'paul.evans48@gmail.com'),
+  (17, 'Quinn Harris', 'Developer', 64000, 'quinn.harris82@gmail.com'),
+  (18, 'Ryan Mitchell', 'Manager', 86000, 'ryan.mitchell64@gmail.com'),
+  (19, 'Sophia Roberts', 'HR', 59000, 'sophia.roberts77@gmail.com'),
+  (20, 'Thomas Walker', 'Intern', 25500, 'thomas.walker95@gmail.com');
+
+-- @indexes
+-- 0001, 0002
+CREATE INDEX idx_employees_post_salary ON employees (post, salary);
+CREATE INDEX idx_employees_post ON employees (post);
+CREATE INDEX idx_employees_salary ON employees (salary);
+CREATE INDEX idx_employees_name ON employees (name);
+CREATE INDEX idx_employees_deleted_at ON employees (deleted_at);
+
+-- 0003: change log for delta sync
+CREATE INDEX idx_employee_changes_changed_at ON employee_changes (changed_at);
+
+CREATE TRIGGER employees_log_insert AFTER INSERT ON employees BEGIN
+  INSERT INTO employee_changes (emp_id, op) VALUES (NEW.emp_id, 'I');
+END;
+CREATE TRIGGER employees_log_update AFTER UPDATE ON employees BEGIN
+  INSERT INTO employee_changes (emp_id, op) VALUES (NEW.emp_id, 'U');
+END;
+CREATE TRIGGER employees_log_delete AFTER DELETE ON employees BEGIN
+  INSERT INTO employee_changes (emp_id, op) VALUES (OLD.emp_id, 'D');
+END;
+
+-- 0004: salary summary; the CASE is employee_analytics.BAND_SQL
+CREATE TRIGGER employees_summary_insert AFTER INSERT ON employees
+WHEN NEW.deleted_at IS NULL BEGIN
+  INSERT INTO salary_summary (post, band, headcount, salary_total)
+  SELECT COALESCE(NEW.post, ''),
+         CASE WHEN NEW.salary IS NULL THEN 0 WHEN NEW.salary < 20000 THEN 1
+              WHEN NEW.salary <= 40000 THEN 2 WHEN NEW.salary <= 60000 THEN 3
+              WHEN NEW.salary <= 80000 THEN 4 ELSE 5 END,
+         1, COALESCE(NEW.salary, 0)
+  WHERE true
+  ON CONFLICT (post, band) DO UPDATE SET headcount = headcount + excluded.headcount,
+                                         salary_total = salary_total + excluded.salary_total;
+END;
+
+CREATE TRIGGER employees_summary_update AFTER UPDATE OF post, salary, deleted_at ON employees
+WHEN NOT (OLD.post IS NEW.post AND OLD.salary IS NEW.salary AND OLD.deleted_at IS NEW.deleted_at) BEGIN
+  UPDATE salary_summary
+  SET headcount = headcount - 1, salary_total = salary_total - COALESCE(OLD.salary, 0)
+  WHERE OLD.deleted_at IS NULL AND post = COALESCE(OLD.post, '')
+    AND band = CASE WHEN OLD.salary IS NULL THEN 0 WHEN OLD.salary < 20000 THEN 1
+                    WHEN OLD.salary <= 40000 THEN 2 WHEN OLD.salary <= 60000 THEN 3
+                    WHEN OLD.salary <= 80000 THEN 4 ELSE 5 END;
+  INSERT INTO salary_summary (post, band, headcount, salary_total)
+  SELECT COALESCE(NEW.post, ''),
+         CASE WHEN NEW.salary IS NULL THEN 0 WHEN NEW.salary < 20000 THEN 1
+              WHEN NEW.salary <= 40000 THEN 2 WHEN NEW.salary <= 60000 THEN 3
+              WHEN NEW.salary <= 80000 THEN 4 ELSE 5 END,
+         1, COALESCE(NEW.salary, 0)
+  WHERE NEW.deleted_at IS NULL
+  ON CONFLICT (post, band) DO UPDATE SET headcount = headcount + excluded.headcount,
+                                         salary_total = salary_total + excluded.salary_total;
+END;
+
+CREATE TRIGGER employees_summary_delete AFTER DELETE ON employees
+WHEN OLD.deleted_at IS NULL BEGIN
+  UPDATE salary_summary
+  SET headcount = headcount - 1, salary_total = salary_total - COALESCE(OLD.salary, 0)
+  WHERE post = COALESCE(OLD.post, '')
+    AND band = CASE WHEN OLD.salary IS NULL THEN 0 WHEN OLD.salary < 20000 THEN 1
+                    WHEN OLD.salary <= 40000 THEN 2 WHEN OLD.salary <= 60000 THEN 3
+                    WHEN OLD.salary <= 80000 THEN 4 ELSE 5 END;
+END;
+
+INSERT INTO salary_summary (post, band, headcount, salary_total)
+  SELECT COALESCE(post, ''),
+         CASE WHEN salary IS NULL THEN 0 WHEN salary < 20000 THEN 1 WHEN salary <= 40000 THEN 2
+              WHEN salary <= 60000 THEN 3 WHEN salary <= 80000 THEN 4 ELSE 5 END AS band,
+         COUNT(*), COALESCE(SUM(salary), 0)
+  FROM employees WHERE deleted_at IS NULL
+  GROUP BY COALESCE(post, '') COLLATE NOCASE, band;
@@ -0,0 +1,129 @@
+from employee_db import ER_NO_SUCH_TABLE
+
+
+# Band 0 is "no salary"; bands 1-5 are the Filter dialog's salary ranges
+BAND_LABELS = ("No salary", "Below 20000", "20000-40000", "40001-60000", "60001-80000", "Above 80000")
+
+# Same banding as the salary_band() function of migration 0004
+BAND_SQL = (
+    "CASE WHEN salary IS NULL THEN 0 WHEN salary < 20000 THEN 1 WHEN salary <= 40000 THEN 2 "
+    "WHEN salary <= 60000 THEN 3 WHEN salary <= 80000 THEN 4 ELSE 5 END"
+)
+
+PERCENTILES = (25, 50, 75, 90)
+
+
+class PostStats:
+    """Headcount and salary figures of one post (or of everybody, post None)."""
+
+    def __init__(self, post):
+        self.post = post
+        self.headcount = 0
+        self.total = 0.0
+        self.bands = [0] * len(BAND_LABELS)
+        self.percentiles = {}  # percentile -> salary, filled by add_percentiles
+
+    @property
+    def paid(self):
+        """Employees with a salary, the denominator of the mean."""
+        return self.headcount - self.bands[0]
+
+    @property
+    def mean(self):
+        return self.total / self.paid if self.paid else None
+
+    @property
+    def median(self):
+        return self.percentiles.get(50)
+
+    @property
+    def label(self):
+        if self.post is None:
+            return "All posts"
+        return self.post or "(none)"
+
+
+def summary_rows(db, conditions=(), params=()):
+    """(post, band, headcount, salary_total) rows, from the summary table when it exists.
+
+    The salary_summary table (migration 0004) is kept current by triggers,
+    so reading it costs O(posts x bands). Without it the same rows are
+    computed with one GROUP BY over ``employees`` under ``conditions``.
+    The summary table already leaves soft-deleted rows out.
+    """
+    try:
+        return db.fetchall(
+            "SELECT post, band, headcount, salary_total FROM salary_summary WHERE headcount > 0"
+        )
+    except Exception as e:
+        if getattr(e, "errno", None) != ER_NO_SUCH_TABLE:
+            raise
+    query = f"SELECT COALESCE(post, ''), {BAND_SQL}, COUNT(*), COALESCE(SUM(salary), 0) FROM employees"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    return db.fetchall(query + " GROUP BY 1, 2", list(params))
+
+
+def percentile_rows(db, conditions=(), params=(), percentiles=PERCENTILES, by_post=True):
+    """Nearest-rank salary percentiles computed by the server.
+
+    Window functions rank salaries per post inside MySQL and only the rows
+    at the requested ranks come back, so the client never sees the table.
+    Returns (post, rank, count, salary) rows; post is '' for employees
+    without one and None for the rows of the whole table (not by_post).
+    """
+    conditions = ["salary IS NOT NULL"] + list(conditions)
+    partition = "PARTITION BY post " if by_post else ""
+    group = "COALESCE(post, '')" if by_post else "NULL"
+    # rn = ceil(n * p / 100) in integer arithmetic, which MySQL and SQLite agree on
+    ranks = " OR ".join(["((rn - 1) * 100 < n * %s AND rn * 100 >= n * %s)"] * len(percentiles))
+    query = (
+        f"SELECT {group}, rn, n, salary FROM ("
+        f"SELECT post, salary, ROW_NUMBER() OVER ({partition}ORDER BY salary) AS rn, "
+        f"COUNT(*) OVER ({partition.strip()}) AS n "
+        f"FROM employees WHERE {' AND '.join(conditions)}"
+        f") AS ranked WHERE {ranks}"
+    )
+    return db.fetchall(query, list(params) + [p for p in percentiles for _ in range(2)])
+
+
+def post_key(post):
+    # The post column compares case-insensitively, so do the groups here
+    return (post or "").casefold()
+
+
+def workforce_summary(db, conditions=(), params=(), with_percentiles=True):
+    """Return (per-post PostStats sorted by headcount, overall PostStats).
+
+    ``conditions``/``params`` hide soft-deleted rows for the queries that
+    read ``employees`` directly (employee_db.live_conditions()).
+    """
+    posts = {}
+    overall = PostStats(None)
+    for post, band, headcount, total in summary_rows(db, conditions, params):
+        stats = posts.get(post_key(post))
+        if stats is None:
+            stats = posts[post_key(post)] = PostStats(post)
+        for target in (stats, overall):
+            target.headcount += headcount
+            target.total += float(total)
+            target.bands[band] += headcount
+
+    if with_percentiles:
+        add_percentiles(db, posts, overall, conditions, params)
+    ordered = sorted(posts.values(), key=lambda s: (-s.headcount, post_key(s.post)))
+    return ordered, overall
+
+
+def add_percentiles(db, posts, overall, conditions=(), params=(), percentiles=PERCENTILES):
+    """Fill the ``percentiles`` of the PostStats in ``posts`` (keyed by post_key) and ``overall``."""
+    rows = list(percentile_rows(db, conditions, params, percentiles, by_post=True))
+    rows += percentile_rows(db, conditions, params, percentiles, by_post=False)
+    for post, rank, count, salary in rows:
+        stats = overall if post is None else posts.get(post_key(post))
+        if stats is None:
+            continue  # Post appeared after the summary was read
+        for p in percentiles:
+            if rank == -(-count * p // 100):
+                stats.percentiles[p] = float(salary)
+
@@ -0,0 +1,420 @@
+import argparse
+import asyncio
+import base64
+import binascii
+import json
+import os
+import re
+import sys
+import traceback
+from contextlib import closing
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from employee_auth import allowed, authenticate
+from employee_db import (
+    EMPLOYEE_COLUMNS, SALARY_RANGES, SORT_FIELDS, DatabaseOperations, KeysetPaginator, build_filter,
+    db_error, get_pool, select_employees_sql, shutdown
+)
+from employee_io import INSERT_EMPLOYEE, MAX_LENGTHS, validate_record
+from employee_search import find_matches, search_conditions
+from query_metrics import get_metrics
+
+
+# Local JSON HTTP API over the same DatabaseOperations as the GUI. Stdlib
+# only: asyncio streams for HTTP/1.1 with keep-alive, blocking queries on
+# the shared worker pool (one thread per pooled connection).
+MAX_BODY = 1 << 20
+MAX_HEADERS = 100
+MAX_IDS = 10000
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=()):
+        super().__init__(message)
+        self.status = status
+        self.headers = list(headers)
+
+
+def employee_json(row):
+    return dict(zip(EMPLOYEE_COLUMNS, row))
+
+
+def encode_cursor(row, sort_field, descending):
+    """Opaque keyset cursor: the sort value and emp_id of the last row of a page."""
+    value = row[EMPLOYEE_COLUMNS.index(sort_field)]
+    raw = json.dumps([sort_field, descending, value, row[0]]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token, sort_field, descending):
+    """Rebuild the last row a cursor stands for, as KeysetPaginator.last_row."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        field, desc, value, emp_id = json.loads(raw)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPError(400, "Invalid cursor")
+    if field != sort_field or desc != descending or not isinstance(emp_id, int):
+        raise HTTPError(400, "Cursor belongs to a different sort order")
+    row = [None] * len(EMPLOYEE_COLUMNS)
+    row[EMPLOYEE_COLUMNS.index(sort_field)] = value
+    row[0] = emp_id
+    return row
+
+
+# Blocking operations, run on the database worker threads
+def list_page(db, conditions, params, sort_field, descending, limit, last_row):
+    """One keyset page; one row more than asked tells whether another page follows."""
+    paginator = KeysetPaginator(db, conditions, params, sort_field, descending, page_size=limit + 1)
+    paginator.last_row = last_row
+    rows = paginator.next_page()
+    return rows[:limit], len(rows) > limit
+
+
+def get_employee(db, emp_id):
+    rows = db.fetchall(select_employees_sql(["emp_id = %s"]), [emp_id])
+    return rows[0] if rows else None
+
+
+def search_employees(db, text, limit):
+    """Find by name/email words (same matching as the dashboard's Find box), in emp_id order."""
+    conditions, params = search_conditions(text)
+    found = []
+    with closing(db.stream(select_employees_sql(conditions), params, batch_size=500)) as batches:
+        for rows in find_matches(batches, text):
+            found.extend(rows)
+            if len(found) >= limit:
+                break
+    return found[:limit]
+
+
+def add_employee(db, record):
+    emp_id = db.execute_query(INSERT_EMPLOYEE, record)
+    return (emp_id,) + tuple(record)
+
+
+# Request parsing helpers
+def param(query, name, default=None):
+    values = query.get(name)
+    return values[-1] if values else default
+
+
+def int_param(query, name, default, low, high):
+    value = param(query, name)
+    if value is None:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an integer")
+    if not low <= number <= high:
+        raise HTTPError(400, f"{name} must be between {low} and {high}")
+    return number
+
+
+def json_body(body):
+    try:
+        data = json.loads(body or b"null")
+    except ValueError:
+        raise HTTPError(400, "Request body is not valid JSON")
+    if not isinstance(data, dict):
+        raise HTTPError(400, "Request body must be a JSON object")
+    return data
+
+
+def id_list(data):
+    ids = data.get("ids")
+    if not isinstance(ids, list) or not ids or not all(type(i) is int for i in ids):
+        raise HTTPError(400, "ids must be a non-empty list of employee IDs")
+    if len(ids) > MAX_IDS:
+        raise HTTPError(400, f"At most {MAX_IDS} ids per request")
+    return list(dict.fromkeys(ids))
+
+
+class EmployeeAPI:
+    """HTTP/1.1 JSON API for employee lookups and changes.
+
+    Requests authenticate with HTTP Basic using the login page's accounts
+    (employee_auth); the role decides what may be done, as on the
+    dashboard: hr lists and searches, admin also filters, sorts, adds,
+    promotes and removes.
+
+    Each query runs on the DatabaseOperations worker pool, which has one
+    thread per pooled connection, so the event loop never blocks and the
+    database never sees more than DB_POOL_SIZE connections. At most
+    ``max_pending`` queries may wait for a worker; beyond that requests
+    are turned away with 503 and Retry-After rather than queueing without
+    bound.
+    """
+
+    ROUTES = (
+        # method, path, action (None: any role), handler
+        ("GET", r"/employees", "list", "list_employees"),
+        ("GET", r"/employees/search", "search", "search"),
+        ("GET", r"/employees/(\d+)", "search", "get_employee"),
+        ("POST", r"/employees", "add", "add"),
+        ("POST", r"/employees/promote", "promote", "promote"),
+        ("POST", r"/employees/remove", "remove", "remove"),
+        ("DELETE", r"/employees/(\d+)", "remove", "remove_one"),
+        ("GET", r"/metrics", None, "metrics"),
+    )
+
+    def __init__(self, db, max_pending=256, page_size=100, max_page_size=1000, idle_timeout=15):
+        self.db = db
+        self.max_pending = max_pending
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+        self.idle_timeout = idle_timeout
+        self.routes = [(method, re.compile(path + "$"), action, getattr(self, handler))
+                       for method, path, action, handler in self.ROUTES]
+        self.in_flight = 0
+        self.slots = None
+
+    async def serve(self, host="127.0.0.1", port=8080):
+        self.slots = asyncio.Semaphore(self.max_pending)
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        print(f"Serving on http://{host}:{port} with up to {self.db.pool.size} database connections",
+              flush=True)
+        async with server:
+            await server.serve_forever()
+
+    async def run_db(self, fn, *args):
+        """Run a blocking database call on the worker pool, or refuse when too many are waiting."""
+        if self.slots.locked():
+            raise HTTPError(503, "Too many requests in flight", [("Retry-After", "1")])
+        async with self.slots:
+            self.in_flight += 1
+            try:
+                return await asyncio.wrap_future(self.db.submit(fn, *args))
+            except db_error() as e:
+                if getattr(e, "pool_exhausted", False):  # Waited the pool timeout for a connection
+                    raise HTTPError(503, "Database busy", [("Retry-After", "1")])
+                raise HTTPError(500, f"Database error: {e}")
+            finally:
+                self.in_flight -= 1
+
+    # Connection handling
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self.read_request(reader), self.idle_timeout)
+                except HTTPError as e:
+                    await self.respond(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    break
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+                    break  # Idle keep-alive, client gone or an oversized line
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                extra = []
+                try:
+                    status, payload = await self.dispatch(method, target, headers, body)
+                except HTTPError as e:
+                    status, payload, extra = e.status, {"error": str(e)}, e.headers
+                except Exception:
+                    traceback.print_exc()
+                    status, payload = 500, {"error": "Internal server error"}
+                await self.respond(writer, status, payload, extra, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def read_request(self, reader):
+        """Read one request; returns None when the client closed the connection."""
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise HTTPError(431, "Too many headers")
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "transfer-encoding" in headers:
+            raise HTTPError(501, "Chunked request bodies are not supported")
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY:
+            raise HTTPError(413, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+
+        connection = headers.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        return method.upper(), target, headers, body, keep_alive
+
+    async def respond(self, writer, status, payload, extra=(), keep_alive=True):
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), "text/plain; version=0.0.4; charset=utf-8"
+        else:
+            body, content_type = (json.dumps(payload, default=str) + "\n").encode(), "application/json"
+        head = [
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ] + [f"{name}: {value}" for name, value in extra]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    async def dispatch(self, method, target, headers, body):
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        query = parse_qs(url.query)
+        if path == "/health" and method == "GET":
+            return 200, {"status": "ok", "backend": self.db.pool.backend.name,
+                         "pool_size": self.db.pool.size, "in_flight": self.in_flight}
+
+        allow = []
+        for route_method, pattern, action, handler in self.routes:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            if route_method != method:
+                allow.append(route_method)
+                continue
+            role = self.authorize(headers)
+            if action is not None and not allowed(role, action):
+                raise HTTPError(403, f"The {role} role may not {action} employees")
+            return await handler(role, query, body, *match.groups())
+        if allow:
+            raise HTTPError(405, "Method not allowed", [("Allow", ", ".join(allow))])
+        raise HTTPError(404, "Not found")
+
+    def authorize(self, headers):
+        """Role of the request's Basic credentials, or 401."""
+        scheme, _, credentials = headers.get("authorization", "").partition(" ")
+        role = None
+        if scheme.lower() == "basic":
+            try:
+                username, _, password = base64.b64decode(credentials).decode().partition(":")
+                role = authenticate(username, password)
+            except (binascii.Error, UnicodeDecodeError):
+                pass
+        if role is None:
+            raise HTTPError(401, "Authentication required", [("WWW-Authenticate", 'Basic realm="employees"')])
+        return role
+
+    # Handlers: (role, query, body, *path groups) -> (status, payload)
+    async def list_employees(self, role, query, body):
+        post = param(query, "post", "All")
+        salary = param(query, "salary", "All")
+        sort_field = param(query, "sort", "emp_id")
+        descending = param(query, "desc", "").lower() in ("1", "true", "yes")
+        if (post, salary, sort_field, descending) != ("All", "All", "emp_id", False) and not allowed(role, "filter"):
+            raise HTTPError(403, f"The {role} role may not filter or sort employees")
+        if salary not in SALARY_RANGES:
+            raise HTTPError(400, f"salary must be one of: {', '.join(SALARY_RANGES)}")
+        if sort_field not in SORT_FIELDS:
+            raise HTTPError(400, f"sort must be one of: {', '.join(SORT_FIELDS)}")
+        limit = int_param(query, "limit", self.page_size, 1, self.max_page_size)
+        cursor = param(query, "cursor")
+        last_row = decode_cursor(cursor, sort_field, descending) if cursor else None
+
+        conditions, params = build_filter(post, salary)
+        rows, more = await self.run_db(list_page, self.db, conditions, params, sort_field, descending,
+                                       limit, last_row)
+        return 200, {
+            "employees": [employee_json(row) for row in rows],
+            "next_cursor": encode_cursor(rows[-1], sort_field, descending) if more else None
+        }
+
+    async def search(self, role, query, body):
+        text = param(query, "q", "").strip()
+        if not text:
+            raise HTTPError(400, "q is required")
+        limit = int_param(query, "limit", self.page_size, 1, self.max_page_size)
+        rows = await self.run_db(search_employees, self.db, text, limit)
+        return 200, {"employees": [employee_json(row) for row in rows]}
+
+    async def get_employee(self, role, query, body, emp_id):
+        row = await self.run_db(get_employee, self.db, int(emp_id))
+        if row is None:
+            raise HTTPError(404, f"No employee with ID {emp_id}")
+        return 200, employee_json(row)
+
+    async def add(self, role, query, body):
+        try:
+            record = validate_record(json_body(body))
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        row = await self.run_db(add_employee, self.db, record)
+        return 201, employee_json(row)
+
+    async def promote(self, role, query, body):
+        data = json_body(body)
+        ids = id_list(data)
+        fields = {}
+        post = data.get("post")
+        if post is not None:
+            if not isinstance(post, str) or not post.strip() or len(post.strip()) > MAX_LENGTHS["post"]:
+                raise HTTPError(400, f"post must be a non-empty string of at most {MAX_LENGTHS['post']} characters")
+            fields["post"] = post.strip()
+        salary = data.get("salary")
+        if salary is not None:
+            if isinstance(salary, bool) or not isinstance(salary, (int, float)) or salary < 0:
+                raise HTTPError(400, "salary must be a non-negative number")
+            fields["salary"] = float(salary)
+        if not fields:
+            raise HTTPError(400, "Give post, salary or both")
+        promoted = await self.run_db(self.db.update_employees, ids, fields)
+        return 200, {"promoted": promoted, "requested": len(ids)}
+
+    async def remove(self, role, query, body):
+        ids = id_list(json_body(body))
+        removed = await self.run_db(self.db.delete_employees, ids)
+        return 200, {"removed": removed, "requested": len(ids)}
+
+    async def remove_one(self, role, query, body, emp_id):
+        removed = await self.run_db(self.db.delete_employees, [int(emp_id)])
+        if not removed:
+            raise HTTPError(404, f"No employee with ID {emp_id}")
+        return 200, {"removed": removed}
+
+    async def metrics(self, role, query, body):
+        return 200, get_metrics().exposition()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Local JSON HTTP API for the employee database (same DB_* settings as main.py)"
+    )
+    parser.add_argument("--host", default=os.getenv("API_HOST", "127.0.0.1"),
+                        help="address to listen on (default 127.0.0.1, or API_HOST)")
+    parser.add_argument("--port", type=int, default=int(os.getenv("API_PORT", "8080")),
+                        help="port to listen on (default 8080, or API_PORT)")
+    parser.add_argument("--max-pending", type=int, default=256,
+                        help="database calls allowed to wait for a pooled connection before "
+                             "requests get 503 (default 256)")
+    parser.add_argument("--page-size", type=int, default=100, help="default rows per page (default 100)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    api = EmployeeAPI(DatabaseOperations(get_pool(), show_errors=False),
+                      max_pending=args.max_pending, page_size=args.page_size)
+    try:
+        asyncio.run(api.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("Stopped", file=sys.stderr)
+    finally:
+        shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import hmac
+
+
+# App-level accounts of the login page: username -> (password, role)
+ACCOUNTS = {
+    "admin": ("admin123", "admin"),
+    "hr": ("hr123", "hr")
+}
+
+# What each role may do; mirrors the dashboard buttons of EmployeeManagementApp
+ROLE_ACTIONS = {
+    "admin": {"list", "search", "filter", "add", "promote", "remove", "import", "export", "analytics"},
+    "hr": {"list", "search", "analytics"}
+}
+
+
+def authenticate(username, password):
+    """Return the role of a username/password pair, or None."""
+    account = ACCOUNTS.get(username)
+    if account is None or not hmac.compare_digest(account[0].encode(), password.encode()):
+        return None
+    return account[1]
+
+
+def allowed(role, action):
+    return action in ROLE_ACTIONS.get(role, ())
@@ -0,0 +1,364 @@
+from array import array
+from bisect import bisect_left, bisect_right
+import math
+
+from employee_search import SearchIndex
+
+
+class StringColumn:
+    """Strings packed into one UTF-8 buffer with an offset/length per row.
+
+    Updating a value appends the new bytes and repoints the row, so the
+    buffer only grows; ``compact`` rewrites it when needed. A length of -1
+    marks a NULL.
+    """
+
+    def __init__(self):
+        self.data = bytearray()
+        self.offsets = array("q")
+        self.lengths = array("q")
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _encode(self, value):
+        if value is None:
+            return len(self.data), -1
+        encoded = str(value).encode("utf-8")
+        offset = len(self.data)
+        self.data += encoded
+        return offset, len(encoded)
+
+    def append(self, value):
+        offset, length = self._encode(value)
+        self.offsets.append(offset)
+        self.lengths.append(length)
+
+    def set(self, position, value):
+        self.offsets[position], self.lengths[position] = self._encode(value)
+
+    def __getitem__(self, position):
+        length = self.lengths[position]
+        if length < 0:
+            return None
+        offset = self.offsets[position]
+        return self.data[offset:offset + length].decode("utf-8")
+
+
+class EmployeeCache:
+    """Columnar in-memory copy of the employees table.
+
+    ids and salaries are stored in typed arrays, posts are dictionary
+    encoded (one small int per row plus a table of distinct posts), and
+    names/emails are packed into StringColumns. Two secondary indexes make
+    the filter dialog's queries local:
+
+    * ``by_post`` maps a casefolded post to the set of row positions
+      holding it, so the post filter is case-insensitive like the server
+      collation.
+    * ``salary_order`` is a permutation of row positions sorted by
+      (salary, emp_id), with ``salary_keys`` holding the salaries in that
+      order so a salary range is a pair of ``bisect`` calls.
+
+    Rows are addressed by position; deleted rows are tombstoned until the
+    cache is reloaded or compacted.
+
+    ``enable_search`` adds a SearchIndex over names and emails that is
+    kept in step with every upsert/update/remove.
+    """
+
+    def __init__(self):
+        self.search_index = None
+        self.clear()
+
+    def clear(self):
+        self.ids = array("q")
+        self.salaries = array("d")       # NaN stands for NULL
+        self.post_codes = array("i")
+        self.names = StringColumn()
+        self.emails = StringColumn()
+        self.alive = bytearray()
+
+        self.post_names = [None]         # code 0 is NULL
+        self.post_keys = [None]          # casefolded post_names, the by_post keys
+        self.post_lookup = {None: 0}
+        self.position = {}               # emp_id -> row position
+        self.by_post = {}
+        self.salary_order = array("q")
+        self.salary_keys = array("d")
+        self.null_salaries = set()
+        self.dead = 0
+        self.loaded = False
+
+    def __len__(self):
+        return len(self.position)
+
+    # Loading
+    def load(self, batches):
+        """Fill the cache from an iterable of row batches (e.g. DatabaseOperations.stream)."""
+        self.clear()
+        for rows in batches:
+            for row in rows:
+                self._append(row)
+        self.build_indexes()
+        if self.search_index is not None:
+            self._build_search()
+        self.loaded = True
+
+    def enable_search(self):
+        """Build (and from now on maintain) the name/email search index."""
+        if self.search_index is None:
+            self.search_index = SearchIndex(self._search_record)
+            self._build_search()
+
+    def _build_search(self):
+        self.search_index.build(
+            (self.ids[p], self.names[p], self.emails[p])
+            for p in range(len(self.ids)) if self.alive[p]
+        )
+
+    def _search_record(self, emp_id):
+        position = self.position.get(emp_id)
+        return None if position is None else (self.names[position], self.emails[position])
+
+    def _post_code(self, post):
+        # Codes keep each exact spelling for display; by_post groups them by post_keys
+        code = self.post_lookup.get(post)
+        if code is None:
+            code = len(self.post_names)
+            self.post_names.append(post)
+            self.post_keys.append(None if post is None else post.casefold())
+            self.post_lookup[post] = code
+        return code
+
+    def _append(self, row):
+        emp_id, name, post, salary, email = row[:5]
+        position = len(self.ids)
+        self.ids.append(emp_id)
+        self.names.append(name)
+        self.post_codes.append(self._post_code(post))
+        self.salaries.append(math.nan if salary is None else float(salary))
+        self.emails.append(email)
+        self.alive.append(1)
+        self.position[emp_id] = position
+        return position
+
+    def build_indexes(self):
+        self.by_post = {}
+        self.null_salaries = set()
+        ordered = []
+        for position in range(len(self.ids)):
+            if not self.alive[position]:
+                continue
+            self.by_post.setdefault(self.post_keys[self.post_codes[position]], set()).add(position)
+            if math.isnan(self.salaries[position]):
+                self.null_salaries.add(position)
+            else:
+                ordered.append(position)
+        ordered.sort(key=lambda p: (self.salaries[p], self.ids[p]))
+        self.salary_order = array("q", ordered)
+        self.salary_keys = array("d", (self.salaries[p] for p in ordered))
+
+    # Index maintenance
+    def _salary_slot(self, position):
+        """Where (salary, emp_id) of a row belongs in salary_order."""
+        salary = self.salaries[position]
+        lo = bisect_left(self.salary_keys, salary)
+        hi = bisect_right(self.salary_keys, salary, lo)
+        emp_id = self.ids[position]
+        # Within equal salaries the permutation is ordered by emp_id
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.ids[self.salary_order[mid]] < emp_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _index(self, position):
+        self.by_post.setdefault(self.post_keys[self.post_codes[position]], set()).add(position)
+        if math.isnan(self.salaries[position]):
+            self.null_salaries.add(position)
+        else:
+            slot = self._salary_slot(position)
+            self.salary_order.insert(slot, position)
+            self.salary_keys.insert(slot, self.salaries[position])
+
+    def _unindex(self, position):
+        self.by_post.get(self.post_keys[self.post_codes[position]], set()).discard(position)
+        if math.isnan(self.salaries[position]):
+            self.null_salaries.discard(position)
+        else:
+            slot = self._salary_slot(position)
+            del self.salary_order[slot]
+            del self.salary_keys[slot]
+
+    # Incremental updates from the app's own writes
+    def upsert(self, row):
+        """Insert a full (emp_id, name, post, salary, email) row, or replace it."""
+        if not self.loaded:
+            return
+        position = self.position.get(row[0])
+        if position is None:
+            self._index(self._append(row))
+            if self.search_index is not None:
+                self.search_index.add(row[0], row[1], row[4])
+            return
+        emp_id, name, post, salary, email = row[:5]
+        self._unindex(position)
+        if self.search_index is not None:
+            self.search_index.remove(emp_id, self.names[position], self.emails[position])
+            self.search_index.add(emp_id, name, email)
+        self.names.set(position, name)
+        self.post_codes[position] = self._post_code(post)
+        self.salaries[position] = math.nan if salary is None else float(salary)
+        self.emails.set(position, email)
+        self._index(position)
+
+    def update(self, emp_id, **fields):
+        """Apply a partial update such as a promotion (post and/or salary)."""
+        if not self.loaded:
+            return
+        row = self.row_for(emp_id)
+        if row is None:
+            return
+        values = dict(zip(("emp_id", "name", "post", "salary", "email"), row))
+        values.update(fields)
+        self.upsert(tuple(values[col] for col in ("emp_id", "name", "post", "salary", "email")))
+
+    def remove(self, emp_id):
+        if not self.loaded:
+            return
+        position = self.position.pop(emp_id, None)
+        if position is None:
+            return
+        self._unindex(position)
+        if self.search_index is not None:
+            self.search_index.remove(emp_id, self.names[position], self.emails[position])
+        self.alive[position] = 0
+        self.dead += 1
+
+    def compact(self):
+        """Rewrite the columns without tombstoned rows.
+
+        Row positions change, so any CacheView taken before is invalid.
+        """
+        rows = [self.row(p) for p in range(len(self.ids)) if self.alive[p]]
+        self.load([rows])
+
+    # Reads
+    def row(self, position):
+        salary = self.salaries[position]
+        return (
+            self.ids[position],
+            self.names[position],
+            self.post_names[self.post_codes[position]],
+            None if math.isnan(salary) else salary,
+            self.emails[position]
+        )
+
+    def row_for(self, emp_id):
+        position = self.position.get(emp_id)
+        return None if position is None else self.row(position)
+
+    def search(self, text, limit=200):
+        """Rows whose name/email words start with every word of ``text``, best match first."""
+        if self.search_index is None:
+            return []
+        return [self.row_for(emp_id) for emp_id in self.search_index.search(text, limit)]
+
+    def select(self, post=None, low=None, high=None, inclusive=True,
+               sort_field="emp_id", descending=False):
+        """Return a CacheView of the rows matching a post and salary range.
+
+        ``low``/``high`` bound the salary (None means unbounded) and are
+        inclusive or exclusive together, mirroring the filter dialog's
+        ranges; ``post`` matches case-insensitively. Sorting follows the SQL paginator: ties are broken by
+        emp_id and NULLs sort first ascending.
+        """
+        salary_filtered = low is not None or high is not None
+        if salary_filtered:
+            start, end = 0, len(self.salary_keys)
+            if low is not None:
+                start = (bisect_left if inclusive else bisect_right)(self.salary_keys, low)
+            if high is not None:
+                end = (bisect_right if inclusive else bisect_left)(self.salary_keys, high)
+            in_range = self.salary_order[start:end]
+        else:
+            in_range = None
+
+        if post is not None:
+            # Every spelling of the post, as ``post = %s`` matches under the ci collation
+            by_post = self.by_post.get(post.casefold(), set())
+            if in_range is None:
+                positions = list(by_post)
+            elif len(by_post) < len(in_range):
+                positions = [p for p in by_post if self._in_salary_range(p, low, high, inclusive)]
+            else:
+                positions = [p for p in in_range if p in by_post]
+        elif in_range is not None:
+            positions = list(in_range)
+        else:
+            positions = None  # every live row
+
+        return CacheView(self, self._sorted(positions, sort_field, descending, in_range))
+
+    def _in_salary_range(self, position, low, high, inclusive):
+        salary = self.salaries[position]
+        if math.isnan(salary):
+            return False
+        if inclusive:
+            return (low is None or salary >= low) and (high is None or salary <= high)
+        return (low is None or salary > low) and (high is None or salary < high)
+
+    def _sorted(self, positions, sort_field, descending, in_range):
+        if sort_field == "salary":
+            # Walk the salary permutation (or the range slice of it) instead of sorting
+            if positions is None:
+                ordered = sorted(self.null_salaries, key=self.ids.__getitem__) + list(self.salary_order)
+            elif in_range is not None:
+                wanted = set(positions)
+                ordered = [p for p in in_range if p in wanted]
+            else:
+                wanted = set(positions)
+                nulls = sorted(wanted & self.null_salaries, key=self.ids.__getitem__)
+                ordered = nulls + [p for p in self.salary_order if p in wanted]
+            return array("q", reversed(ordered) if descending else ordered)
+
+        if positions is None:
+            positions = [p for p in range(len(self.ids)) if self.alive[p]]
+        if sort_field == "emp_id":
+            key = self.ids.__getitem__
+        elif sort_field == "name":
+            key = lambda p: self._text_key(self.names[p], p)
+        elif sort_field == "post":
+            key = lambda p: self._text_key(self.post_names[self.post_codes[p]], p)
+        else:
+            raise ValueError(f"Unsupported sort field: {sort_field}")
+        return array("q", sorted(positions, key=key, reverse=descending))
+
+    def _text_key(self, value, position):
+        # NULLs first, case-insensitive like the server collation, emp_id breaks ties
+        if value is None:
+            return (0, "", self.ids[position])
+        return (1, value.casefold(), self.ids[position])
+
+
+class CacheView:
+    """Read-only sequence of cached rows in a given order, materialized on access."""
+
+    def __init__(self, cache, positions):
+        self.cache = cache
+        self.positions = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.cache.row(p) for p in self.positions[index]]
+        return self.cache.row(self.positions[index])
+
+    def __iter__(self):
+        for position in self.positions:
+            yield self.cache.row(position)
@@ -0,0 +1,263 @@
+import argparse
+import os
+import sys
+
+from employee_db import (
+    SALARY_RANGES, SORT_FIELDS, DatabaseOperations, build_filter, db_error, get_pool,
+    select_employees_sql, shutdown
+)
+from employee_io import INSERT_EMPLOYEE, CsvWriter, JsonLinesWriter, bulk_import, export_employees, validate_record
+from employee_search import find_matches, search_conditions
+
+
+# Headless command line: no tkinter or PIL, so a scheduled job starts in
+# milliseconds instead of waiting for the GUI
+class TsvWriter:
+    def __init__(self, fp):
+        self.fp = fp
+
+    def write(self, rows):
+        self.fp.write("".join(
+            "\t".join("" if value is None else str(value) for value in row[:5]) + "\n" for row in rows
+        ))
+
+    def close(self):
+        pass
+
+
+OUTPUT_FORMATS = {"tsv": TsvWriter, "csv": CsvWriter, "jsonl": JsonLinesWriter}
+
+
+def print_rows(batches, output_format="tsv", out=None):
+    """Write row batches to stdout as they arrive; returns the number of rows."""
+    out = out or sys.stdout
+    writer = OUTPUT_FORMATS[output_format](out)
+    count = 0
+    for rows in batches:
+        writer.write(rows)
+        out.flush()  # Downstream commands see each batch as soon as it is read
+        count += len(rows)
+    writer.close()
+    return count
+
+
+def read_ids(values, ids_from=None):
+    """emp_ids from the command line plus, with --ids-from, the first column of a file or stdin.
+
+    Lines whose first field is not a number (a CSV header) are skipped, so
+    the output of ``list``/``filter``/``search`` can be piped straight in.
+    """
+    ids = list(values)
+    if ids_from:
+        fp = sys.stdin if ids_from == "-" else open(ids_from, encoding="utf-8")
+        try:
+            for line in fp:
+                field = line.replace(",", "\t").split("\t", 1)[0].strip()
+                if field.isdigit():
+                    ids.append(int(field))
+        finally:
+            if fp is not sys.stdin:
+                fp.close()
+    return list(dict.fromkeys(ids))  # Drop repeats, keep order
+
+
+def view_query(args, conditions=(), params=()):
+    """SELECT for a list/filter/search/export command, with its sort and limit options."""
+    query = select_employees_sql(conditions, args.sort, args.desc)
+    params = list(params)
+    if getattr(args, "limit", None):
+        query += " LIMIT %s"
+        params.append(args.limit)
+    return query, params
+
+
+def cmd_list(db, args):
+    conditions, params = build_filter(args.post, args.salary)
+    query, params = view_query(args, conditions, params)
+    print_rows(db.stream(query, params, batch_size=args.batch_size), args.format)
+
+
+def cmd_search(db, args):
+    if args.id:
+        query, params = view_query(args, [f"emp_id IN ({', '.join(['%s'] * len(args.id))})"], args.id)
+        print_rows(db.stream(query, params, batch_size=args.batch_size), args.format)
+        return
+    conditions, params = search_conditions(args.text)
+    if not conditions:
+        sys.exit("Nothing to search for")
+    limit, args.limit = args.limit, None  # The LIKE pre-filter over-selects; limit after matching
+    query, params = view_query(args, conditions, params)
+    matches = find_matches(db.stream(query, params, batch_size=args.batch_size), args.text)
+    if limit:
+        matches = take(matches, limit)
+    print_rows(matches, args.format)
+
+
+def take(batches, limit):
+    for rows in batches:
+        yield rows[:limit]
+        limit -= len(rows)
+        if limit <= 0:
+            return
+
+
+def cmd_add(db, args):
+    try:
+        name, post, salary, email = validate_record(
+            {"name": args.name, "post": args.post, "salary": args.salary, "email": args.email}
+        )
+    except ValueError as e:
+        sys.exit(f"Invalid employee: {e}")
+    emp_id = db.execute_query(INSERT_EMPLOYEE, (name, post, salary, email))
+    print(emp_id)
+
+
+def cmd_promote(db, args):
+    ids = read_ids(args.ids, args.ids_from)
+    fields = {}
+    if args.post:
+        fields["post"] = args.post
+    if args.salary is not None:
+        fields["salary"] = args.salary
+    if not fields:
+        sys.exit("Give --post, --salary or both")
+    if not ids:
+        sys.exit("No employee IDs given")
+    # One UPDATE ... WHERE emp_id IN (...) per 1000 ids, all in one transaction
+    promoted = db.update_employees(ids, fields)
+    print(f"Promoted {promoted} of {len(ids)} employee(s)", file=sys.stderr)
+
+
+def cmd_remove(db, args):
+    ids = read_ids(args.ids, args.ids_from)
+    if not ids:
+        sys.exit("No employee IDs given")
+    removed = db.delete_employees(ids)
+    print(f"Removed {removed} of {len(ids)} employee(s)", file=sys.stderr)
+
+
+def cmd_import(db, args):
+    def progress(report):
+        if args.progress:
+            print(f"\r{report.read:,} read, {report.inserted:,} inserted, {report.rejected:,} rejected "
+                  f"({report.rows_per_second:,.0f} rows/s)", end="", file=sys.stderr, flush=True)
+
+    report = bulk_import(db, args.file, chunk_size=args.chunk_size, progress=progress)
+    if args.progress:
+        print(file=sys.stderr)
+    print(report.summary(), file=sys.stderr)
+    if report.rejected:
+        sys.exit(1)
+
+
+def cmd_export(db, args):
+    conditions, params = build_filter(args.post, args.salary)
+    query, params = view_query(args, conditions, params)
+
+    def progress(report):
+        if args.progress:
+            print(f"\r{report.written:,} rows", end="", file=sys.stderr, flush=True)
+
+    try:
+        report = export_employees(db.stream(query, params, batch_size=args.batch_size), args.file, progress)
+    except ValueError as e:
+        sys.exit(str(e))
+    if args.progress:
+        print(file=sys.stderr)
+    print(report.summary(), file=sys.stderr)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Employee Management System without the GUI, for scripts and scheduled jobs",
+        epilog="Uses the same DB_* settings as main.py. Rows are printed as they are read: "
+               "emp_id, name, post, salary, email."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def view_options(command, filters=True, limit=True):
+        if filters:
+            command.add_argument("--post", default="All", help="only employees with this post")
+            command.add_argument("--salary", default="All", choices=SALARY_RANGES, metavar="RANGE",
+                                 help=f"salary range: {', '.join(repr(r) for r in SALARY_RANGES)}")
+        command.add_argument("--sort", default="emp_id", choices=SORT_FIELDS, help="sort field (default emp_id)")
+        command.add_argument("--desc", action="store_true", help="sort in descending order")
+        if limit:
+            command.add_argument("--limit", type=int, help="print at most this many rows")
+        command.add_argument("--batch-size", type=int, default=1000, help=argparse.SUPPRESS)
+
+    def output_options(command):
+        command.add_argument("--format", default="tsv", choices=sorted(OUTPUT_FORMATS),
+                             help="output format (default tsv)")
+
+    def id_options(command):
+        command.add_argument("ids", nargs="*", type=int, metavar="ID", help="employee IDs")
+        command.add_argument("--ids-from", metavar="FILE",
+                             help="also read IDs from the first column of FILE ('-' for stdin)")
+
+    command = commands.add_parser("list", help="list employees")
+    view_options(command, filters=False)
+    output_options(command)
+    command.set_defaults(handler=cmd_list, post="All", salary="All")
+
+    command = commands.add_parser("filter", help="list employees by post and salary range")
+    view_options(command)
+    output_options(command)
+    command.set_defaults(handler=cmd_list)
+
+    command = commands.add_parser("search", help="find employees by ID or by name/email words")
+    command.add_argument("text", nargs="?", default="",
+                         help="words that must start a word of the name or email, as in Find")
+    command.add_argument("--id", type=int, action="append", metavar="ID", help="look up an ID (repeatable)")
+    view_options(command, filters=False)
+    output_options(command)
+    command.set_defaults(handler=cmd_search)
+
+    command = commands.add_parser("add", help="add an employee and print its ID")
+    command.add_argument("name")
+    command.add_argument("post")
+    command.add_argument("salary")
+    command.add_argument("--email")
+    command.set_defaults(handler=cmd_add)
+
+    command = commands.add_parser("promote", help="set the post and/or salary of employees")
+    id_options(command)
+    command.add_argument("--post", help="new post")
+    command.add_argument("--salary", type=float, help="new salary")
+    command.set_defaults(handler=cmd_promote)
+
+    command = commands.add_parser("remove", help="remove employees (per DB_ID_MODE)")
+    id_options(command)
+    command.set_defaults(handler=cmd_remove)
+
+    command = commands.add_parser("import", help="bulk-load a CSV, JSON or JSON Lines file")
+    command.add_argument("file")
+    command.add_argument("--chunk-size", type=int, default=1000, help="rows per transaction (default 1000)")
+    command.add_argument("--progress", action="store_true", help="show progress on stderr")
+    command.set_defaults(handler=cmd_import)
+
+    command = commands.add_parser("export", help="stream employees to a .csv, .jsonl or .empcol file")
+    command.add_argument("file")
+    view_options(command, limit=False)
+    command.add_argument("--progress", action="store_true", help="show progress on stderr")
+    command.set_defaults(handler=cmd_export)
+
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = DatabaseOperations(get_pool(), show_errors=False)
+    try:
+        args.handler(db, args)
+    except BrokenPipeError:
+        # The reader (head, grep -m) went away; stop quietly like other filters
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    except db_error() as e:
+        sys.exit(f"Database error: {e}")
+    finally:
+        shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,866 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from backends import get_backend
+from query_metrics import get_metrics
+
+
+def db_error():
+    """Base exception class of the configured backend's driver."""
+    return get_backend().error
+
+
+# Server-side prepared statements
+ER_UNKNOWN_STMT_HANDLER = 1243
+
+
+class StatementCache:
+    """Prepared statements of one connection, keyed by SQL text.
+
+    Each statement lives in its own prepared cursor, so executing the same
+    SQL again only sends the parameters. The cache is LRU bounded; evicted
+    cursors are closed, which deallocates the statement on the server. A
+    reconnect (the pool pings with reconnect=True) gives the connection a
+    new session id and empties the cache, so statements are re-prepared
+    on their next use.
+    """
+
+    def __init__(self, con, size=64):
+        self.con = con
+        self.size = size
+        self.cursors = OrderedDict()  # SQL -> prepared cursor, least recent first
+        self.session = con.connection_id
+
+    def cursor(self, query):
+        if self.con.connection_id != self.session:
+            # The old session's statements died with it; nothing to deallocate
+            self.cursors.clear()
+            self.session = self.con.connection_id
+        cursor = self.cursors.get(query)
+        if cursor is not None:
+            self.cursors.move_to_end(query)
+            return cursor
+        cursor = self.con.cursor(prepared=True)
+        self.cursors[query] = cursor
+        while len(self.cursors) > self.size:
+            _, old = self.cursors.popitem(last=False)
+            self._close_quietly(old)
+        return cursor
+
+    def execute(self, query, params=None):
+        """Execute ``query`` as a prepared statement and return its cursor.
+
+        Rows must be fetched before the connection runs anything else.
+        """
+        cursor = self.cursor(query)
+        try:
+            cursor.execute(query, params or ())
+        except db_error() as e:
+            if e.errno != ER_UNKNOWN_STMT_HANDLER:
+                raise
+            # The server forgot the statement (e.g. it was reset); prepare it again
+            self.discard(query)
+            cursor = self.cursor(query)
+            cursor.execute(query, params or ())
+        return cursor
+
+    def discard(self, query):
+        cursor = self.cursors.pop(query, None)
+        if cursor is not None:
+            self._close_quietly(cursor)
+
+    def close(self):
+        while self.cursors:
+            _, cursor = self.cursors.popitem()
+            self._close_quietly(cursor)
+
+    @staticmethod
+    def _close_quietly(cursor):
+        try:
+            cursor.close()
+        except Exception:
+            pass
+
+
+class ConnectionPool:
+    """Process-wide pool of database connections (MySQL, or SQLite via backends.py).
+
+    Connections are opened lazily up to ``size`` and handed out most
+    recently used first. A connection that has sat idle for longer than
+    ``validate_after`` seconds is pinged (and reconnected if the server
+    dropped it) before being handed out, and one idle for longer than
+    ``idle_timeout`` seconds is closed instead of reused.
+
+    Each pooled connection also keeps a StatementCache of up to
+    ``statement_cache_size`` prepared statements (0 disables them) when
+    the backend supports them.
+    """
+
+    def __init__(self, size=5, idle_timeout=300, validate_after=5, timeout=30,
+                 statement_cache_size=64, backend=None):
+        self.backend = backend or get_backend()
+        self.size = size
+        self.idle_timeout = idle_timeout
+        self.validate_after = validate_after
+        self.timeout = timeout
+        self.statement_cache_size = statement_cache_size
+        self._idle = deque()  # (connection, last used), most recent on the right
+        self._open = 0
+        self._cond = threading.Condition()
+        self._statements = {}  # connection -> StatementCache
+
+    def connect(self):
+        return self.backend.connect()
+
+    def evict_idle(self):
+        """Close connections idle for longer than idle_timeout. Caller holds the lock."""
+        cutoff = time.monotonic() - self.idle_timeout
+        while self._idle and self._idle[0][1] < cutoff:
+            con, _ = self._idle.popleft()
+            self._open -= 1
+            self._close_quietly(con)
+
+    def acquire(self):
+        """Check out a validated connection, waiting if the pool is exhausted."""
+        deadline = time.monotonic() + self.timeout
+        while True:
+            with self._cond:
+                self.evict_idle()
+                while not self._idle and self._open >= self.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        error = self.backend.pool_exhausted("Connection pool exhausted")
+                        error.pool_exhausted = True  # Tells it apart from other driver errors
+                        raise error
+                    self._cond.wait(remaining)
+                if self._idle:
+                    con, last_used = self._idle.pop()
+                else:
+                    con, last_used = None, None
+                    self._open += 1
+
+            if con is None:
+                try:
+                    return self.connect()
+                except Exception:
+                    self._discard()
+                    raise
+
+            if time.monotonic() - last_used < self.validate_after:
+                return con
+            try:
+                con.ping(reconnect=True, attempts=1, delay=0)
+                return con
+            except db_error():
+                # Dead connection, drop it and try the next one
+                self._close_quietly(con)
+                self._discard()
+
+    def release(self, con):
+        """Return a connection to the pool."""
+        try:
+            if con.in_transaction:
+                con.rollback()
+        except db_error():
+            self._close_quietly(con)
+            self._discard()
+            return
+        with self._cond:
+            self._idle.append((con, time.monotonic()))
+            self.evict_idle()
+            self._cond.notify()
+
+    def statements(self, con):
+        """Return the StatementCache of a checked-out connection, or None if disabled."""
+        if self.statement_cache_size <= 0 or not self.backend.prepared_statements:
+            return None
+        with self._cond:
+            cache = self._statements.get(con)
+            if cache is None:
+                cache = self._statements[con] = StatementCache(con, self.statement_cache_size)
+            return cache
+
+    @contextmanager
+    def connection(self):
+        con = self.acquire()
+        try:
+            yield con
+        finally:
+            self.release(con)
+
+    def close_all(self):
+        """Close every idle connection, e.g. on application exit."""
+        with self._cond:
+            while self._idle:
+                con, _ = self._idle.pop()
+                self._open -= 1
+                self._close_quietly(con)
+
+    def _discard(self):
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+    def _close_quietly(self, con):
+        with self._cond:
+            cache = self._statements.pop(con, None)
+        if cache is not None:
+            cache.close()
+        try:
+            con.close()
+        except Exception:
+            pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Return the process-wide connection pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ConnectionPool(
+                size=int(os.getenv("DB_POOL_SIZE", "5")),
+                idle_timeout=float(os.getenv("DB_POOL_IDLE_TIMEOUT", "300")),
+                statement_cache_size=int(os.getenv("DB_STATEMENT_CACHE_SIZE", "64"))
+            )
+        return _pool
+
+
+_executor = None
+
+
+def get_executor():
+    """Return the process-wide worker pool that runs queries off the Tk thread."""
+    global _executor
+    with _pool_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=int(os.getenv("DB_POOL_SIZE", "5")),
+                thread_name_prefix="db-worker"
+            )
+        return _executor
+
+
+def shutdown():
+    """Stop background queries and close pooled connections, if they were ever created."""
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    if _pool is not None:
+        _pool.close_all()
+
+
+class DatabaseOperations:
+    def __init__(self, pool, executor=None, show_errors=True, metrics=None):
+        self.pool = pool
+        self.executor = executor or get_executor()
+        self.show_errors = show_errors  # False for command-line use
+        self.metrics = metrics or get_metrics()  # Per-shape timings, see query_metrics
+
+    def submit(self, fn, *args, **kwargs):
+        """Run fn(*args, **kwargs) on a worker thread and return its Future."""
+        return self.executor.submit(fn, *args, **kwargs)
+
+    def report_error(self, e, message="Error"):
+        """Show a database error, or re-raise it off the Tk thread or without a GUI."""
+        if not self.show_errors or threading.current_thread() is not threading.main_thread():
+            raise e
+        from tkinter import messagebox  # Only the GUI shows errors, so the CLI never loads Tk
+        messagebox.showerror("Database Error", f"{message}: {e}")
+
+    def run(self, con, query, params=None):
+        """Execute on a checked-out connection, as a cached prepared statement when enabled.
+
+        Returns the cursor. Hand it back with ``finish`` once its rows are
+        read: prepared cursors stay open in the cache, plain ones are closed.
+        """
+        statements = self.pool.statements(con)
+        if statements is None:
+            cursor = con.cursor()
+            cursor.execute(query, params)
+            return cursor
+        return statements.execute(query, params)
+
+    def finish(self, con, cursor):
+        if self.pool.statements(con) is None:
+            cursor.close()
+
+    def execute_query(self, query, params=None):
+        """Execute and commit a statement; returns the AUTO_INCREMENT id of an INSERT."""
+        try:
+            with self.pool.connection() as con:
+                with self.metrics.measure(query, params) as measured:
+                    cursor = self.run(con, query, params)
+                    measured.affected(cursor.rowcount)
+                    measured.commit(con)
+                self.finish(con, cursor)
+                return cursor.lastrowid
+        except db_error() as e:
+            self.report_error(e)
+
+    def execute_many(self, query, rows):
+        """Execute a statement once per params tuple, all in one transaction."""
+        try:
+            with self.pool.connection() as con:
+                cursor = con.cursor()
+                try:
+                    cursor.executemany(query, rows)
+                    con.commit()
+                except db_error():
+                    con.rollback()
+                    raise
+                finally:
+                    cursor.close()
+        except db_error() as e:
+            self.report_error(e)
+
+    def fetchall(self, query, params=None):
+        try:
+            with self.pool.connection() as con:
+                with self.metrics.measure(query, params) as measured:
+                    cursor = self.run(con, query, params)
+                    rows = measured.fetched(cursor.fetchall())
+                self.finish(con, cursor)
+                return rows
+        except db_error() as e:
+            self.report_error(e)
+            return []
+    
+    def check_employee_exists(self, emp_id):
+        """Check if an employee exists in the database by ID."""
+        try:
+            query = "SELECT COUNT(*) FROM employees WHERE " + " AND ".join(live_conditions() + ["emp_id = %s"])
+            with self.pool.connection() as con:
+                with self.metrics.measure(query, (emp_id,)) as measured:
+                    cursor = self.run(con, query, (emp_id,))
+                    result = measured.fetched(cursor.fetchall())[0]  # Drain the result so the connection stays usable
+                self.finish(con, cursor)
+            return result[0] > 0  # Return True if count > 0, else False
+        except db_error() as e:
+            self.report_error(e)
+            return False
+     
+    @contextmanager
+    def transaction(self):
+        """Yield a borrowed connection; commit on success, roll back on error."""
+        with self.pool.connection() as con:
+            try:
+                yield con
+                con.commit()
+            except Exception:
+                con.rollback()
+                raise
+
+    def execute_for_ids(self, query, params, ids, chunk_size=1000):
+        """Run a statement containing "emp_id IN ({ids})" for many ids in one transaction.
+
+        Large id lists are split into chunks of IN lists, but all chunks
+        share a single transaction. Returns the number of affected rows.
+        """
+        ids = list(ids)
+        affected = 0
+        try:
+            with self.transaction() as con:
+                for start in range(0, len(ids), chunk_size):
+                    chunk = ids[start:start + chunk_size]
+                    placeholders = ", ".join(["%s"] * len(chunk))
+                    statement = query.format(ids=placeholders)
+                    with self.metrics.measure(statement, list(params) + chunk) as measured:
+                        cursor = self.run(con, statement, list(params) + chunk)
+                        measured.affected(cursor.rowcount)
+                    affected += cursor.rowcount
+                    self.finish(con, cursor)
+            return affected
+        except db_error() as e:
+            self.report_error(e)
+            return 0
+
+    def delete_employees(self, ids):
+        """Remove employees according to DB_ID_MODE, in one transaction.
+
+        In "soft" mode the rows are stamped with deleted_at, a plain row
+        update that never touches AUTO_INCREMENT. In the default "reset"
+        mode the rows are deleted and the counter reset once afterwards.
+        """
+        if id_mode() == "soft":
+            return self.execute_for_ids(SOFT_DELETE, [], ids)
+        affected = self.execute_for_ids(HARD_DELETE, [], ids)
+        self.reset_auto_increment()
+        return affected
+
+    def delete_employee(self, emp_id):
+        return self.delete_employees([emp_id])
+
+    def update_employees(self, ids, fields):
+        """Apply the same field values (e.g. a promotion) to many employees at once."""
+        for field in fields:
+            if field not in UPDATABLE_FIELDS:
+                raise ValueError(f"Cannot update field: {field}")
+        assignments = ", ".join(f"{field} = %s" for field in fields)
+        query = f"UPDATE employees SET {assignments} WHERE emp_id IN ({{ids}})"
+        return self.execute_for_ids(query, list(fields.values()), ids)
+
+    def compact_deleted(self, older_than_days=30, batch_size=1000):
+        """Purge soft-deleted rows older than the given age, in small batches.
+
+        Meant to run offline (cron, maintenance window). Purged ids are not
+        handed out again because AUTO_INCREMENT is left alone. Returns the
+        number of rows purged.
+        """
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        purged = 0
+        while True:
+            rows = self.fetchall(
+                "SELECT emp_id FROM employees WHERE deleted_at IS NOT NULL AND deleted_at < %s "
+                "ORDER BY emp_id LIMIT %s",
+                (cutoff, batch_size)
+            )
+            if not rows:
+                return purged
+            self.execute_for_ids(HARD_DELETE, [], [row[0] for row in rows])
+            purged += len(rows)
+
+    def prune_changes(self, older_than_days=30, batch_size=5000):
+        """Delete change-log entries older than the given age, in small batches.
+
+        A client that has not polled since then reloads in full. Returns the
+        number of entries deleted (0 if migration 0003 is not applied).
+        """
+        cutoff = datetime.now() - timedelta(days=older_than_days)
+        pruned = 0
+        try:
+            with self.pool.connection() as con:
+                cursor = self.run(
+                    con,
+                    "SELECT MIN(change_id), MAX(change_id) FROM employee_changes WHERE changed_at < %s",
+                    (cutoff,)
+                )
+                first, last = cursor.fetchall()[0]
+                self.finish(con, cursor)
+            # changed_at grows with change_id, so expired entries form one id range
+            start = first
+            while first is not None and start <= last:
+                with self.transaction() as con:
+                    cursor = self.run(
+                        con,
+                        "DELETE FROM employee_changes WHERE change_id BETWEEN %s AND %s",
+                        (start, min(last, start + batch_size - 1))
+                    )
+                    pruned += cursor.rowcount
+                    self.finish(con, cursor)
+                start += batch_size
+        except db_error() as e:
+            if getattr(e, "errno", None) != ER_NO_SUCH_TABLE:
+                self.report_error(e)
+        return pruned
+
+    def reset_auto_increment(self):
+        """Reset auto-increment to match the highest emp_id."""
+        try:
+            with self.pool.connection() as con:
+                cursor = con.cursor()
+                # Find the max emp_id
+                query = "SELECT MAX(emp_id) FROM employees"
+                with self.metrics.measure(query) as measured:
+                    cursor.execute(query)
+                    max_id = measured.fetched([cursor.fetchone()])[0][0]
+                
+                # If table is empty, reset to 1, otherwise to max_id + 1
+                next_id = 1 if max_id is None else max_id + 1
+                
+                # Reset auto-increment; the statement depends on the backend
+                with self.metrics.measure("reset auto-increment (employees)", (next_id,)) as measured:
+                    self.pool.backend.set_auto_increment(cursor, "employees", next_id)
+                    measured.commit(con)
+                cursor.close()
+        except db_error() as e:
+            self.report_error(e, "Error resetting auto-increment")
+
+    def explain(self, query, params=None):
+        """Return the EXPLAIN plan of a statement as a list of dicts."""
+        with self.pool.connection() as con:
+            return self.pool.backend.explain(con, query, params)
+
+    def stream(self, query, params=None, batch_size=1000):
+        """Yield the result of a query in fetchmany batches.
+
+        Uses an unbuffered cursor so rows are read off the socket as they
+        are consumed and only one batch is held in memory at a time. The
+        connection stays checked out of the pool until the generator ends.
+        """
+        try:
+            con = self.pool.acquire()
+        except db_error() as e:
+            self.report_error(e)
+            return
+        cursor = con.cursor(buffered=False)
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        except db_error() as e:
+            self.report_error(e)
+        finally:
+            # An unbuffered result has to be drained before the connection is reusable
+            try:
+                while cursor.fetchmany(batch_size):
+                    pass
+            except db_error():
+                pass
+            cursor.close()
+            self.pool.release(con)
+
+
+# Set-based statements; {ids} becomes a list of placeholders
+HARD_DELETE = "DELETE FROM employees WHERE emp_id IN ({ids})"
+SOFT_DELETE = "UPDATE employees SET deleted_at = CURRENT_TIMESTAMP WHERE emp_id IN ({ids}) AND deleted_at IS NULL"
+UPDATABLE_FIELDS = ("name", "post", "salary", "email")
+
+
+def id_mode():
+    """How deletes treat emp_id: "reset" (delete + AUTO_INCREMENT reset) or "soft"."""
+    return os.getenv("DB_ID_MODE", "reset").lower()
+
+
+def live_conditions():
+    """Conditions that hide soft-deleted rows (none in reset mode)."""
+    return ["deleted_at IS NULL"] if id_mode() == "soft" else []
+
+
+# Columns shown in the grid, in display order
+EMPLOYEE_COLUMNS = ("emp_id", "name", "post", "salary", "email")
+SORT_FIELDS = ("emp_id", "name", "post", "salary")
+SALARY_RANGES = [
+    "All",
+    "Below 20000",
+    "20000-40000",
+    "40001-60000",
+    "60001-80000",
+    "Above 80000"
+]
+
+
+def salary_bounds(salary_range="All"):
+    """Return (low, high, inclusive) for a salary range label; None means unbounded."""
+    if salary_range == "All":
+        return None, None, True
+    if salary_range.startswith("Below"):
+        return None, 20000, False
+    if salary_range.startswith("Above"):
+        return 80000, None, False
+    min_salary, max_salary = map(int, salary_range.split("-"))
+    return min_salary, max_salary, True
+
+
+def build_filter(post="All", salary_range="All"):
+    """Translate the filter dialog choices into WHERE conditions and params."""
+    conditions = []
+    params = []
+
+    # Add post filter
+    if post != "All":
+        conditions.append("post = %s")
+        params.append(post)
+
+    # Add salary range filter
+    low, high, inclusive = salary_bounds(salary_range)
+    if low is not None and high is not None:
+        conditions.append("salary BETWEEN %s AND %s")
+        params.extend([low, high])
+    elif low is not None:
+        conditions.append("salary >= %s" if inclusive else "salary > %s")
+        params.append(low)
+    elif high is not None:
+        conditions.append("salary <= %s" if inclusive else "salary < %s")
+        params.append(high)
+
+    return conditions, params
+
+
+def filter_predicate(post="All", salary_range="All"):
+    """Python twin of build_filter: does a (emp_id, name, post, salary, ...) row match?"""
+    low, high, inclusive = salary_bounds(salary_range)
+
+    def matches(row):
+        if post != "All" and (row[2] or "").casefold() != post.casefold():
+            return False  # Case-insensitive like the server collation
+        if low is None and high is None:
+            return True
+        salary = row[3]
+        if salary is None:
+            return False
+        if inclusive:
+            return (low is None or salary >= low) and (high is None or salary <= high)
+        return (low is None or salary > low) and (high is None or salary < high)
+
+    return matches
+
+
+def row_sort_key(row, sort_field="emp_id"):
+    """Sort key giving the same order as select_employees_sql ascending.
+
+    NULLs first, text compared case-insensitively, emp_id breaking ties;
+    descending order is the exact reverse.
+    """
+    emp_id = row[0]
+    if sort_field == "emp_id":
+        return (emp_id,)
+    value = row[EMPLOYEE_COLUMNS.index(sort_field)]
+    if value is None:
+        return (0, 0, emp_id)
+    if isinstance(value, str):
+        value = value.casefold()
+    return (1, value, emp_id)
+
+
+def select_employees_sql(conditions=(), sort_field="emp_id", descending=False):
+    """Build the SELECT for a filtered view, ordered with emp_id as tie-breaker."""
+    if sort_field not in SORT_FIELDS:
+        raise ValueError(f"Unsupported sort field: {sort_field}")
+    order = "DESC" if descending else "ASC"
+    conditions = live_conditions() + list(conditions)
+    query = f"SELECT {', '.join(EMPLOYEE_COLUMNS)} FROM employees"
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    if sort_field == "emp_id":
+        query += f" ORDER BY emp_id {order}"
+    else:
+        query += f" ORDER BY {sort_field} {order}, emp_id {order}"
+    return query
+
+
+class KeysetPaginator:
+    """Page through the employees table with keyset (seek) pagination.
+
+    Each page is ``WHERE <filters> AND <after last row> ORDER BY sort, emp_id
+    LIMIT n``, so fetching page 1000 costs the same as fetching page 1 and
+    nothing beyond the current page is held by the driver. emp_id breaks
+    ties so pages are stable for non-unique sort fields, and NULL sort
+    values are handled the way MySQL orders them (first ascending, last
+    descending).
+    """
+
+    def __init__(self, db, conditions=(), params=(), sort_field="emp_id", descending=False, page_size=500):
+        if sort_field not in SORT_FIELDS:
+            raise ValueError(f"Unsupported sort field: {sort_field}")
+        self.db = db
+        self.conditions = list(conditions)
+        self.params = list(params)
+        self.sort_field = sort_field
+        self.descending = descending
+        self.page_size = page_size
+        self.last_row = None
+        self.exhausted = False
+
+    def seek_condition(self):
+        """Return the condition and params that skip rows already returned."""
+        if self.last_row is None:
+            return None, []
+
+        last_id = self.last_row[0]
+        op = "<" if self.descending else ">"
+        if self.sort_field == "emp_id":
+            return f"emp_id {op} %s", [last_id]
+
+        col = self.sort_field
+        last_value = self.last_row[EMPLOYEE_COLUMNS.index(col)]
+        if last_value is None:
+            if self.descending:
+                # NULLs come last, only the NULL tail remains
+                return f"({col} IS NULL AND emp_id < %s)", [last_id]
+            return f"(({col} IS NULL AND emp_id > %s) OR {col} IS NOT NULL)", [last_id]
+
+        condition = f"({col} {op} %s OR ({col} = %s AND emp_id {op} %s)"
+        if self.descending:
+            condition += f" OR {col} IS NULL"
+        return condition + ")", [last_value, last_value, last_id]
+
+    def page_query(self):
+        """Return the query and params for the next page."""
+        conditions = list(self.conditions)
+        params = list(self.params)
+        seek, seek_params = self.seek_condition()
+        if seek:
+            conditions.append(seek)
+            params.extend(seek_params)
+
+        query = select_employees_sql(conditions, self.sort_field, self.descending) + " LIMIT %s"
+        params.append(self.page_size)
+        return query, params
+
+    def next_page(self):
+        """Fetch the next page of rows, or an empty list once exhausted."""
+        if self.exhausted:
+            return []
+
+        # A page is bounded by LIMIT, so it is fetched in one go as a prepared statement
+        query, params = self.page_query()
+        rows = self.db.fetchall(query, params)
+
+        if rows:
+            self.last_row = rows[-1]
+        self.exhausted = len(rows) < self.page_size
+        return rows
+
+    def pages(self):
+        """Yield pages until the result is exhausted."""
+        while True:
+            rows = self.next_page()
+            if rows:
+                yield rows
+            if self.exhausted:
+                return
+
+
+# Delta sync
+ER_NO_SUCH_TABLE = 1146
+
+
+class ChangeFeed:
+    """Employees changed by any client since the last poll.
+
+    Reads the ``employee_changes`` log that migration 0003 fills from
+    triggers, so each poll costs O(changes), not O(employees). ``mark`` is
+    the highest change_id applied so far.
+
+    change_ids are handed out when a row is written but become visible
+    when its transaction commits, so a slow transaction can commit an id
+    below the mark. Each poll therefore re-reads the last ``lookback``
+    ids and skips the ones already applied (``recent``).
+    """
+
+    def __init__(self, db, batch_size=2000, lookback=5000):
+        self.db = db
+        self.batch_size = batch_size
+        self.lookback = lookback
+        self.mark = None
+        self.base = 0  # Where following started; entries up to it are in the snapshot
+        self.recent = set()
+
+    def bounds(self):
+        """(oldest, newest) change_id in the log, (None, None) when empty."""
+        return tuple(self.db.fetchall("SELECT MIN(change_id), MAX(change_id) FROM employee_changes")[0])
+
+    def start(self):
+        """Begin following the log from its current end."""
+        self.mark = self.base = self.bounds()[1] or 0
+        self.recent.clear()
+
+    def poll(self):
+        """Return (rows, removed, more, reload).
+
+        ``rows`` are current full rows of employees changed since the last
+        poll, ``removed`` the emp_ids among them that are deleted (or soft
+        deleted). ``more`` means the batch was full and the caller should
+        poll again straight away; ``reload`` that entries were pruned past
+        the mark and only a full reload is correct.
+        """
+        if self.mark is None:
+            self.start()
+            return [], [], False, False
+        oldest, _ = self.bounds()
+        if oldest is not None and self.mark > 0 and oldest > self.mark + 1:
+            self.start()  # --compact pruned entries we never saw
+            return [], [], False, True
+
+        floor = max(self.base, self.mark - self.lookback)
+        limit = self.batch_size + len(self.recent)
+        changes = self.db.fetchall(
+            "SELECT change_id, emp_id FROM employee_changes WHERE change_id > %s "
+            "ORDER BY change_id LIMIT %s",
+            (floor, limit)
+        )
+        new = [(change_id, emp_id) for change_id, emp_id in changes if change_id not in self.recent]
+        if changes:
+            self.mark = max(self.mark, changes[-1][0])
+        floor = self.mark - self.lookback
+        self.recent = {change_id for change_id in self.recent if change_id > floor}
+        self.recent.update(change_id for change_id, _ in new)
+
+        ids = sorted({emp_id for _, emp_id in new})
+        rows = []
+        for start in range(0, len(ids), 1000):
+            chunk = ids[start:start + 1000]
+            rows.extend(self.db.fetchall(
+                select_employees_sql([f"emp_id IN ({', '.join(['%s'] * len(chunk))})"]), chunk
+            ))
+        present = {row[0] for row in rows}
+        removed = [emp_id for emp_id in ids if emp_id not in present]
+        return rows, removed, len(changes) == limit, False
+
+
+# Query plan diagnostics
+def query_shapes():
+    """Yield (label, query, params, full_read) for every statement shape the app issues.
+
+    ``full_read`` marks statements that read the whole table by design
+    (cache load, unfiltered export), where a scan is expected.
+    """
+    sample_row = (1, "Sample", "Developer", 50000.0, None)
+    seen = set()
+    for post in ("All", "Developer"):
+        for salary_range in SALARY_RANGES:
+            conditions, params = build_filter(post, salary_range)
+            label = f"post={post}, salary={salary_range}"
+            for sort_field in SORT_FIELDS:
+                for descending in (False, True):
+                    paginator = KeysetPaginator(None, conditions, params, sort_field, descending)
+                    order = f"{sort_field} {'DESC' if descending else 'ASC'}"
+                    pages = [("first page", paginator.page_query())]
+                    paginator.last_row = sample_row
+                    pages.append(("next page", paginator.page_query()))
+                    for page, (query, page_params) in pages:
+                        if query not in seen:
+                            seen.add(query)
+                            yield f"grid {label}, {order}, {page}", query, page_params, False
+
+                    export = select_employees_sql(conditions, sort_field, descending)
+                    if export not in seen:
+                        seen.add(export)
+                        yield f"export {label}, {order}", export, params, not conditions
+
+    yield "search by ID", select_employees_sql(["emp_id = %s"]), [1], False
+    yield "cache load", select_employees_sql(), [], True
+    exists = "SELECT COUNT(*) FROM employees WHERE " + " AND ".join(live_conditions() + ["emp_id = %s"])
+    yield "employee exists", exists, [1], False
+    yield "promote", "UPDATE employees SET post = %s, salary = %s WHERE emp_id IN (%s, %s)", ["Manager", 1.0, 1, 2], False
+    if id_mode() == "soft":
+        yield "remove (soft)", SOFT_DELETE.format(ids="%s, %s"), [1, 2], False
+    else:
+        yield "max emp_id", "SELECT MAX(emp_id) FROM employees", [], False
+        yield "remove", HARD_DELETE.format(ids="%s, %s"), [1, 2], False
+
+
+def explain_query_shapes(db, out=print):
+    """EXPLAIN every query shape and flag full scans; returns the number flagged."""
+    flagged = 0
+    for label, query, params, full_read in query_shapes():
+        problems = []
+        for step in db.explain(query, params):
+            access = step.get("type")
+            extra = step.get("Extra") or ""
+            if access == "ALL":
+                problems.append(f"full table scan of {step.get('table')}")
+            elif access == "index" and "LIMIT" not in query:
+                problems.append(f"full index scan of {step.get('table')} ({step.get('key')})")
+            if "filesort" in extra:
+                problems.append("filesort")
+
+        if problems and not full_read:
+            flagged += 1
+            out(f"SCAN  {label}: {', '.join(problems)}")
+            out(f"      {query}")
+        else:
+            status = "ok  " if not problems else "full"
+            out(f"{status}  {label}")
+    out(f"{flagged} query shape(s) flagged")
+    return flagged
@@ -0,0 +1,379 @@
+import csv
+import json
+import math
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+
+
+IMPORT_COLUMNS = ("name", "post", "salary", "email")
+INSERT_EMPLOYEE = "INSERT INTO employees (name, post, salary, email) VALUES (%s, %s, %s, %s)"
+
+# Column limits from database/database.sql
+MAX_LENGTHS = {"name": 100, "post": 100, "email": 255}
+
+
+class ImportReport:
+    """Running totals for a bulk import, passed to the progress callback."""
+
+    def __init__(self):
+        self.read = 0
+        self.inserted = 0
+        self.rejected = 0
+        self.errors = []  # (line, message), first 100 only
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.inserted / self.elapsed if self.elapsed else 0.0
+
+    def reject(self, line, message):
+        self.rejected += 1
+        if len(self.errors) < 100:
+            self.errors.append((line, message))
+
+    def summary(self):
+        text = (
+            f"Imported {self.inserted} of {self.read} rows in {self.elapsed:.1f}s "
+            f"({self.rows_per_second:,.0f} rows/s)"
+        )
+        if self.rejected:
+            text += f"\n{self.rejected} rows rejected"
+            for line, message in self.errors[:10]:
+                text += f"\n  line {line}: {message}"
+        return text
+
+
+# Readers
+def iter_json_array(fp, read_size=65536):
+    """Yield the objects of a top-level JSON array without loading the whole file."""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    consumed = 0  # Characters dropped from the buffer, for error positions
+    eof = False
+    started = False
+
+    def fill():
+        nonlocal buffer, pos, consumed, eof
+        chunk = fp.read(read_size)
+        if not chunk:
+            eof = True
+        consumed += pos
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    while True:
+        # Skip whitespace and separators
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            fill()
+        if pos >= len(buffer):
+            raise ValueError(f"Unexpected end of JSON array at character {consumed + pos}")
+
+        if not started:
+            if buffer[pos] != "[":
+                raise ValueError("Expected a JSON array of employee objects")
+            started = True
+            pos += 1
+            continue
+        if buffer[pos] == "]":
+            return
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if eof:
+                raise ValueError(f"Invalid JSON at character {consumed + e.pos}: {e.msg}") from None
+            fill()
+            continue
+        pos = end
+        yield value
+
+
+def read_records(path):
+    """Yield (line, record dict) from a CSV, JSON array or JSON Lines file.
+
+    A malformed JSON line yields its JSONDecodeError in place of the record,
+    so the lines after it are still read. A malformed JSON array raises
+    ValueError with the character position.
+    """
+    path = Path(path)
+    suffix = path.suffix.lower()
+    with open(path, newline="", encoding="utf-8-sig") as fp:
+        if suffix == ".csv":
+            reader = csv.DictReader(fp)
+            for record in reader:
+                yield reader.line_num, {k.strip().lower(): v for k, v in record.items() if k}
+            return
+
+        # JSON: an array of objects, or one object per line
+        first = fp.read(1)
+        while first and first.isspace():
+            first = fp.read(1)
+        if first == "[":
+            fp.seek(0)
+            for index, record in enumerate(iter_json_array(fp), start=1):
+                yield index, record
+            return
+        fp.seek(0)
+        for line, text in enumerate(fp, start=1):
+            if text.strip():
+                try:
+                    yield line, json.loads(text)
+                except json.JSONDecodeError as e:
+                    yield line, e
+
+
+def validate_record(record):
+    """Return an INSERT params tuple for a record, or raise ValueError."""
+    if not isinstance(record, dict):
+        raise ValueError("Expected an object with name, post and salary")
+    values = {}
+    for column in IMPORT_COLUMNS:
+        value = record.get(column)
+        if isinstance(value, str):
+            value = value.strip()
+        values[column] = value if value not in ("", None) else None
+
+    for column in ("name", "post", "salary"):
+        if values[column] is None:
+            raise ValueError(f"{column.capitalize()} is required")
+    for column, limit in MAX_LENGTHS.items():
+        if values[column] is not None and len(str(values[column])) > limit:
+            raise ValueError(f"{column.capitalize()} is longer than {limit} characters")
+
+    try:
+        salary = float(values["salary"])
+    except (TypeError, ValueError):
+        raise ValueError("Salary must be a number")
+    if not math.isfinite(salary) or salary < 0:
+        raise ValueError("Salary must be a non-negative number")
+
+    return (str(values["name"]), str(values["post"]), salary,
+            None if values["email"] is None else str(values["email"]))
+
+
+def bulk_import(db, path, chunk_size=1000, progress=None):
+    """Stream employees from a file into the database in chunked transactions.
+
+    Rows are validated a chunk at a time; invalid rows are skipped and
+    reported, valid ones are inserted with one executemany per chunk, each
+    chunk in its own transaction. ``progress(report)`` is called after
+    every committed chunk. Returns the final ImportReport.
+
+    A JSON array that cannot be read to the end stops the import; the rows
+    committed so far stay and the report records where it stopped.
+    """
+    report = ImportReport()
+    chunk = []
+
+    def flush():
+        if chunk:
+            db.execute_many(INSERT_EMPLOYEE, chunk)
+            report.inserted += len(chunk)
+            chunk.clear()
+        report.elapsed = time.perf_counter() - report.started
+        if progress is not None:
+            progress(report)
+
+    try:
+        for line, record in read_records(path):
+            report.read += 1
+            if isinstance(record, json.JSONDecodeError):
+                report.reject(line, f"Invalid JSON: {record.msg} at column {record.pos + 1}")
+                continue
+            try:
+                chunk.append(validate_record(record))
+            except ValueError as e:
+                report.reject(line, str(e))
+            if len(chunk) >= chunk_size:
+                flush()
+    except ValueError as e:  # Truncated or malformed JSON array, undecodable text
+        report.reject(report.read + 1, f"Import stopped: {e}")
+    flush()
+    return report
+
+
+# Export
+EXPORT_COLUMNS = ("emp_id", "name", "post", "salary", "email")
+COLUMNAR_MAGIC = b"EMPCOL01"
+
+
+class ExportReport:
+    """Running totals for an export, passed to the progress callback."""
+
+    def __init__(self, path):
+        self.path = path
+        self.written = 0
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.written / self.elapsed if self.elapsed else 0.0
+
+    def summary(self):
+        return (
+            f"Exported {self.written} rows to {self.path} in {self.elapsed:.1f}s "
+            f"({self.rows_per_second:,.0f} rows/s)"
+        )
+
+
+class CsvWriter:
+    def __init__(self, fp):
+        self.writer = csv.writer(fp)
+        self.writer.writerow(EXPORT_COLUMNS)
+
+    def write(self, rows):
+        self.writer.writerows(row[:len(EXPORT_COLUMNS)] for row in rows)
+
+    def close(self):
+        pass
+
+
+class JsonLinesWriter:
+    def __init__(self, fp):
+        self.fp = fp
+
+    def write(self, rows):
+        self.fp.write("".join(
+            json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in rows
+        ))
+
+    def close(self):
+        pass
+
+
+class ColumnarWriter:
+    """Write rows as a sequence of column-major blocks.
+
+    Layout (all integers little-endian)::
+
+        b"EMPCOL01"
+        block*:  uint32 row count (n > 0)
+                 int64[n]   emp_id
+                 float64[n] salary, NaN for NULL
+                 3 x string column (name, post, email):
+                     int32[n] byte lengths, -1 for NULL
+                     uint32   total byte length, then the UTF-8 bytes
+        uint32 0 terminates the file
+
+    One block is written per batch, so the writer never holds more than a
+    batch of rows.
+    """
+
+    def __init__(self, fp):
+        self.fp = fp
+        self.fp.write(COLUMNAR_MAGIC)
+
+    @staticmethod
+    def _little_endian(values):
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values.tobytes()
+
+    def _write_strings(self, values):
+        lengths = array("i")
+        data = bytearray()
+        for value in values:
+            if value is None:
+                lengths.append(-1)
+            else:
+                encoded = str(value).encode("utf-8")
+                lengths.append(len(encoded))
+                data += encoded
+        self.fp.write(self._little_endian(lengths))
+        self.fp.write(struct.pack("<I", len(data)))
+        self.fp.write(data)
+
+    def write(self, rows):
+        if not rows:
+            return
+        self.fp.write(struct.pack("<I", len(rows)))
+        self.fp.write(self._little_endian(array("q", (row[0] for row in rows))))
+        self.fp.write(self._little_endian(array("d", (
+            math.nan if row[3] is None else float(row[3]) for row in rows
+        ))))
+        for index in (1, 2, 4):
+            self._write_strings(row[index] for row in rows)
+
+    def close(self):
+        self.fp.write(struct.pack("<I", 0))
+
+
+def read_columnar(path):
+    """Yield the rows of a file written by ColumnarWriter."""
+    def read_array(fp, typecode, count):
+        values = array(typecode)
+        values.frombytes(fp.read(values.itemsize * count))
+        if sys.byteorder == "big":
+            values.byteswap()
+        return values
+
+    with open(path, "rb") as fp:
+        if fp.read(len(COLUMNAR_MAGIC)) != COLUMNAR_MAGIC:
+            raise ValueError("Not an employee columnar file")
+        while True:
+            (count,) = struct.unpack("<I", fp.read(4))
+            if count == 0:
+                return
+            ids = read_array(fp, "q", count)
+            salaries = read_array(fp, "d", count)
+            strings = []
+            for _ in range(3):
+                lengths = read_array(fp, "i", count)
+                (size,) = struct.unpack("<I", fp.read(4))
+                data = fp.read(size)
+                column, offset = [], 0
+                for length in lengths:
+                    if length < 0:
+                        column.append(None)
+                    else:
+                        column.append(data[offset:offset + length].decode("utf-8"))
+                        offset += length
+                strings.append(column)
+            names, posts, emails = strings
+            for i in range(count):
+                salary = salaries[i]
+                yield (ids[i], names[i], posts[i], None if math.isnan(salary) else salary, emails[i])
+
+
+EXPORT_FORMATS = {
+    ".csv": (CsvWriter, "w"),
+    ".jsonl": (JsonLinesWriter, "w"),
+    ".empcol": (ColumnarWriter, "wb"),
+}
+
+
+def export_employees(batches, path, progress=None):
+    """Write row batches to CSV, JSON Lines or the columnar format, by file suffix.
+
+    ``batches`` is an iterable of row lists, normally
+    DatabaseOperations.stream over the current filter, so rows go from
+    the server-side cursor to disk one batch at a time.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {suffix or path}")
+    writer_class, mode = EXPORT_FORMATS[suffix]
+
+    report = ExportReport(path)
+    kwargs = {"newline": "", "encoding": "utf-8"} if mode == "w" else {}
+    with open(path, mode, **kwargs) as fp:
+        writer = writer_class(fp)
+        for rows in batches:
+            writer.write(rows)
+            report.written += len(rows)
+            report.elapsed = time.perf_counter() - report.started
+            if progress is not None:
+                progress(report)
+        writer.close()
+    report.elapsed = time.perf_counter() - report.started
+    return report
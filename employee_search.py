@@ -0,0 +1,175 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+import re
+
+
+WORD_SPLIT = re.compile(r"[\W_]+")
+
+
+def words(text):
+    """Lower-cased words of a name, email or query ("ann.lee@x.com" -> ann, lee, x, com)."""
+    return [word for word in WORD_SPLIT.split(text.casefold()) if word] if text else []
+
+
+def tokens(name, email):
+    """Searchable terms of an employee: the words of its name and email."""
+    return set(words(name)) | set(words(email))
+
+
+# Find without the in-memory index (command line, HTTP API)
+def search_conditions(text):
+    """Narrow a name/email search on the server: every word must occur in the name or email."""
+    conditions, params = [], []
+    for word in words(text):
+        # words() never contains LIKE wildcards (% and _ split words)
+        conditions.append("(name LIKE %s OR email LIKE %s)")
+        params.extend([f"%{word}%"] * 2)
+    return conditions, params
+
+
+def find_matches(batches, text):
+    """Keep rows where every word of ``text`` starts a word of the name or email, like Find."""
+    wanted = words(text)
+    for rows in batches:
+        matches = []
+        for row in rows:
+            terms = tokens(row[1], row[4])
+            if all(any(term.startswith(word) for term in terms) for word in wanted):
+                matches.append(row)
+        if matches:
+            yield matches
+
+
+class SearchIndex:
+    """Prefix index over employee names and emails for search-as-you-type.
+
+    ``terms`` is the sorted list of distinct terms and ``postings`` maps
+    each term to a sorted array of emp_ids, so a prefix is a pair of
+    ``bisect`` calls on ``terms`` and memory grows with the number of
+    distinct words, not with rows x words.
+
+    ``lookup(emp_id)`` must return the current (name, email) of an
+    employee; it is used to check the remaining words of a multi-word
+    query against each candidate.
+    """
+
+    def __init__(self, lookup):
+        self.lookup = lookup
+        self.clear()
+
+    def clear(self):
+        self.terms = []
+        self.postings = {}
+
+    def build(self, rows):
+        """Index (emp_id, name, email) rows from scratch."""
+        postings = {}
+        for emp_id, name, email in rows:
+            for term in tokens(name, email):
+                postings.setdefault(term, []).append(emp_id)
+        self.postings = {term: array("q", sorted(ids)) for term, ids in postings.items()}
+        self.terms = sorted(self.postings)
+
+    def add(self, emp_id, name, email):
+        for term in tokens(name, email):
+            ids = self.postings.get(term)
+            if ids is None:
+                self.postings[term] = array("q", [emp_id])
+                insort(self.terms, term)
+                continue
+            slot = bisect_left(ids, emp_id)
+            if slot == len(ids) or ids[slot] != emp_id:
+                ids.insert(slot, emp_id)
+
+    def remove(self, emp_id, name, email):
+        for term in tokens(name, email):
+            ids = self.postings.get(term)
+            if ids is None:
+                continue
+            slot = bisect_left(ids, emp_id)
+            if slot < len(ids) and ids[slot] == emp_id:
+                del ids[slot]
+            if not ids:
+                del self.postings[term]
+                del self.terms[bisect_left(self.terms, term)]
+
+    def prefix_range(self, prefix):
+        """(start, end) slice of ``terms`` starting with prefix."""
+        start = bisect_left(self.terms, prefix)
+        end = bisect_right(self.terms, prefix + "\U0010ffff", start)
+        return start, end
+
+    def postings_count(self, start, end, cap):
+        """Number of postings in terms[start:end], counting no further than cap + 1."""
+        total = 0
+        for i in range(start, end):
+            total += len(self.postings[self.terms[i]])
+            if total > cap:
+                break
+        return total
+
+    def search(self, text, limit=200, max_scan=50000, set_limit=20000):
+        """Return up to ``limit`` emp_ids matching every word of ``text``, best first.
+
+        Each query word must be a prefix of some term of the employee.
+        Candidates come from the most selective word (fewest postings) and
+        are ranked by the term they matched there: an exact word first,
+        then longer terms in alphabetical order, emp_id breaking ties.
+        Another word is checked by set membership when building its id set
+        is cheap next to verifying each candidate (at most ``set_limit``
+        postings, or 50 per candidate for a selective first word), and
+        otherwise with a word-prefix regex over the employee's name and
+        email. At most ``max_scan`` postings are examined, which bounds the
+        latency of one-letter queries on large tables.
+        """
+        query = [(word,) + self.prefix_range(word) for word in dict.fromkeys(words(text))]
+        if not query:
+            return []
+        query.sort(key=lambda q: self.postings_count(q[1], q[2], set_limit))
+        (_, start, end), others = query[0], query[1:]
+        candidates = self.postings_count(start, end, max_scan)
+        if 50 * candidates <= 10 * set_limit:
+            set_limit = max(set_limit, 50 * candidates)
+
+        checks = []  # a set of ids, or a compiled word-prefix pattern
+        for word, other_start, other_end in others:
+            if self.postings_count(other_start, other_end, set_limit) <= set_limit:
+                ids = set()
+                for i in range(other_start, other_end):
+                    ids.update(self.postings[self.terms[i]])
+                checks.append(ids)
+            else:
+                checks.append(re.compile(r"(?:^|[\W_])" + re.escape(word)))
+
+        # terms is sorted, so an exact match comes first and shorter extensions early
+        results, seen, scanned = [], set(), 0
+        for i in range(start, end):
+            for emp_id in self.postings[self.terms[i]]:
+                scanned += 1
+                if scanned > max_scan:
+                    return results
+                if emp_id in seen:
+                    continue
+                seen.add(emp_id)
+                if checks and not self._matches(emp_id, checks):
+                    continue
+                results.append(emp_id)
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def _matches(self, emp_id, checks):
+        text = None
+        for check in checks:
+            if isinstance(check, set):
+                if emp_id not in check:
+                    return False
+                continue
+            if text is None:
+                record = self.lookup(emp_id)
+                if record is None:
+                    return False
+                text = " ".join(value for value in record if value).casefold()
+            if check.search(text) is None:
+                return False
+        return True
@@ -1,71 +1,616 @@
 from pathlib import Path
+import argparse
+import json
+import subprocess
+import sys
 import tkinter as tk
-from tkinter import Canvas, PhotoImage, ttk, messagebox, Button
-import mysql.connector 
+from tkinter import Canvas, ttk, messagebox, filedialog
 import os
-from PIL import Image, ImageTk  # Add PIL for better image handling
+import time
+from datetime import datetime
+from asset_cache import get_asset_cache, pil_available
+from backends import get_backend
+from employee_analytics import BAND_LABELS, PERCENTILES, post_key, workforce_summary
+from employee_auth import authenticate
+from employee_cache import EmployeeCache
+from employee_db import (
+    EMPLOYEE_COLUMNS, ER_NO_SUCH_TABLE, SALARY_RANGES, ChangeFeed, DatabaseOperations, KeysetPaginator,
+    build_filter, db_error, explain_query_shapes, filter_predicate, get_executor, get_pool,
+    live_conditions, row_sort_key, salary_bounds, select_employees_sql, shutdown
+)
+from employee_io import EXPORT_FORMATS, bulk_import, export_employees
+from migrations import apply_migrations, migration_status
+from query_metrics import start_metrics_file
+
+
+# Startup
+_startup_probe = False
+
+
+def startup_mark(label):
+    """Report a startup milestone to the --startup-report parent process."""
+    if _startup_probe:
+        print(json.dumps({"mark": label, "at": time.time()}), flush=True)
+
+
+def parse_importtime(stderr):
+    """Parse ``python -X importtime`` output into (self_us, cumulative_us, depth, module)."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # header line
+        name = fields[2][1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((int(fields[0]), int(fields[1]), depth, name.strip()))
+    return entries
+
+
+def startup_report(top=15, out=print):
+    """Launch the GUI under ``-X importtime``, close it once the welcome page
+    is ready, and print time-to-first-paint and the costliest imports.
+
+    Returns the child's exit code.
+    """
+    launched = time.time()
+    child = subprocess.run(
+        [sys.executable, "-X", "importtime", str(Path(__file__).resolve()), "--startup-probe"],
+        capture_output=True, text=True
+    )
+    marks = {}
+    for line in child.stdout.splitlines():
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and "mark" in record:
+            marks[record["mark"]] = record["at"]
+    if child.returncode != 0:
+        out(child.stderr.strip().splitlines()[-1] if child.stderr.strip() else "Startup probe failed")
+
+    out("Startup milestones (ms since launch):")
+    if "main-imported" in marks:
+        out(f"  {'interpreter + main.py imports':<32}{(marks['main-imported'] - launched) * 1000:9.1f}")
+    for label in ("first-paint", "ready"):
+        if label in marks:
+            out(f"  {label:<32}{(marks[label] - launched) * 1000:9.1f}")
+
+    imports = parse_importtime(child.stderr)
+    total = sum(entry[0] for entry in imports)
+    out(f"\nImports: {len(imports)} modules, {total / 1000:.1f} ms self time")
+    out(f"  {'cumulative ms':>13} {'self ms':>9}  module (top-level imports)")
+    top_level = sorted((e for e in imports if e[2] == 0), key=lambda e: e[1], reverse=True)
+    for self_us, cumulative_us, _, name in top_level[:top]:
+        out(f"  {cumulative_us / 1000:13.1f} {self_us / 1000:9.1f}  {name}")
+    return child.returncode
 
 
 # Function to create database connection
 def create_connection():
     try:
-        return mysql.connector.connect(
-            host=os.getenv("DB_HOST", "localhost"),
-            user=os.getenv("DB_USER", "root"),
-            password=os.getenv("DB_PASSWORD", "Root"),
-            database=os.getenv("DB_NAME", "emp")
-        )
-    except mysql.connector.Error as e:
+        return get_backend().connect()
+    except db_error() as e:
         messagebox.showerror("Database Error", f"Failed to connect to the database: {e}")
         return None
 
 
-class DatabaseOperations:
-    def __init__(self, cursor, con):
-        self.cursor = cursor
-        self.con = con
+# Virtualized employee grid
+SHIFT_MASK = 0x0001
+CONTROL_MASK = 0x0004
+
+
+class VirtualTreeview:
+    """Drive a ttk.Treeview so it only holds Tk items for the visible rows.
+
+    The rows live in a plain Python sequence; a fixed window of items
+    (visible rows plus an overscan buffer above and below) is recycled as
+    the user scrolls, so Tk memory and scroll cost do not grow with the
+    table. When the view gets close to the end of the loaded rows the
+    ``more`` callback is asked for the next batch, which it hands back
+    through ``extend``.
+    """
+
+    def __init__(self, tree, scrollbar, rowheight=25, overscan=10, prefetch=200, key_index=0):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.rowheight = rowheight
+        self.overscan = overscan
+        self.prefetch = prefetch
+        self.key_index = key_index
+
+        self.rows = []
+        self.more = None
+        self.exhausted = True
+        self.loading = False
+
+        self.first = 0          # index of the top visible row
+        self.visible = 1        # rows that fit in the widget
+        self.window_start = 0   # row index shown by the first recycled item
+        self.items = []         # recycled Tk item ids
+        self.selected = {}      # key -> row, survives item recycling
+        self.multiple = str(tree.cget("selectmode")) == "extended"
+        self.click_state = 0
+        self.cursor_index = 0   # row index of the keyboard cursor
+        self._expected_selection = ()
+
+        self.scrollbar.configure(command=self.on_scrollbar)
+        self.tree.bind("<Configure>", self.on_configure)
+        self.tree.bind("<<TreeviewSelect>>", self.on_select)
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda e: self.scroll_by(3))
+        self.tree.bind("<Up>", lambda e: self.move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self.move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self.move_selection(-self.visible))
+        self.tree.bind("<Next>", lambda e: self.move_selection(self.visible))
+        self.tree.bind("<Home>", lambda e: self.move_selection(-len(self.rows)))
+        self.tree.bind("<End>", lambda e: self.move_selection(len(self.rows)))
+        self.tree.bind("<ButtonPress-1>", self.on_click, add="+")
+        self.tree.bind("<Control-a>", self.select_all)
+
+    # Data source
+    def set_rows(self, rows, more=None):
+        """Replace the grid contents; ``more`` is called to request further rows.
+
+        Without ``more`` any sequence will do (e.g. a cache view), and rows
+        are only materialized as they scroll into view.
+        """
+        self.rows = list(rows) if more is not None else rows
+        self.more = more
+        self.exhausted = more is None
+        self.loading = False
+        self.first = 0
+        self.cursor_index = 0
+        self.selected.clear()
+        self.render(force=True)
+
+    def extend(self, rows, exhausted=False):
+        """Append a batch delivered by the ``more`` callback."""
+        self.rows.extend(rows)
+        self.loading = False
+        self.exhausted = exhausted or not rows
+        self.render(force=True)
+
+    def clear(self):
+        self.set_rows([])
+
+    # Patching after writes
+    def replace_rows(self, rows, changed=(), removed=()):
+        """Swap in a re-computed sequence (e.g. a fresh cache view) keeping scroll and selection.
+
+        ``changed`` rows and ``removed`` keys keep the selection current
+        without scanning the new sequence.
+        """
+        self.rows = rows
+        for key in removed:
+            self.selected.pop(key, None)
+        for row in changed:
+            if row[self.key_index] in self.selected:
+                self.selected[row[self.key_index]] = row
+        self.cursor_index = min(self.cursor_index, max(0, len(rows) - 1))
+        self.render(force=True)
+
+    def patch_rows(self, changed=(), removed=(), sort_key=None, descending=False, last_key=None):
+        """Apply a batch of writes with one pass over the rows and one render.
+
+        ``changed`` rows are inserted or replaced at their place in the
+        current order and ``removed`` keys dropped, keeping the rows on
+        screen where they are. ``sort_key`` orders the rows (see
+        row_sort_key); without it an existing row is replaced in place and
+        a new one appended. ``last_key`` is the sort key of the paging
+        cursor (KeysetPaginator.last_row): while more pages are still to
+        come, a row that sorts after it is left out because paging will
+        deliver it.
+        """
+        key_index = self.key_index
+        changed = {row[key_index]: row for row in changed}
+        removed = set(removed) - changed.keys()
+        if not changed and not removed:
+            return
+        # Sorted: every changed row is taken out and merged back in by key
+        pending = dict(changed) if sort_key is None else {}
+        taken = removed if sort_key is None else removed | changed.keys()
+        kept = []
+        top = None  # Index in ``kept`` of the first surviving row at or below the top of the view
+        for index, row in enumerate(self.rows):
+            key = row[key_index]
+            if key in taken:
+                continue
+            if top is None and index >= self.first:
+                top = len(kept)
+            kept.append(pending.pop(key, row))
+        if top is None:
+            top = len(kept)
+
+        if sort_key is None:
+            if self.exhausted:
+                kept.extend(pending.values())  # New rows
+        elif changed:
+            merged = []
+            position = 0
+            inserted_above = 0
+            for row in sorted(changed.values(), key=sort_key, reverse=descending):
+                target = sort_key(row)
+                while position < len(kept) and (
+                    sort_key(kept[position]) >= target if descending else sort_key(kept[position]) <= target
+                ):
+                    merged.append(kept[position])
+                    position += 1
+                if not self.exhausted and (
+                    last_key is None or (target < last_key if descending else target > last_key)
+                ):
+                    break  # Past the cursor; a later page brings it
+                if position <= top:
+                    inserted_above += 1
+                merged.append(row)
+            merged.extend(kept[position:])
+            kept = merged
+            top += inserted_above
+
+        self.rows = kept
+        self.first = top
+        for key in removed:
+            self.selected.pop(key, None)
+        for key, row in changed.items():
+            if key in self.selected:
+                self.selected[key] = row
+        self.cursor_index = min(self.cursor_index, max(0, len(kept) - 1))
+        self.render(force=True)
+
+    def selected_rows(self):
+        """Return the selected rows, including those scrolled out of view."""
+        return list(self.selected.values())
+
+    # Rendering
+    def render(self, force=False):
+        total = len(self.rows)
+        max_first = max(0, total - self.visible)
+        self.first = max(0, min(self.first, max_first))
+        wanted = min(total, self.visible + 2 * self.overscan)
+
+        # Grow or shrink the pool of recycled items
+        while len(self.items) < wanted:
+            self.items.append(self.tree.insert("", tk.END, values=()))
+        if len(self.items) > wanted:
+            self.tree.delete(*self.items[wanted:])
+            del self.items[wanted:]
+
+        # Refill the window only when the visible rows fall outside it
+        window_end = self.window_start + len(self.items)
+        if force or self.first < self.window_start or self.first + self.visible > window_end:
+            self.window_start = max(0, min(self.first - self.overscan, total - len(self.items)))
+            for offset, iid in enumerate(self.items):
+                self.tree.item(iid, values=self.rows[self.window_start + offset])
+            self.sync_selection()
+
+        if self.items:
+            self.tree.yview_moveto((self.first - self.window_start) / len(self.items))
+        self.update_scrollbar()
+        self.request_more()
+
+    def update_scrollbar(self):
+        total = len(self.rows)
+        if total == 0:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.visible) / total))
 
-    def execute_query(self, query, params=None):
-        try:
-            self.cursor.execute(query, params)
-            self.con.commit()
-        except mysql.connector.Error as e:
-            messagebox.showerror("Database Error", f"Error: {e}")
+    def request_more(self):
+        if self.loading or self.exhausted or self.more is None:
+            return
+        if self.first + self.visible + self.prefetch >= len(self.rows):
+            self.loading = True
+            self.more()
+
+    def sync_selection(self):
+        selected = tuple(
+            iid for offset, iid in enumerate(self.items)
+            if self.rows[self.window_start + offset][self.key_index] in self.selected
+        )
+        self._expected_selection = selected
+        self.tree.selection_set(selected)
+
+    # Event handlers
+    def on_configure(self, event):
+        # Leave room for the heading row
+        visible = max(1, event.height // self.rowheight - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.render(force=True)
+
+    def on_click(self, event):
+        # Remember the modifiers; <<TreeviewSelect>> does not carry them
+        self.click_state = event.state
+
+    def on_select(self, event=None):
+        current = self.tree.selection()
+        if current == self._expected_selection:
+            return  # Our own selection_set echoing back
+        state, self.click_state = self.click_state, 0
+
+        focus = self.tree.focus()
+        clicked = self.window_start + self.items.index(focus) if focus in self.items else None
+        visible = {self.window_start + self.items.index(iid) for iid in current if iid in self.items}
+
+        if self.multiple and state & SHIFT_MASK and clicked is not None:
+            # Range from the anchor, which may be scrolled out of view
+            low, high = sorted((self.cursor_index, clicked))
+            self.selected = {row[self.key_index]: row for row in self.rows[low:high + 1]}
+        elif self.multiple and state & CONTROL_MASK:
+            # Toggle within the window, keep everything off screen
+            for offset in range(len(self.items)):
+                row = self.rows[self.window_start + offset]
+                if self.window_start + offset in visible:
+                    self.selected[row[self.key_index]] = row
+                else:
+                    self.selected.pop(row[self.key_index], None)
+            if clicked is not None:
+                self.cursor_index = clicked
+        else:
+            self.selected = {self.rows[i][self.key_index]: self.rows[i] for i in visible}
+            if clicked is not None:
+                self.cursor_index = clicked
+        self.sync_selection()
+
+    def select_all(self, event=None):
+        """Select every loaded row."""
+        if self.multiple:
+            self.selected = {row[self.key_index]: row for row in self.rows}
+            self.sync_selection()
+        return "break"
+
+    def on_scrollbar(self, action, *args):
+        if action == "moveto":
+            self.first = int(float(args[0]) * len(self.rows))
+            self.render()
+        elif action == "scroll":
+            step = self.visible if args[1] == "pages" else 1
+            self.scroll_by(int(args[0]) * step)
+
+    def on_mousewheel(self, event):
+        self.scroll_by(-3 if event.delta > 0 else 3)
+        return "break"
+
+    def scroll_by(self, delta):
+        self.first += delta
+        self.render()
+        return "break"
+
+    def move_selection(self, delta):
+        if not self.rows:
+            return "break"
+        index = max(0, min(len(self.rows) - 1, self.cursor_index + delta))
+        row = self.rows[index]
+        self.cursor_index = index
+        self.selected = {row[self.key_index]: row}
+        if index < self.first:
+            self.first = index
+        elif index >= self.first + self.visible:
+            self.first = index - self.visible + 1
+        self.render(force=True)
+        return "break"
+
+
+# Background queries
+class AsyncQueryRunner:
+    """Run database calls on worker threads and hand results back to Tk.
+
+    Completed futures are picked up by polling with ``root.after`` so the
+    callbacks always run on the Tk thread. Calls submitted on the same
+    ``channel`` supersede each other: the older future is cancelled if it
+    has not started yet, and its result is dropped if it has.
+    """
+
+    def __init__(self, root, db, on_busy=None, poll_ms=15):
+        self.root = root
+        self.db = db
+        self.on_busy = on_busy
+        self.poll_ms = poll_ms
+        self.pending = set()
+        self.quiet = set()  # Pending calls that do not show the busy indicator
+        self.latest = {}
+        self.closed = False
+
+    def run(self, fn, *args, on_success=None, on_error=None, channel=None, busy=True, **kwargs):
+        if channel is not None:
+            self.cancel(channel)
+        future = self.db.submit(fn, *args, **kwargs)
+        if channel is not None:
+            self.latest[channel] = future
+        self.pending.add(future)
+        if not busy:
+            self.quiet.add(future)
+        self.update_busy()
+        self.root.after(self.poll_ms, self.poll, future, on_success, on_error, channel)
+        return future
+
+    def cancel(self, channel):
+        """Cancel the outstanding call on a channel, if any."""
+        future = self.latest.pop(channel, None)
+        if future is not None:
+            future.cancel()
+
+    def close(self):
+        """Drop every outstanding result, e.g. when the page is torn down."""
+        self.closed = True
+        for future in self.pending:
+            future.cancel()
+        self.pending.clear()
+        self.quiet.clear()
+        self.latest.clear()
+
+    def poll(self, future, on_success, on_error, channel):
+        if self.closed:
+            return
+        if not future.done():
+            self.root.after(self.poll_ms, self.poll, future, on_success, on_error, channel)
+            return
 
-    def fetchall(self, query, params=None):
-        try:
-            self.cursor.execute(query, params)
-            return self.cursor.fetchall()
-        except mysql.connector.Error as e:
-            messagebox.showerror("Database Error", f"Error: {e}")
-            return []
-    
-    def check_employee_exists(self, emp_id):
-        """Check if an employee exists in the database by ID."""
-        try:
-            query = "SELECT COUNT(*) FROM employees WHERE emp_id = %s"
-            self.cursor.execute(query, (emp_id,))
-            result = self.cursor.fetchone()
-            return result[0] > 0  # Return True if count > 0, else False
-        except mysql.connector.Error as e:
-            messagebox.showerror("Database Error", f"Error: {e}")
-            return False
-     
-    def reset_auto_increment(self):
-        """Reset auto-increment to match the highest emp_id."""
+        self.pending.discard(future)
+        self.quiet.discard(future)
+        self.update_busy()
+        if future.cancelled():
+            return
+        if channel is not None:
+            if self.latest.get(channel) is not future:
+                return  # Superseded by a newer call on the same channel
+            del self.latest[channel]
+
+        error = future.exception()
+        if error is not None:
+            if on_error is not None:
+                on_error(error)
+            else:
+                messagebox.showerror("Database Error", f"Error: {error}")
+        elif on_success is not None:
+            on_success(future.result())
+
+    def update_busy(self):
+        if self.on_busy is not None:
+            self.on_busy(len(self.pending) > len(self.quiet))
+
+
+# Window resize handling
+class ResizeLayout:
+    """Scale the current page in place while the window is resized.
+
+    Every ``<Configure>`` of the root is recorded, but the page is
+    relaid at most once per frame (``frame_ms``): placed widgets are moved
+    and resized in proportion to the size the page was built for, and the
+    page canvas is stretched with ``Canvas.scale``. Nothing is recreated.
+    Images are only resampled once the size has been stable for
+    ``settle_ms``, through the page's ``on_settle(width, height)``.
+    """
+
+    def __init__(self, root, frame_ms=16, settle_ms=250):
+        self.root = root
+        self.frame_ms = frame_ms
+        self.settle_ms = settle_ms
+        self.canvas = None
+        self.on_settle = None
+        self.base = self.size = self.pending = None
+        self.geometry = {}  # widget -> place geometry at the base size
+        self.frame_job = None
+        self.settle_job = None
+        self.root.bind("<Configure>", self.on_configure, add="+")
+
+    def attach(self, canvas, width, height, on_settle=None):
+        """Start tracking a newly built page laid out for width x height."""
+        self.canvas = canvas
+        self.on_settle = on_settle
+        self.base = self.size = self.pending = (width, height)
+        self.geometry = {}
+
+    def on_configure(self, event):
+        # Child widgets' <Configure> events reach the root binding too
+        if event.widget is not self.root or self.base is None:
+            return
+        size = (event.width, event.height)
+        if size == self.pending:
+            return
+        self.pending = size
+        if self.frame_job is None:
+            self.frame_job = self.root.after(self.frame_ms, self.relayout)
+        if self.settle_job is not None:
+            self.root.after_cancel(self.settle_job)
+        self.settle_job = self.root.after(self.settle_ms, self.settle)
+
+    def _base_geometry(self, widget):
+        """Place geometry of a widget as the page set it, or None if it is not placed."""
+        if widget not in self.geometry:
+            try:
+                info = widget.place_info()
+            except (AttributeError, tk.TclError):
+                info = None  # Toplevel dialogs and widgets already destroyed
+            if not info:
+                return None
+            # Widgets placed after a resize were still positioned for the base size
+            self.geometry[widget] = {key: float(info[key]) for key in ("x", "y", "width", "height")
+                                     if info.get(key) not in (None, "")}
+        return self.geometry[widget]
+
+    def relayout(self):
+        self.frame_job = None
+        if self.pending == self.size:
+            return
+        width, height = self.pending
+        base_width, base_height = self.base
+        scale_x, scale_y = width / base_width, height / base_height
+
+        if self.canvas is not None and self.canvas.winfo_exists():
+            self.canvas.configure(width=width, height=height)
+            old_width, old_height = self.size
+            self.canvas.scale("all", 0, 0, width / old_width, height / old_height)
+        for widget in self.root.winfo_children():
+            if widget is self.canvas:
+                continue
+            geometry = self._base_geometry(widget)
+            if geometry:
+                widget.place_configure(**{
+                    key: int(value * (scale_x if key in ("x", "width") else scale_y))
+                    for key, value in geometry.items()
+                })
+        self.size = self.pending
+
+    def settle(self):
+        self.settle_job = None
+        if self.frame_job is not None:
+            self.root.after_cancel(self.frame_job)
+            self.relayout()
+        if self.on_settle is not None and self.canvas is not None and self.canvas.winfo_exists():
+            self.on_settle(*self.size)
+
+
+_layouts = {}
+
+
+def get_layout(root):
+    """Return the ResizeLayout bound to a root window, creating it on first use."""
+    if root not in _layouts:
+        _layouts[root] = ResizeLayout(root)
+    return _layouts[root]
+
+
+# Background preloading
+def next_page_assets(screen_width, screen_height):
+    """(path, width, height) of every scaled image the login page and dashboard draw."""
+    assets = Path(__file__).resolve().parent / "assets"
+    button_width = int(screen_width * 0.17)
+    return [
+        (assets / "frame1" / "image_1.png", screen_width, screen_height),
+        (assets / "frame1" / "button_1.png", button_width, int(screen_height * 0.04)),
+        (assets / "frame1" / "image_2.png", int(screen_width * 0.2), None),
+        (assets / "frame1" / "entry_1.png", button_width, int(screen_height * 0.03)),
+        (assets / "frame1" / "entry_2.png", button_width, int(screen_height * 0.03)),
+        (assets / "frame3" / "image_1.png", screen_width, screen_height),
+    ]
+
+
+def preload_next_pages(screen_width, screen_height):
+    """Warm the asset cache and the connection pool while the welcome page is up.
+
+    Runs on the shared worker threads. Failures are ignored here; the
+    page that needs the image or connection reports them as before.
+    """
+    def scale_assets():
+        assets = get_asset_cache()
+        for path, width, height in next_page_assets(screen_width, screen_height):
+            try:
+                assets.image(path, width, height)
+            except Exception:
+                pass
+
+    def warm_connection():
+        pool = get_pool()
         try:
-            # Find the max emp_id
-            self.cursor.execute("SELECT MAX(emp_id) FROM employees")
-            max_id = self.cursor.fetchone()[0]
-            
-            # If table is empty, reset to 1, otherwise to max_id + 1
-            next_id = 1 if max_id is None else max_id + 1
-            
-            # Reset auto-increment
-            self.cursor.execute(f"ALTER TABLE employees AUTO_INCREMENT = {next_id}")
-            self.con.commit()
-        except mysql.connector.Error as e:
-            messagebox.showerror("Database Error", f"Error resetting auto-increment: {e}")
+            pool.release(pool.acquire())
+        except Exception:
+            pass
+
+    executor = get_executor()
+    return [executor.submit(scale_assets), executor.submit(warm_connection)]
 
 
 # Welcome Page
@@ -99,39 +644,72 @@ class WelcomePage:
         )
         self.canvas.place(x=0, y=0)
 
-        # Add PIL import at top of file
-        try:
-            from PIL import Image, ImageTk
-            self.using_pil = True
-        except ImportError:
-            self.using_pil = False
+        # PIL is only imported once an image is actually scaled
+        self.using_pil = pil_available()
+
+        # Paint the window and tagline first, then do the slow work
+        self.add_tagline()
+        self.root.wait_visibility(self.canvas)
+        self.root.update_idletasks()
+        startup_mark("first-paint")
+
+        # Login and dashboard assets and a database connection get ready in the background
+        self.preload = preload_next_pages(self.screen_width, self.screen_height)
 
         self.add_images()
         self.add_button()
 
+        # Follow window resizes without rebuilding the page
+        get_layout(self.root).attach(self.canvas, self.screen_width, self.screen_height,
+                                     on_settle=self.rescale_images)
+
     def relative_to_assets(self, path: str) -> Path:
         return self.assets_path / Path(path)
 
+    def rescale_images(self, width, height):
+        """Resample the page images for a new window size once resizing stops."""
+        if not self.using_pil or not hasattr(self, "logo_item"):
+            return
+        assets = get_asset_cache()
+        self.image_1 = assets.photo(self.relative_to_assets("image_1.png"), width, height)
+        self.canvas.itemconfigure(self.bg_item, image=self.image_1)
+        self.image_2 = assets.photo(self.relative_to_assets("image_2.png"), int(width * 0.4))
+        self.canvas.itemconfigure(self.logo_item, image=self.image_2)
+        if getattr(self, "button_image", None) is not None:
+            self.button_image = assets.photo(self.relative_to_assets("button_1.png"),
+                                             int(width * 0.57), int(height * 0.096))
+            self.button.configure(image=self.button_image)
+
+    def add_tagline(self):
+        # Scale text size based on screen width
+        font_size = int(-1 * self.screen_width * 0.044)
+
+        # Add text with position relative to screen size
+        self.tagline = self.canvas.create_text(
+            self.screen_width * 0.088,
+            self.screen_height * 0.47,
+            anchor="nw",
+            text="“Transform Potential into Performance.”",
+            fill="#FFFFFF",
+            font=("CabinSketch Regular", font_size)
+        )
+
     def add_images(self):
         try:
             if hasattr(self, 'using_pil') and self.using_pil:
-                # Use PIL for better image scaling
-                from PIL import Image, ImageTk
-                
+                # Use PIL for better image scaling, cached across page loads
+                assets = get_asset_cache()
+
                 # Background image
-                bg_img = Image.open(self.relative_to_assets("image_1.png"))
-                bg_resized = bg_img.resize((self.screen_width, self.screen_height), Image.LANCZOS)
-                image_image_1 = ImageTk.PhotoImage(bg_resized)
-                self.canvas.create_image(self.screen_width/2, self.screen_height/2, image=image_image_1)
+                image_image_1 = assets.photo(self.relative_to_assets("image_1.png"),
+                                             self.screen_width, self.screen_height)
+                self.bg_item = self.canvas.create_image(self.screen_width/2, self.screen_height/2, image=image_image_1)
                 self.image_1 = image_image_1  # Prevent garbage collection
                 
-                # Logo image
-                logo_img = Image.open(self.relative_to_assets("image_2.png"))
+                # Logo image, height follows the aspect ratio
                 logo_width = int(self.screen_width * 0.4)
-                logo_height = int(logo_width * (logo_img.height / logo_img.width))
-                logo_resized = logo_img.resize((logo_width, logo_height), Image.LANCZOS)
-                image_image_2 = ImageTk.PhotoImage(logo_resized)
-                self.canvas.create_image(self.screen_width/2, self.screen_height*0.37, image=image_image_2)
+                image_image_2 = assets.photo(self.relative_to_assets("image_2.png"), logo_width)
+                self.logo_item = self.canvas.create_image(self.screen_width/2, self.screen_height*0.37, image=image_image_2)
                 self.image_2 = image_image_2  # Prevent garbage collection
             else:
                 # Fallback to original code
@@ -143,18 +721,8 @@ class WelcomePage:
                 self.canvas.create_image(self.screen_width/2, self.screen_height*0.37, image=image_image_2)
                 self.image_2 = image_image_2
 
-            # Scale text size based on screen width
-            font_size = int(-1 * self.screen_width * 0.044)
-            
-            # Add text with position relative to screen size
-            self.canvas.create_text(
-                self.screen_width * 0.088,
-                self.screen_height * 0.47,
-                anchor="nw",
-                text="“Transform Potential into Performance.”",
-                fill="#FFFFFF",
-                font=("CabinSketch Regular", font_size)
-            )
+            # The tagline was drawn first; keep it above the images
+            self.canvas.tag_raise(self.tagline)
         except Exception as e:
             messagebox.showerror("Asset Loading Error", f"Could not load assets: {e}")
 
@@ -165,12 +733,9 @@ class WelcomePage:
             button_height = int(self.screen_height * 0.096)
             
             if hasattr(self, 'using_pil') and self.using_pil:
-                from PIL import Image, ImageTk
-                
                 # Load and resize button image
-                button_img = Image.open(self.relative_to_assets("button_1.png"))
-                button_resized = button_img.resize((button_width, button_height), Image.LANCZOS)
-                button_image = ImageTk.PhotoImage(button_resized)
+                button_image = get_asset_cache().photo(self.relative_to_assets("button_1.png"),
+                                                       button_width, button_height)
             else:
                 # Fallback to regular PhotoImage
                 button_image = tk.PhotoImage(file=self.relative_to_assets("button_1.png"))
@@ -190,6 +755,7 @@ class WelcomePage:
                 width=button_width,
                 height=button_height
             )
+            self.button = button
             self.button_image = button_image  # Prevent garbage collection
         except Exception as e:
             # Fallback to text button
@@ -247,15 +813,15 @@ class LoginPage:
         )
         self.canvas.place(x=0, y=0)
 
-        # Try to use PIL for better image scaling
-        try:
-            from PIL import Image, ImageTk
-            self.using_pil = True
-        except ImportError:
-            self.using_pil = False
+        # PIL for better image scaling, imported on first use
+        self.using_pil = pil_available()
 
         self.setup_ui_elements()
 
+        # Follow window resizes without rebuilding the page
+        get_layout(self.root).attach(self.canvas, self.screen_width, self.screen_height,
+                                     on_settle=self.rescale_images)
+
     def relative_to_assets(self, path: str) -> Path:
         return self.assets_path / Path(path)
 
@@ -263,12 +829,10 @@ class LoginPage:
         try:
             # Background image with scaling
             if hasattr(self, 'using_pil') and self.using_pil:
-                from PIL import Image, ImageTk
-                
                 # Load and scale background image
-                bg_img = Image.open(self.relative_to_assets("image_1.png"))
-                bg_resized = bg_img.resize((self.screen_width, self.screen_height), Image.LANCZOS)
-                self.image_image_1 = ImageTk.PhotoImage(bg_resized)
+                self.image_image_1 = get_asset_cache().photo(
+                    self.relative_to_assets("image_1.png"), self.screen_width, self.screen_height
+                )
             else:
                 # Fallback to original PhotoImage
                 self.image_image_1 = tk.PhotoImage(file=self.relative_to_assets("image_1.png"))
@@ -289,9 +853,9 @@ class LoginPage:
             
             if hasattr(self, 'using_pil') and self.using_pil:
                 # Scale login button
-                btn_img = Image.open(self.relative_to_assets("button_1.png"))
-                btn_resized = btn_img.resize((button_width, button_height), Image.LANCZOS)
-                self.button_image_1 = ImageTk.PhotoImage(btn_resized)
+                self.button_image_1 = get_asset_cache().photo(
+                    self.relative_to_assets("button_1.png"), button_width, button_height
+                )
             else:
                 # Fallback to original button
                 self.button_image_1 = tk.PhotoImage(file=self.relative_to_assets("button_1.png"))
@@ -353,11 +917,8 @@ class LoginPage:
             # Logo image with scaling
             if hasattr(self, 'using_pil') and self.using_pil:
                 # Scale logo image
-                logo_img = Image.open(self.relative_to_assets("image_2.png"))
                 logo_width = int(self.screen_width * 0.2)  # Reduced width to 20% of screen width
-                logo_height = int(logo_width * (logo_img.height / logo_img.width))
-                logo_resized = logo_img.resize((logo_width, logo_height), Image.LANCZOS)
-                self.image_image_2 = ImageTk.PhotoImage(logo_resized)
+                self.image_image_2 = get_asset_cache().photo(self.relative_to_assets("image_2.png"), logo_width)
             else:
                 # Fallback to original logo
                 self.image_image_2 = tk.PhotoImage(file=self.relative_to_assets("image_2.png"))
@@ -391,9 +952,9 @@ class LoginPage:
         # Entry background
         if hasattr(self, 'using_pil') and self.using_pil:
             # Scale entry background
-            entry_bg = Image.open(self.relative_to_assets("entry_1.png"))
-            entry_bg_resized = entry_bg.resize((entry_width, entry_height), Image.LANCZOS)
-            self.entry_image_1 = ImageTk.PhotoImage(entry_bg_resized)
+            self.entry_image_1 = get_asset_cache().photo(
+                self.relative_to_assets("entry_1.png"), entry_width, entry_height
+            )
         else:
             # Fallback to original entry background
             self.entry_image_1 = tk.PhotoImage(file=self.relative_to_assets("entry_1.png"))
@@ -439,9 +1000,9 @@ class LoginPage:
         # Entry background
         if hasattr(self, 'using_pil') and self.using_pil:
             # Scale entry background
-            entry_bg = Image.open(self.relative_to_assets("entry_2.png"))
-            entry_bg_resized = entry_bg.resize((entry_width, entry_height), Image.LANCZOS)
-            self.entry_image_2 = ImageTk.PhotoImage(entry_bg_resized)
+            self.entry_image_2 = get_asset_cache().photo(
+                self.relative_to_assets("entry_2.png"), entry_width, entry_height
+            )
         else:
             # Fallback to original entry background
             self.entry_image_2 = tk.PhotoImage(file=self.relative_to_assets("entry_2.png"))
@@ -558,12 +1119,13 @@ class LoginPage:
     def authenticate_user(self):
         username = self.username_entry.get()
         password = self.password_entry.get()
+        role = authenticate(username, password)
 
-        if username == "admin" and password == "admin123":
+        if role == "admin":
             messagebox.showinfo("Login Successful", "Welcome Administrator!")
             self.canvas.destroy()
             EmployeeManagementApp(self.root, role="admin")
-        elif username == "hr" and password == "hr123":
+        elif role == "hr":
             messagebox.showinfo("Login Successful", "Welcome HR!")
             self.canvas.destroy()
             EmployeeManagementApp(self.root, role="hr")
@@ -576,19 +1138,35 @@ class LoginPage:
             self.root.quit()
             self.root.destroy()
             
-    def update_layout(self, event=None):
-        """Update UI elements when window is resized"""
-        if event:
-            # Only update if significant change in size
-            if abs(event.width - self.screen_width) > 10 or abs(event.height - self.screen_height) > 10:
-                self.screen_width = event.width
-                self.screen_height = event.height
-                
-                # Clean up and redraw UI
-                self.canvas.delete("all")
-                self.setup_ui_elements()
+    def rescale_images(self, width, height):
+        """Resample the page images for a new window size once resizing stops."""
+        if not self.using_pil or not hasattr(self, "image_2"):
+            return  # Text-only fallback UI
+        assets = get_asset_cache()
+        button_size = (int(width * 0.17), int(height * 0.04))
+        entry_size = (int(width * 0.17), int(height * 0.03))
+
+        self.image_image_1 = assets.photo(self.relative_to_assets("image_1.png"), width, height)
+        self.canvas.itemconfigure(self.image_1, image=self.image_image_1)
+        self.image_image_2 = assets.photo(self.relative_to_assets("image_2.png"), int(width * 0.2))
+        self.canvas.itemconfigure(self.image_2, image=self.image_image_2)
+        self.entry_image_1 = assets.photo(self.relative_to_assets("entry_1.png"), *entry_size)
+        self.canvas.itemconfigure(self.entry_bg_1, image=self.entry_image_1)
+        self.entry_image_2 = assets.photo(self.relative_to_assets("entry_2.png"), *entry_size)
+        self.canvas.itemconfigure(self.entry_bg_2, image=self.entry_image_2)
+        self.button_image_1 = assets.photo(self.relative_to_assets("button_1.png"), *button_size)
+        self.button_1.configure(image=self.button_image_1)
 
 # Employee Management Application
+FIND_DELAY_MS = 150  # Quiet period before a search-as-you-type query runs
+FIND_LIMIT = 100     # Best matches shown in the grid
+
+
+def sync_interval_ms():
+    """How often to poll the change log (DB_SYNC_INTERVAL seconds, 0 disables)."""
+    return int(float(os.getenv("DB_SYNC_INTERVAL", "5")) * 1000)
+
+
 class EmployeeManagementApp:
     def __init__(self, root, role="admin"):
         self.root = root
@@ -607,14 +1185,8 @@ class EmployeeManagementApp:
         self.root.configure(bg="#FFFFFF")
         self.root.state('zoomed')  # For Windows, maximizes the window
         
-        # Database connection - Exit if failed
-        self.con = create_connection()
-        if self.con is None:
-            self.root.quit()  # Properly terminate the mainloop
-            return
-
-        self.cursor = self.con.cursor()
-        self.db = DatabaseOperations(self.cursor, self.con)
+        # Database connections come from the shared pool
+        self.db = DatabaseOperations(get_pool())
 
         # Setup paths
         self.output_path = Path(__file__).resolve().parent
@@ -654,19 +1226,141 @@ class EmployeeManagementApp:
         
         # Create treeview
         self.create_treeview()
+
+        # Follow window resizes without rebuilding the dashboard
+        get_layout(self.root).attach(self.canvas, self.screen_width, self.screen_height,
+                                     on_settle=self.rescale_background)
+
+        # Database calls run on worker threads so the window never blocks on MySQL
+        self.queries = AsyncQueryRunner(self.root, self.db, on_busy=self.set_loading)
         
-        # Display initial data
-        self.display_employees()
+        # Columnar copy of the table, loaded on the first filter
+        self.cache = EmployeeCache()
+        self.cache_loading = False
+        self.cache_stale = False
+
+        # Analytics window, when open
+        self.analytics = None
+
+        # Query diagnostics window (F12), when open
+        self.diagnostics = None
+        self.root.bind("<F12>", lambda event: self.show_diagnostics())
+
+        # Follow other clients' writes through the change log
+        self.changes = ChangeFeed(self.db)
+        self.sync_job = None
+        if sync_interval_ms() > 0:
+            # The starting mark must be taken before the first page is read, or a
+            # write in between would reach neither; the first page waits for it
+            self.queries.run(self.changes.start, on_success=self.following,
+                             on_error=self.follow_failed, channel="sync", busy=False)
+        else:
+            # Display initial data - Exit if the server is unreachable
+            self.display_employees(on_error=self.connection_failed)
+
+    def load_cache(self):
+        """Load the employee cache in the background, unless already loading."""
+        if self.cache_loading:
+            return
+        self.cache_loading = True
+        self.cache_stale = False
+
+        def build():
+            cache = EmployeeCache()
+            cache.enable_search()  # Name/email index for the Find box, built during load
+            cache.load(self.db.stream(select_employees_sql(), batch_size=5000))
+            return cache
+
+        def loaded(cache):
+            self.cache_loading = False
+            if self.cache_stale:
+                # The app wrote to the table while the snapshot was being read
+                self.load_cache()
+            else:
+                self.cache = cache
+                if self.find_text.get().strip():
+                    self.find_employees()  # Typed while the cache was loading
+
+        def failed(error):
+            self.cache_loading = False
+
+        self.queries.run(build, on_success=loaded, on_error=failed, channel="cache")
+
+    def note_write(self):
+        """Flag an in-flight cache load as stale after one of our own writes."""
+        if self.cache_loading:
+            self.cache_stale = True
+
+    def schedule_sync(self, delay_ms=None):
+        interval = sync_interval_ms()
+        if interval <= 0:
+            return
+        self.sync_job = self.root.after(interval if delay_ms is None else delay_ms, self.sync)
+
+    def following(self, _):
+        """The change log mark is taken: show the first page and start polling."""
+        self.display_employees(on_error=self.connection_failed)
+        self.schedule_sync()
+
+    def follow_failed(self, error):
+        if getattr(error, "errno", None) != ER_NO_SUCH_TABLE:
+            self.connection_failed(error)
+            return
+        # Migration 0003 not applied; show the data without following changes
+        self.display_employees(on_error=self.connection_failed)
+
+    def sync(self):
+        """Poll the change log in the background and patch what other clients changed."""
+        self.sync_job = None
+        self.queries.run(self.changes.poll, on_success=self.synced, on_error=self.sync_failed,
+                         channel="sync", busy=False)
+
+    def synced(self, result):
+        rows, removed, more, reload = result
+        if reload:
+            # Missed entries were pruned; start over from a fresh snapshot
+            self.cache = EmployeeCache()
+            self.note_write()
+            self.display_employees()
+        elif rows or removed:
+            for row in rows:
+                self.cache.upsert(row)
+            for emp_id in removed:
+                self.cache.remove(emp_id)
+            self.note_write()
+            self.patch_grid(rows, removed)
+            self.refresh_analytics(with_percentiles=False)
+        self.schedule_sync(0 if more else None)
+
+    def sync_failed(self, error):
+        if getattr(error, "errno", None) == ER_NO_SUCH_TABLE:
+            return  # Migration 0003 not applied; nothing to follow
+        self.schedule_sync()  # Server hiccup; try again on the next tick
+
+    def connection_failed(self, error):
+        messagebox.showerror("Database Error", f"Failed to connect to the database: {error}")
+        self.root.quit()  # Properly terminate the mainloop
+
+    def set_loading(self, busy):
+        """Show or hide the loading indicator above the grid."""
+        if busy:
+            self.loading_label.place(
+                x=int(0.903 * self.screen_width) - 240,
+                y=int(0.342 * self.screen_height) - 30,
+                width=240
+            )
+            self.tree.configure(cursor="watch")
+        else:
+            self.loading_label.place_forget()
+            self.tree.configure(cursor="")
 
     def load_background_image(self):
         """Load and scale background image to fit the screen"""
         try:
-            # Load the image using PIL for better scaling
-            original_img = Image.open(self.relative_to_assets("image_1.png"))
-            # Resize to fit the screen
-            resized_img = original_img.resize((self.screen_width, self.screen_height), Image.LANCZOS)
-            # Convert to PhotoImage
-            self.image_image_1 = ImageTk.PhotoImage(resized_img)
+            # Scaled to fit the screen; repeat logins reuse the cached bitmap
+            self.image_image_1 = get_asset_cache().photo(
+                self.relative_to_assets("image_1.png"), self.screen_width, self.screen_height
+            )
             # Place on canvas
             self.image_1 = self.canvas.create_image(
                 self.screen_width/2, self.screen_height/2, 
@@ -680,6 +1374,12 @@ class EmployeeManagementApp:
     def relative_to_assets(self, path: str) -> Path:
         return self.assets_path / Path(path)
 
+    def rescale_background(self, width, height):
+        """Resample the background for a new window size once resizing stops."""
+        if hasattr(self, "image_1"):
+            self.image_image_1 = get_asset_cache().photo(self.relative_to_assets("image_1.png"), width, height)
+            self.canvas.itemconfigure(self.image_1, image=self.image_image_1)
+
     def create_buttons(self):
         # Common button configuration with rounded corners
         button_style = {
@@ -746,6 +1446,42 @@ class EmployeeManagementApp:
                 width=filter_btn_width,
                 height=int(0.05 * self.screen_height)
             )
+
+            # Bulk import sits to the left of Filter and Sort
+            import_btn = tk.Button(
+                self.root,
+                text="Import",
+                command=self.import_employees,
+                bg="#4B5EAA",
+                fg="white",
+                font=("Arial", 12, "bold"),
+                relief="raised",
+                bd=2
+            )
+            import_btn.place(
+                x=int(0.65 * self.screen_width),
+                y=int(0.085 * self.screen_height),
+                width=filter_btn_width,
+                height=int(0.05 * self.screen_height)
+            )
+
+            # Export of the current filter/sort, left of Import
+            export_btn = tk.Button(
+                self.root,
+                text="Export",
+                command=self.export_employees,
+                bg="#4B5EAA",
+                fg="white",
+                font=("Arial", 12, "bold"),
+                relief="raised",
+                bd=2
+            )
+            export_btn.place(
+                x=int(0.49 * self.screen_width),
+                y=int(0.085 * self.screen_height),
+                width=filter_btn_width,
+                height=int(0.05 * self.screen_height)
+            )
             
         else:
             # Single centered button for HR
@@ -762,6 +1498,24 @@ class EmployeeManagementApp:
                 height=button_height
             )
 
+        # Analytics for both roles, left of Export
+        analytics_btn = tk.Button(
+            self.root,
+            text="Analytics",
+            command=self.show_analytics,
+            bg="#4B5EAA",
+            fg="white",
+            font=("Arial", 12, "bold"),
+            relief="raised",
+            bd=2
+        )
+        analytics_btn.place(
+            x=int(0.33 * self.screen_width),
+            y=int(0.085 * self.screen_height),
+            width=int(0.15 * self.screen_width),
+            height=int(0.05 * self.screen_height)
+        )
+
         # Logout Button (always visible) with rounded corners
         logout_btn_width = int(0.09 * self.screen_width)
         logout_btn_height = int(0.05 * self.screen_height)
@@ -835,6 +1589,7 @@ class EmployeeManagementApp:
             style="Custom.Treeview",
             columns=("emp_id", "name", "post", "salary"),
             show="headings",
+            selectmode="extended",
             height=15
         )
 
@@ -859,15 +1614,140 @@ class EmployeeManagementApp:
             height=tree_height
         )
 
-    def display_employees(self):
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        # Scrollbar driven by the virtual grid rather than the treeview itself
+        scrollbar = ttk.Scrollbar(self.root, orient="vertical")
+        scrollbar.place(
+            x=(self.screen_width + tree_width)/2,
+            y=int(0.342 * self.screen_height),
+            height=tree_height
+        )
+        self.grid = VirtualTreeview(self.tree, scrollbar, rowheight=25)
+
+        # Shown while a query is in flight
+        self.loading_label = tk.Label(
+            self.root,
+            text="Loading...",
+            bg="#FFF3CD",
+            fg="#000000",
+            font=("Arial", 10, "bold")
+        )
+
+        # Search-as-you-type by name or email, answered from the employee cache
+        find_x = (self.screen_width - tree_width) / 2
+        find_y = int(0.342 * self.screen_height) - 30
+        tk.Label(self.root, text="Find:", bg="#FFFFFF", font=("Arial", 10, "bold")).place(x=find_x, y=find_y)
+        self.find_text = tk.StringVar()
+        tk.Entry(self.root, textvariable=self.find_text, font=("Arial", 11)).place(
+            x=find_x + 45, y=find_y, width=260
+        )
+        self.find_text.trace_add("write", self.schedule_find)
+        self.find_job = None
+        self.finding = False
+
+    def schedule_find(self, *args):
+        """Debounce keystrokes: search once typing pauses for FIND_DELAY_MS."""
+        if self.find_job is not None:
+            self.root.after_cancel(self.find_job)
+        self.find_job = self.root.after(FIND_DELAY_MS, self.find_employees)
+
+    def find_employees(self):
+        self.find_job = None
+        text = self.find_text.get().strip()
+        if not text:
+            if self.finding:
+                # Box cleared, back to the full list
+                self.finding = False
+                self.display_employees()
+            return
+        if not self.cache.loaded or self.cache.search_index is None:
+            self.load_cache()  # find_employees runs again once it is loaded
+            return
+
+        self.finding = True
+        rows = self.cache.search(text, limit=FIND_LIMIT)
+        ids = [row[0] for row in rows]
+        self.queries.cancel("grid")  # A page still loading must not replace the matches
+        found = set(ids)
+        if ids:
+            self.set_view([f"emp_id IN ({', '.join(['%s'] * len(ids))})"], ids,
+                          sort_field=None, matches=lambda row: row[0] in found)
+        else:
+            self.set_view(["1 = 0"], [], sort_field=None, matches=lambda row: False)
+        self.grid.set_rows(rows)
+
+    def display_employees(self, on_error=None):
+        self.show_pages(KeysetPaginator(self.db), on_error=on_error)
+
+    def show_pages(self, paginator, on_error=None, matches=None):
+        """Show a paginated query, fetching further pages as the grid scrolls.
+
+        Pages load in the background on the "grid" channel, so showing a new
+        query supersedes any page still in flight for the previous one.
+        ``matches`` is the row predicate of the query, used to patch the
+        grid after writes.
+        """
+        def loaded(employees):
+            self.grid.extend(employees, exhausted=paginator.exhausted)
+
+        def failed(error):
+            self.grid.extend([], exhausted=True)
+            if on_error is not None:
+                on_error(error)
+            else:
+                messagebox.showerror("Database Error", f"Error: {error}")
+
+        def load_more():
+            self.queries.run(paginator.next_page, on_success=loaded, on_error=failed, channel="grid")
+
+        self.set_view(paginator.conditions, paginator.params, paginator.sort_field,
+                      paginator.descending, matches=matches, paginator=paginator)
+        self.grid.set_rows([], more=load_more)
+
+    def set_view(self, conditions, params, sort_field="emp_id", descending=False,
+                 matches=None, reselect=None, paginator=None):
+        """Remember the filter and sort behind the grid, for export and patching.
+
+        ``matches(row)`` says whether a changed row belongs in the view;
+        ``reselect()`` recomputes a view served from the cache;
+        ``paginator`` is the KeysetPaginator feeding a paged view.
+        """
+        self.view = {
+            "conditions": list(conditions),
+            "params": list(params),
+            "sort_field": sort_field,
+            "descending": descending,
+            "matches": matches or (lambda row: True),
+            "reselect": reselect,
+            "paginator": paginator
+        }
 
-        query = "SELECT * FROM employees ORDER BY emp_id"
-        employees = self.db.fetchall(query)
+    def patch_grid(self, rows=(), removed=()):
+        """Apply our own writes to the grid without reloading it.
 
-        for emp in employees:
-            self.tree.insert("", tk.END, values=emp)
+        ``rows`` are new or changed full rows, ``removed`` emp_ids that are
+        gone. The current filter and sort are preserved.
+        """
+        view = self.view
+        if view["reselect"] is not None:
+            # Cache-served view: the cache is already patched, re-select locally
+            self.grid.replace_rows(view["reselect"](), rows, removed)
+            return
+        key = last_key = None
+        if view["sort_field"] is not None:
+            key = lambda row: row_sort_key(row, view["sort_field"])
+            paginator = view["paginator"]
+            if paginator is not None and paginator.last_row is not None:
+                # The next page starts after the cursor, not after the last row still shown
+                last_key = key(paginator.last_row)
+        matching = []
+        removed = list(removed)
+        for row in rows:
+            if view["matches"](row):
+                matching.append(row)
+            else:
+                removed.append(row[0])  # No longer fits the filter
+        # The whole batch in one pass over the grid rows and one render
+        self.grid.patch_rows(matching, removed, key, view["descending"], last_key)
 
     def show_add_employee_frame(self):
         add_window = tk.Toplevel(self.root)
@@ -899,15 +1779,22 @@ class EmployeeManagementApp:
                 messagebox.showwarning("Input Error", "All fields are required")
                 return
 
+            def saved(emp_id):
+                self.note_write()
+                row = (emp_id, name, post, salary, None)
+                self.cache.upsert(row)
+                self.patch_grid([row])  # Only the new row, in its sorted place
+                messagebox.showinfo("Success", "Employee added successfully")
+                add_window.destroy()
+
             try:
                 salary = float(salary)
-                self.db.execute_query(
+                self.queries.run(
+                    self.db.execute_query,
                     "INSERT INTO employees (name, post, salary) VALUES (%s, %s, %s)",
-                    (name, post, salary)
+                    (name, post, salary),
+                    on_success=saved
                 )
-                messagebox.showinfo("Success", "Employee added successfully")
-                self.display_employees()
-                add_window.destroy()
             except ValueError:
                 messagebox.showerror("Input Error", "Salary must be a number")
 
@@ -915,27 +1802,34 @@ class EmployeeManagementApp:
             row=3, column=0, columnspan=2, pady=10)
 
     def remove_employee(self):
-        selected = self.tree.selection()
+        selected = self.grid.selected_rows()
         if not selected:
             messagebox.showwarning("Selection Required", "Please select an employee to remove")
             return
 
-        emp_id = self.tree.item(selected[0])['values'][0]
-        if messagebox.askyesno("Confirm", "Are you sure you want to remove this employee?"):
-            self.db.execute_query("DELETE FROM employees WHERE emp_id = %s", (emp_id,))
-            self.db.reset_auto_increment()
-            messagebox.showinfo("Success", "Employee removed successfully")
-            self.display_employees()
+        emp_ids = [row[0] for row in selected]
+        prompt = ("Are you sure you want to remove this employee?" if len(emp_ids) == 1
+                  else f"Are you sure you want to remove these {len(emp_ids)} employees?")
+        if messagebox.askyesno("Confirm", prompt):
+            def removed(result):
+                self.note_write()
+                for emp_id in emp_ids:
+                    self.cache.remove(emp_id)
+                self.patch_grid(removed=emp_ids)
+                messagebox.showinfo("Success", f"{len(emp_ids)} employee(s) removed successfully")
+
+            # One set-based statement in one transaction, then the rows leave the grid
+            self.queries.run(self.db.delete_employees, emp_ids, on_success=removed)
 
     def promote_employee(self):
-        selected = self.tree.selection()
+        selected = self.grid.selected_rows()
         if not selected:
             messagebox.showwarning("Selection Required", "Please select an employee to promote")
             return
 
-        emp_id = self.tree.item(selected[0])['values'][0]
+        emp_ids = [row[0] for row in selected]
         promote_window = tk.Toplevel(self.root)
-        promote_window.title("Promote Employee")
+        promote_window.title("Promote Employee" if len(emp_ids) == 1 else f"Promote {len(emp_ids)} Employees")
         promote_window.geometry("400x200")
 
         frame = ttk.Frame(promote_window, padding=20)
@@ -958,33 +1852,33 @@ class EmployeeManagementApp:
                 return
 
             try:
-                # Build dynamic query based on provided fields
-                query = "UPDATE employees SET "
-                params = []
-                updates = []
+                # Build the update from the provided fields
+                fields = {}
 
                 if new_post:
-                    updates.append("post = %s")
-                    params.append(new_post)
+                    fields["post"] = new_post
 
                 if new_salary:
                     try:
-                        salary = float(new_salary)
-                        updates.append("salary = %s")
-                        params.append(salary)
+                        fields["salary"] = float(new_salary)
                     except ValueError:
                         messagebox.showerror("Input Error", "Salary must be a number")
                         return
 
-                # Add WHERE clause and emp_id
-                query += ", ".join(updates) + " WHERE emp_id = %s"
-                params.append(emp_id)
-
-                # Execute update
-                self.db.execute_query(query, params)
-                messagebox.showinfo("Success", "Employee promoted successfully")
-                self.display_employees()
-                promote_window.destroy()
+                def promoted(result):
+                    self.note_write()
+                    for emp_id in emp_ids:
+                        self.cache.update(emp_id, **fields)
+                    # The selected rows with the new values, moved to their sorted place
+                    self.patch_grid([
+                        tuple(fields.get(column, value) for column, value in zip(EMPLOYEE_COLUMNS, row))
+                        for row in selected
+                    ])
+                    messagebox.showinfo("Success", f"{len(emp_ids)} employee(s) promoted successfully")
+                    promote_window.destroy()
+
+                # One UPDATE ... WHERE emp_id IN (...) in the background
+                self.queries.run(self.db.update_employees, emp_ids, fields, on_success=promoted)
 
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to update employee: {e}")
@@ -992,6 +1886,268 @@ class EmployeeManagementApp:
         ttk.Button(frame, text="Save", command=save_promotion).grid(
             row=2, column=0, columnspan=2, pady=10)
 
+    def import_employees(self):
+        """Bulk import employees from a CSV, JSON or JSON Lines file."""
+        path = filedialog.askopenfilename(
+            title="Import Employees",
+            filetypes=[("Employee files", "*.csv *.json *.jsonl"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+
+        # The worker records progress here; the Tk side polls it into the loading label
+        status = {"report": None, "done": False}
+
+        def progress(report):
+            status["report"] = report
+
+        def imported(report):
+            status["done"] = True
+            self.note_write()
+            self.cache = EmployeeCache()  # Reloaded on the next filter
+            messagebox.showinfo("Import Complete", report.summary())
+            self.display_employees()
+
+        def failed(error):
+            status["done"] = True
+            messagebox.showerror(
+                "Import Failed",
+                f"Import stopped: {error}\nChunks committed before the error were kept."
+            )
+            self.display_employees()
+
+        self.queries.run(bulk_import, self.db, path, progress=progress,
+                         on_success=imported, on_error=failed)
+        self.show_progress(status, lambda r: f"{r.inserted:,} rows ({r.rows_per_second:,.0f}/s)")
+
+    def show_progress(self, status, describe):
+        """Poll a worker's progress report into the loading label until it is done."""
+        report = status["report"]
+        if status["done"] or self.queries.closed:
+            self.loading_label.configure(text="Loading...")
+            return
+        if report is not None:
+            self.loading_label.configure(text=describe(report))
+        self.root.after(200, self.show_progress, status, describe)
+
+    def export_employees(self):
+        """Export the current filter/sort straight from the database to a file."""
+        path = filedialog.asksaveasfilename(
+            title="Export Employees",
+            defaultextension=".csv",
+            filetypes=[
+                ("CSV", "*.csv"),
+                ("JSON Lines", "*.jsonl"),
+                ("Columnar binary", "*.empcol")
+            ]
+        )
+        if not path:
+            return
+        if Path(path).suffix.lower() not in EXPORT_FORMATS:
+            messagebox.showerror("Export Error", "Choose a .csv, .jsonl or .empcol file")
+            return
+
+        view = self.view
+        # Find keeps its match order in the grid (sort_field None); export those rows by ID
+        query = select_employees_sql(view["conditions"], view["sort_field"] or "emp_id", view["descending"])
+        status = {"report": None, "done": False}
+
+        def progress(report):
+            status["report"] = report
+
+        def exported(report):
+            status["done"] = True
+            messagebox.showinfo("Export Complete", report.summary())
+
+        def failed(error):
+            status["done"] = True
+            messagebox.showerror("Export Failed", f"Export stopped: {error}")
+
+        # Rows go from an unbuffered cursor to disk in fixed-size batches
+        batches = self.db.stream(query, view["params"], batch_size=5000)
+        self.queries.run(export_employees, batches, path, progress=progress,
+                         on_success=exported, on_error=failed)
+        self.show_progress(status, lambda r: f"{r.written:,} rows ({r.rows_per_second:,.0f}/s)")
+
+    def show_analytics(self):
+        """Headcount, salary statistics and salary bands per post."""
+        if self.analytics is not None and self.analytics["window"].winfo_exists():
+            self.analytics["window"].lift()
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("Workforce Analytics")
+        window.geometry("900x600")
+
+        frame = ttk.Frame(window, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        columns = ("post", "headcount", "total", "mean") + tuple(f"p{p}" for p in PERCENTILES)
+        headings = ["Post", "Headcount", "Total Salary", "Mean"] + [
+            "Median" if p == 50 else f"P{p}" for p in PERCENTILES
+        ]
+        table = ttk.Treeview(frame, columns=columns, show="headings", height=10, selectmode="browse")
+        for column, heading in zip(columns, headings):
+            table.heading(column, text=heading)
+            table.column(column, width=100, anchor="w" if column == "post" else "e")
+        table.pack(fill=tk.X)
+
+        chart = Canvas(frame, bg="#FFFFFF", height=260, highlightthickness=0)
+        chart.pack(fill=tk.BOTH, expand=True, pady=10)
+
+        status = ttk.Label(frame, text="Loading...")
+        status.pack(side=tk.LEFT)
+        ttk.Button(frame, text="Refresh", command=lambda: self.refresh_analytics()).pack(side=tk.RIGHT)
+
+        self.analytics = {"window": window, "table": table, "chart": chart, "status": status,
+                          "stats": {}, "percentiles": {}}
+        table.bind("<<TreeviewSelect>>", lambda event: self.draw_salary_bands())
+        chart.bind("<Configure>", lambda event: self.draw_salary_bands())
+        self.refresh_analytics()
+
+    def refresh_analytics(self, with_percentiles=True):
+        """Reload the analytics window, if open.
+
+        Headcounts, totals and bands come from the trigger-maintained
+        summary table and are cheap, so they follow every synced change;
+        percentiles rank the whole table on the server and are only
+        recomputed on open and on Refresh.
+        """
+        panel = self.analytics
+        if panel is None or not panel["window"].winfo_exists():
+            self.analytics = None
+            return
+
+        def loaded(result):
+            if self.analytics is not panel or not panel["window"].winfo_exists():
+                return
+            posts, overall = result
+            if with_percentiles:
+                panel["percentiles"] = {post_key(s.post): s.percentiles for s in posts}
+                panel["percentiles"][None] = overall.percentiles
+                panel["computed"] = datetime.now().strftime("%H:%M:%S")
+            self.show_analytics_rows(posts, overall)
+
+        def failed(error):
+            if panel["window"].winfo_exists():
+                panel["status"].configure(text=f"Could not load analytics: {error}")
+
+        self.queries.run(workforce_summary, self.db, live_conditions(), [], with_percentiles,
+                         on_success=loaded, on_error=failed, channel="analytics")
+
+    def show_analytics_rows(self, posts, overall):
+        panel = self.analytics
+        table = panel["table"]
+        selected = table.selection()
+        table.delete(*table.get_children())
+
+        def money(value):
+            return "-" if value is None else f"{value:,.0f}"
+
+        panel["stats"] = {}
+        for stats in [overall] + posts:
+            key = None if stats.post is None else post_key(stats.post)
+            percentiles = panel["percentiles"].get(key, {})
+            iid = "all" if key is None else f"post:{key}"
+            panel["stats"][iid] = stats
+            table.insert("", tk.END, iid=iid, values=(
+                stats.label, stats.headcount, money(stats.total), money(stats.mean),
+                *(money(percentiles.get(p)) for p in PERCENTILES)
+            ))
+        keep = [iid for iid in selected if table.exists(iid)]
+        table.selection_set(keep or ["all"])
+        panel["status"].configure(
+            text=f"{overall.headcount:,} employees in {len(posts)} posts; "
+                 f"percentiles as of {panel.get('computed', '-')}"
+        )
+        self.draw_salary_bands()
+
+    def draw_salary_bands(self):
+        """Bar chart of the selected post's salary bands."""
+        panel = self.analytics
+        if panel is None:
+            return
+        chart = panel["chart"]
+        chart.delete("all")
+        selected = panel["table"].selection()
+        stats = panel["stats"].get(selected[0] if selected else "all")
+        if stats is None:
+            return
+
+        width, height = chart.winfo_width(), chart.winfo_height()
+        top, bottom = 30, height - 40
+        slot = width / len(BAND_LABELS)
+        peak = max(stats.bands) or 1
+        chart.create_text(10, 10, anchor="nw", text=f"Salary bands: {stats.label}",
+                          font=("Arial", 11, "bold"))
+        for band, (label, count) in enumerate(zip(BAND_LABELS, stats.bands)):
+            x0 = band * slot + slot * 0.15
+            x1 = (band + 1) * slot - slot * 0.15
+            y0 = bottom - (bottom - top - 20) * count / peak
+            chart.create_rectangle(x0, y0, x1, bottom, fill="#4B5EAA", outline="")
+            chart.create_text((x0 + x1) / 2, y0 - 4, anchor="s", text=f"{count:,}")
+            chart.create_text((x0 + x1) / 2, bottom + 6, anchor="n", text=label)
+
+    def show_diagnostics(self):
+        """Per-statement-shape query timings of this process, refreshed every second."""
+        if self.diagnostics is not None and self.diagnostics["window"].winfo_exists():
+            self.diagnostics["window"].lift()
+            return
+
+        window = tk.Toplevel(self.root)
+        window.title("Query Diagnostics")
+        window.geometry("1100x500")
+
+        frame = ttk.Frame(window, padding=10)
+        frame.pack(fill=tk.BOTH, expand=True)
+
+        columns = ("shape", "count", "mean", "p50", "p95", "p99", "max", "rows", "bytes", "commit", "errors")
+        headings = ("Statement", "Count", "Mean ms", "P50 ms", "P95 ms", "P99 ms", "Max ms",
+                    "Rows", "Bytes", "Commit ms", "Errors")
+        table = ttk.Treeview(frame, columns=columns, show="headings", selectmode="browse")
+        for column, heading in zip(columns, headings):
+            table.heading(column, text=heading)
+            table.column(column, width=420 if column == "shape" else 70,
+                         anchor="w" if column == "shape" else "e", stretch=column == "shape")
+        table.pack(fill=tk.BOTH, expand=True)
+
+        status = ttk.Label(frame, text="")
+        status.pack(side=tk.LEFT, pady=(8, 0))
+        ttk.Button(frame, text="Reset", command=lambda: (self.db.metrics.reset(), self.refresh_diagnostics())
+                   ).pack(side=tk.RIGHT, pady=(8, 0))
+
+        self.diagnostics = {"window": window, "table": table, "status": status, "job": None}
+        self.refresh_diagnostics()
+
+    def refresh_diagnostics(self):
+        panel = self.diagnostics
+        if panel is None or not panel["window"].winfo_exists():
+            self.diagnostics = None
+            return
+        if panel["job"] is not None:
+            self.root.after_cancel(panel["job"])
+
+        table = panel["table"]
+        selected = table.selection()
+        table.delete(*table.get_children())
+        metrics = self.db.metrics
+        shapes = metrics.snapshot()
+        for index, stats in enumerate(shapes):
+            commit = f"{stats.commit_s * 1000 / stats.commits:.1f}" if stats.commits else "-"
+            table.insert("", tk.END, iid=str(index), values=(
+                stats.shape, stats.count, f"{stats.mean_ms:.1f}",
+                *(f"{stats.percentile_ms(p):.1f}" for p in (50, 95, 99)),
+                f"{stats.max_s * 1000:.1f}", f"{stats.rows:,}", f"{stats.bytes:,}", commit, stats.errors
+            ))
+        table.selection_set([iid for iid in selected if table.exists(iid)])
+
+        slow = f"slow-query log above {metrics.slow_ms:g} ms" if metrics.slow_ms else "slow-query log off"
+        panel["status"].configure(
+            text=f"{sum(s.count for s in shapes):,} statements in {len(shapes)} shapes since "
+                 f"{datetime.fromtimestamp(metrics.since).strftime('%H:%M:%S')}; {slow}"
+        )
+        panel["job"] = self.root.after(1000, self.refresh_diagnostics)
+
     def show_search_employee_frame(self):
         search_window = tk.Toplevel(self.root)
         search_window.title("Search Employee")
@@ -1012,18 +2168,16 @@ class EmployeeManagementApp:
 
             try:
                 emp_id = int(emp_id)
-                query = "SELECT * FROM employees WHERE emp_id = %s"
-                employees = self.db.fetchall(query, (emp_id,))
+                paginator = KeysetPaginator(self.db, ["emp_id = %s"], [emp_id])
 
-                for row in self.tree.get_children():
-                    self.tree.delete(row)
-
-                if not employees:
-                    messagebox.showinfo("Not Found", f"No employee found with ID: {emp_id}")
-                else:
-                    for emp in employees:
-                        self.tree.insert("", tk.END, values=emp)
+                def found(employees):
+                    self.set_view(paginator.conditions, paginator.params,
+                                  matches=lambda row: row[0] == emp_id)
+                    self.grid.set_rows(employees)
+                    if not employees:
+                        messagebox.showinfo("Not Found", f"No employee found with ID: {emp_id}")
 
+                self.queries.run(paginator.next_page, on_success=found, channel="grid")
                 search_window.destroy()
             except ValueError:
                 messagebox.showerror("Input Error", "Employee ID must be a number")
@@ -1072,16 +2226,8 @@ class EmployeeManagementApp:
         # Filter by Salary Range with better styling
         ttk.Label(frame, text="Salary Range:", font=("Arial", 12)).grid(row=1, column=0, padx=5, pady=10, sticky="w")
         salary_var = tk.StringVar(value="All")
-        salary_ranges = [
-            "All",
-            "Below 20000",
-            "20000-40000",
-            "40001-60000",
-            "60001-80000",
-            "Above 80000"
-        ]
         salary_combo = ttk.Combobox(frame, textvariable=salary_var,
-                                   values=salary_ranges,
+                                   values=SALARY_RANGES,
                                    state="readonly",
                                    width=20)
         salary_combo.grid(row=1, column=1, padx=5, pady=10, sticky="ew")
@@ -1122,38 +2268,32 @@ class EmployeeManagementApp:
                 sort_field = next(field[1] for field in sort_fields if field[0] == sort_var.get())
                 order = "ASC" if order_var.get() == "Ascending" else "DESC"
 
-                query = "SELECT * FROM employees WHERE 1=1"
-                params = []
-
-                # Add post filter
-                if post != "All":
-                    query += " AND post = %s"
-                    params.append(post)
-
-                # Add salary range filter
-                if salary_range != "All":
-                    if salary_range.startswith("Below"):
-                        query += " AND salary < %s"
-                        params.append(20000)
-                    elif salary_range.startswith("Above"):
-                        query += " AND salary > %s"
-                        params.append(80000)
-                    else:
-                        min_salary, max_salary = map(int, salary_range.split("-"))
-                        query += " AND salary BETWEEN %s AND %s"
-                        params.extend([min_salary, max_salary])
-
-                # Add sorting
-                query += f" ORDER BY {sort_field} {order}"
-
-                # Execute query and update treeview
-                employees = self.db.fetchall(query, params)
-                
-                for row in self.tree.get_children():
-                    self.tree.delete(row)
+                if self.cache.loaded:
+                    # Filter and sort locally from the columnar cache
+                    conditions, params = build_filter(post, salary_range)
+                    low, high, inclusive = salary_bounds(salary_range)
+
+                    def select():
+                        return self.cache.select(
+                            post=None if post == "All" else post,
+                            low=low, high=high, inclusive=inclusive,
+                            sort_field=sort_field,
+                            descending=order == "DESC"
+                        )
+
+                    self.set_view(conditions, params, sort_field, order == "DESC", reselect=select)
+                    self.grid.set_rows(select())
+                else:
+                    conditions, params = build_filter(post, salary_range)
+                    paginator = KeysetPaginator(
+                        self.db, conditions, params,
+                        sort_field=sort_field,
+                        descending=order == "DESC"
+                    )
 
-                for emp in employees:
-                    self.tree.insert("", tk.END, values=emp)
+                    # Stream the result into the grid page by page
+                    self.show_pages(paginator, matches=filter_predicate(post, salary_range))
+                    self.load_cache()
 
                 filter_window.destroy()
                 
@@ -1207,11 +2347,14 @@ class EmployeeManagementApp:
 
     def logout(self):
         if messagebox.askyesno("Logout", "Are you sure you want to logout?"):
-            # Clean up resources
-            if self.con:
-                self.cursor.close()
-                self.con.close()
-            
+            # Drop queries still in flight; connections stay in the shared pool
+            if self.sync_job is not None:
+                self.root.after_cancel(self.sync_job)
+            if self.diagnostics is not None and self.diagnostics["job"] is not None:
+                self.root.after_cancel(self.diagnostics["job"])
+            self.root.unbind("<F12>")
+            self.queries.close()
+
             # Clear the window
             for widget in self.root.winfo_children():
                 widget.destroy()
@@ -1224,21 +2367,89 @@ class EmployeeManagementApp:
             self.root.quit()
 
 # Main function to run the application
-def main():
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Employee Management System")
+    parser.add_argument("--migrate", action="store_true",
+                        help="apply pending schema migrations and exit")
+    parser.add_argument("--explain", action="store_true",
+                        help="EXPLAIN every query shape the app issues, flag full scans and exit")
+    parser.add_argument("--compact", action="store_true",
+                        help="purge soft-deleted employees (DB_ID_MODE=soft), prune the change log and exit")
+    parser.add_argument("--older-than", type=int, default=30, metavar="DAYS",
+                        help="with --compact, only purge rows deleted (and change-log entries "
+                             "written) more than DAYS ago (default 30)")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="launch the GUI under -X importtime, print time-to-first-paint "
+                             "and per-module import cost, then exit")
+    parser.add_argument("--startup-probe", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--profile-ui", metavar="FILE",
+                        help="time every Tk callback; on exit write folded stacks of the main "
+                             "thread (for flamegraph.pl or speedscope) to FILE and a report of "
+                             "the slowest handlers and worst stalls to FILE.txt")
+    parser.add_argument("--profile-threshold", type=float, default=50, metavar="MS",
+                        help="with --profile-ui, callbacks longer than MS count as stalls (default 50)")
+    args = parser.parse_args(argv)
+
+    if args.startup_report:
+        sys.exit(startup_report())
+
+    if args.migrate or args.explain or args.compact:
+        try:
+            if args.migrate and get_backend().name == "sqlite":
+                with get_pool().connection():
+                    pass  # The embedded file is created with every migration applied
+                print(f"{get_backend().path}: schema is up to date")
+            elif args.migrate:
+                with get_pool().connection() as con:
+                    apply_migrations(con)
+                    for version, name, applied in migration_status(con):
+                        print(f"{version:04d} {name}: {'applied' if applied else 'pending'}")
+            if args.explain:
+                flagged = explain_query_shapes(DatabaseOperations(get_pool(), show_errors=False))
+                if flagged:
+                    sys.exit(1)
+            if args.compact:
+                db = DatabaseOperations(get_pool(), show_errors=False)
+                purged = db.compact_deleted(args.older_than)
+                print(f"Purged {purged} soft-deleted employee(s)")
+                pruned = db.prune_changes(args.older_than)
+                print(f"Pruned {pruned} change-log entr{'y' if pruned == 1 else 'ies'}")
+        finally:
+            get_pool().close_all()
+        return
+
+    global _startup_probe
+    _startup_probe = args.startup_probe
+    startup_mark("main-imported")
+
+    profiler = None
+    if args.profile_ui:
+        from ui_profiler import UIProfiler  # Only loaded when profiling
+        profiler = UIProfiler(threshold_ms=args.profile_threshold).install()
+
     root = tk.Tk()
-    
-    # Set up window to track resize events
-    def on_resize(event):
-        # Pass the resize event to active page
-        for widget in root.winfo_children():
-            if hasattr(widget, 'update_layout'):
-                widget.update_layout(event)
-    
-    # Bind resize event
-    root.bind('<Configure>', on_resize)
-    
+
+    # Pages attach to the root's ResizeLayout, which coalesces resize events
+    get_layout(root)
+
     WelcomePage(root)
-    root.mainloop()
+    startup_mark("ready")
+    metrics_file = None if args.startup_probe else start_metrics_file()
+    if args.startup_probe:
+        root.update()
+        root.destroy()
+    else:
+        try:
+            root.mainloop()
+        finally:
+            if profiler is not None:
+                profiler.uninstall()
+                print(profiler.dump(args.profile_ui), end="")
+
+    # Stop background queries and close pooled connections on exit
+    shutdown()
+    if metrics_file is not None:
+        metrics_file.stop()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
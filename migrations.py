@@ -0,0 +1,84 @@
+import re
+from pathlib import Path
+
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent / "database" / "migrations"
+
+CREATE_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+  version INT NOT NULL PRIMARY KEY,
+  name VARCHAR(255) NOT NULL,
+  applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+
+def available_migrations(directory=MIGRATIONS_DIR):
+    """Return (version, name, path) for every NNNN_name.sql file, in order."""
+    migrations = []
+    for path in sorted(Path(directory).glob("*.sql")):
+        match = re.match(r"(\d+)_(.+)\.sql$", path.name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), path))
+    return migrations
+
+
+def split_statements(sql):
+    """Split a migration file into statements on a trailing ';', skipping comments."""
+    statements = []
+    current = []
+    for line in sql.splitlines():
+        stripped = line.strip()
+        if not stripped or stripped.startswith("--"):
+            continue
+        current.append(line)
+        if stripped.endswith(";"):
+            statements.append("\n".join(current).rstrip().rstrip(";"))
+            current = []
+    if current:
+        statements.append("\n".join(current))
+    return statements
+
+
+def applied_versions(con):
+    cursor = con.cursor()
+    cursor.execute(CREATE_MIGRATIONS_TABLE)
+    cursor.execute("SELECT version FROM schema_migrations")
+    versions = {row[0] for row in cursor.fetchall()}
+    cursor.close()
+    con.commit()
+    return versions
+
+
+def pending_migrations(con, directory=MIGRATIONS_DIR):
+    applied = applied_versions(con)
+    return [m for m in available_migrations(directory) if m[0] not in applied]
+
+
+def apply_migrations(con, directory=MIGRATIONS_DIR, log=print):
+    """Apply pending migrations in version order and record each one.
+
+    MySQL commits DDL implicitly, so a migration that fails half way is
+    not rolled back; it stays pending and has to be fixed by hand before
+    re-running. Returns the versions applied.
+    """
+    applied = []
+    for version, name, path in pending_migrations(con, directory):
+        log(f"Applying migration {version:04d} {name}")
+        cursor = con.cursor()
+        for statement in split_statements(path.read_text(encoding="utf-8")):
+            cursor.execute(statement)
+        cursor.execute(
+            "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+            (version, name)
+        )
+        con.commit()
+        cursor.close()
+        applied.append(version)
+    return applied
+
+
+def migration_status(con, directory=MIGRATIONS_DIR):
+    """Return (version, name, applied?) for every known migration."""
+    applied = applied_versions(con)
+    return [(v, n, v in applied) for v, n, _ in available_migrations(directory)]
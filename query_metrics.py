@@ -0,0 +1,297 @@
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+from pathlib import Path
+
+
+# Latency histogram bucket upper bounds, in milliseconds (the last bucket is unbounded)
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+slow_log = logging.getLogger("employee.slow_query")
+
+
+def statement_shape(query):
+    """Normalize a statement to its shape: one entry per query, whatever its values.
+
+    Whitespace is collapsed, literals become ``?`` and IN lists of any
+    length fold into ``IN (...)`` so chunked bulk updates share a shape.
+    """
+    shape = re.sub(r"\s+", " ", query.strip())
+    shape = re.sub(r"'(?:[^'\\]|\\.|'')*'", "?", shape)
+    shape = re.sub(r"(?<![\w.])\d+(?:\.\d+)?\b", "?", shape)
+    shape = shape.replace("%s", "?")
+    return re.sub(r"\bIN \(\?(?:, ?\?)*\)", "IN (...)", shape)
+
+
+def payload_bytes(rows):
+    """Approximate size of fetched rows: text/bytes by length, numbers and dates as 8."""
+    total = 0
+    for row in rows:
+        for value in row:
+            if value is None:
+                continue
+            if isinstance(value, str):
+                total += len(value.encode("utf-8"))
+            elif isinstance(value, (bytes, bytearray)):
+                total += len(value)
+            elif isinstance(value, Decimal):
+                total += len(str(value))
+            else:
+                total += 8
+    return total
+
+
+class ShapeStats:
+    """Counters of one statement shape."""
+
+    def __init__(self, shape):
+        self.shape = shape
+        self.count = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.rows = 0
+        self.bytes = 0
+        self.commits = 0
+        self.commit_s = 0.0
+
+    def add(self, elapsed, rows, nbytes, commit_s, error):
+        self.count += 1
+        self.errors += error
+        self.total_s += elapsed
+        self.max_s = max(self.max_s, elapsed)
+        self.buckets[bucket_index(elapsed * 1000)] += 1
+        self.rows += rows
+        self.bytes += nbytes
+        if commit_s is not None:
+            self.commits += 1
+            self.commit_s += commit_s
+
+    @property
+    def mean_ms(self):
+        return self.total_s * 1000 / self.count if self.count else 0.0
+
+    def percentile_ms(self, p):
+        """Upper bound of the bucket holding the p-th percentile (max latency for the last one)."""
+        if not self.count:
+            return 0.0
+        rank = -(-self.count * p // 100)
+        seen = 0
+        for index, hits in enumerate(self.buckets):
+            seen += hits
+            if seen >= rank:
+                if index < len(BUCKETS_MS):
+                    return min(float(BUCKETS_MS[index]), self.max_s * 1000)
+                break
+        return self.max_s * 1000
+
+
+def bucket_index(ms):
+    for index, bound in enumerate(BUCKETS_MS):
+        if ms <= bound:
+            return index
+    return len(BUCKETS_MS)
+
+
+class Measurement:
+    """One timed statement; see QueryMetrics.measure."""
+
+    def __init__(self):
+        self.rows = 0
+        self.bytes = 0
+        self.commit_s = None
+
+    def fetched(self, rows):
+        """Count a batch of fetched rows; returns them for chaining."""
+        self.rows += len(rows)
+        self.bytes += payload_bytes(rows)
+        return rows
+
+    def affected(self, count):
+        self.rows += max(count or 0, 0)
+
+    def commit(self, con):
+        started = time.perf_counter()
+        con.commit()
+        self.commit_s = time.perf_counter() - started
+
+
+class QueryMetrics:
+    """Per-shape latency histograms, row/byte counts and commit times, plus a slow-query log.
+
+    Thread-safe: worker threads record, the Tk thread and the metrics file
+    writer read snapshots. Statements slower than ``slow_ms`` (0 disables)
+    are logged with their SQL and params to the ``employee.slow_query``
+    logger.
+    """
+
+    def __init__(self, slow_ms=500):
+        self.slow_ms = slow_ms
+        self.lock = threading.Lock()
+        self.shapes = {}
+        self.since = time.time()
+
+    @contextmanager
+    def measure(self, query, params=None):
+        """Time the block as one execution of ``query``.
+
+        The block reports rows through the yielded Measurement and commits
+        with ``m.commit(con)`` so commit time is counted apart from the
+        statement itself. Statements that raise are counted as errors.
+        """
+        measurement = Measurement()
+        started = time.perf_counter()
+        error = False
+        try:
+            yield measurement
+        except Exception:
+            error = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            if measurement.commit_s is not None:
+                elapsed -= measurement.commit_s
+            self.record(query, params, elapsed, measurement.rows, measurement.bytes,
+                        measurement.commit_s, error)
+
+    def record(self, query, params, elapsed, rows=0, nbytes=0, commit_s=None, error=False):
+        shape = statement_shape(query)
+        with self.lock:
+            stats = self.shapes.get(shape)
+            if stats is None:
+                stats = self.shapes[shape] = ShapeStats(shape)
+            stats.add(elapsed, rows, nbytes, commit_s, error)
+        total_ms = (elapsed + (commit_s or 0)) * 1000
+        if self.slow_ms and total_ms >= self.slow_ms:
+            shown = repr(params)
+            if len(shown) > 500:  # Chunked IN lists carry up to 1000 ids
+                shown = shown[:500] + "..."
+            slow_log.warning("%.1f ms (%d rows%s): %s; params=%s", total_ms, rows,
+                             ", failed" if error else "", " ".join(query.split()), shown)
+
+    def snapshot(self):
+        """Copies of the ShapeStats, busiest (by total time) first."""
+        with self.lock:
+            shapes = []
+            for stats in self.shapes.values():
+                copy = ShapeStats(stats.shape)
+                copy.__dict__.update(stats.__dict__, buckets=list(stats.buckets))
+                shapes.append(copy)
+        return sorted(shapes, key=lambda s: s.total_s, reverse=True)
+
+    def reset(self):
+        with self.lock:
+            self.shapes = {}
+            self.since = time.time()
+
+    def exposition(self):
+        """The counters in the Prometheus text format, for node_exporter's textfile collector."""
+        shapes = self.snapshot()
+        lines = []
+
+        def family(name, kind, help_text):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def label(stats):
+            escaped = stats.shape.replace("\\", "\\\\").replace('"', '\\"')
+            return f'shape="{escaped}"'
+
+        family("employee_db_query_seconds", "histogram", "Statement latency by shape, excluding commit.")
+        for stats in shapes:
+            cumulative = 0
+            for bound, hits in zip(BUCKETS_MS, stats.buckets):
+                cumulative += hits
+                lines.append(f'employee_db_query_seconds_bucket{{{label(stats)},le="{bound / 1000:g}"}} {cumulative}')
+            lines.append(f'employee_db_query_seconds_bucket{{{label(stats)},le="+Inf"}} {stats.count}')
+            lines.append(f"employee_db_query_seconds_sum{{{label(stats)}}} {stats.total_s:.6f}")
+            lines.append(f"employee_db_query_seconds_count{{{label(stats)}}} {stats.count}")
+        counters = (
+            ("employee_db_query_errors_total", "Statements that raised, by shape.", "errors"),
+            ("employee_db_rows_total", "Rows fetched or affected, by shape.", "rows"),
+            ("employee_db_fetched_bytes_total", "Approximate bytes fetched, by shape.", "bytes"),
+            ("employee_db_commits_total", "Commits, by shape.", "commits"),
+        )
+        for name, help_text, attribute in counters:
+            family(name, "counter", help_text)
+            for stats in shapes:
+                lines.append(f"{name}{{{label(stats)}}} {getattr(stats, attribute)}")
+        family("employee_db_commit_seconds_total", "counter", "Time spent in commit, by shape.")
+        for stats in shapes:
+            lines.append(f"employee_db_commit_seconds_total{{{label(stats)}}} {stats.commit_s:.6f}")
+        family("employee_db_metrics_start_time_seconds", "gauge", "When the counters were last reset.")
+        lines.append(f"employee_db_metrics_start_time_seconds {self.since:.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Write ``exposition()`` to ``path`` atomically, so a scraper never reads half a file."""
+        path = Path(path)
+        temporary = path.with_name(path.name + ".tmp")
+        temporary.write_text(self.exposition(), encoding="utf-8")
+        os.replace(temporary, path)
+
+
+class MetricsFileWriter:
+    """Daemon thread rewriting the metrics file every ``interval`` seconds until stopped."""
+
+    def __init__(self, metrics, path, interval=15):
+        self.metrics = metrics
+        self.path = path
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.loop, name="metrics-writer", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def loop(self):
+        while not self.stopped.wait(self.interval):
+            self.write_quietly()
+
+    def write_quietly(self):
+        try:
+            self.metrics.write(self.path)
+        except OSError as e:
+            slow_log.error("Could not write metrics file %s: %s", self.path, e)
+
+    def stop(self):
+        """Stop the thread and write the final counters."""
+        self.stopped.set()
+        self.write_quietly()
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics():
+    """Return the process-wide QueryMetrics.
+
+    DB_SLOW_QUERY_MS sets the slow-query threshold; the log goes to stderr,
+    or appends to DB_SLOW_QUERY_LOG when set.
+    """
+    global _metrics
+    with _metrics_lock:
+        if _metrics is None:
+            _metrics = QueryMetrics(slow_ms=float(os.getenv("DB_SLOW_QUERY_MS", "500")))
+            log_path = os.getenv("DB_SLOW_QUERY_LOG")
+            if log_path:
+                handler = logging.FileHandler(log_path, encoding="utf-8")
+                handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+                slow_log.addHandler(handler)
+                slow_log.propagate = False
+        return _metrics
+
+
+def start_metrics_file():
+    """Start a MetricsFileWriter when DB_METRICS_FILE is set; returns it or None."""
+    path = os.getenv("DB_METRICS_FILE")
+    if not path:
+        return None
+    return MetricsFileWriter(get_metrics(), path, float(os.getenv("DB_METRICS_INTERVAL", "15"))).start()
@@ -0,0 +1,232 @@
+import heapq
+import itertools
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+
+class HandlerStats:
+    """Calls and main-loop time of one callback."""
+
+    def __init__(self, label):
+        self.label = label
+        self.calls = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.stalls = 0
+
+
+class Stall:
+    """One slow callback: how long it held the main loop and where it spent the time."""
+
+    def __init__(self, label, started, duration_s, samples, modal):
+        self.label = label
+        self.started = started
+        self.duration_s = duration_s
+        self.samples = samples  # Counter of folded stacks
+        self.modal = modal      # Ran a nested event loop (dialog, wait_window)
+
+
+class Invocation:
+    """A callback running on the Tk thread."""
+
+    def __init__(self, label):
+        self.label = label
+        self.started = time.perf_counter()
+        self.wall = datetime.now()
+        self.samples = Counter()
+        self.first_nested = None
+        self.last_nested = None
+
+
+def frame_label(code):
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}.{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def callback_label(func):
+    """Readable name of a Tk callback: Class.method, function or file:line of a lambda."""
+    code = getattr(func, "__code__", None)
+    if code is not None and code.co_name == "callit" and "func" in code.co_freevars and func.__closure__:
+        # Misc.after wraps the handler in a callit closure
+        func = func.__closure__[code.co_freevars.index("func")].cell_contents
+    while isinstance(func, partial):
+        func = func.func
+    owner = getattr(func, "__self__", None)
+    name = getattr(func, "__name__", type(func).__name__)
+    if owner is not None and not isinstance(owner, type(sys)):
+        return f"{type(owner).__name__}.{name}"
+    code = getattr(func, "__code__", None)
+    if code is not None and name == "<lambda>":
+        return f"<lambda> {os.path.basename(code.co_filename)}:{code.co_firstlineno}"
+    return getattr(func, "__qualname__", name)
+
+
+class UIProfiler:
+    """Opt-in profiler of the Tk event loop (python main.py --profile-ui FILE).
+
+    Wraps tkinter.CallWrapper, through which Tk invokes every Python
+    callback: widget commands, event bindings, variable traces and
+    ``after``/``after_idle`` handlers. Each top-level callback is timed as
+    a main-loop stall; while one runs, a sampler thread records the Tk
+    thread's Python stack every ``sample_ms``. Stalls over
+    ``threshold_ms`` are counted per handler and the ``keep`` worst are
+    kept with their stack samples. ``dump`` writes all samples as folded
+    stacks (flamegraph.pl, speedscope, inferno) plus a text report.
+
+    When a callback opens a dialog or otherwise runs a nested event loop,
+    the span between the first and the last nested callback is not
+    counted: the loop was serving events then.
+    """
+
+    def __init__(self, threshold_ms=50, keep=20, sample_ms=5):
+        self.threshold_s = threshold_ms / 1000
+        self.keep = keep
+        self.sample_s = sample_ms / 1000
+        self.handlers = {}
+        self.worst = []  # Min-heap of (duration, seq, Stall), at most ``keep`` entries
+        self.sequence = itertools.count()
+        self.folded = Counter()
+        self.lock = threading.Lock()
+        self.active = []  # Running callbacks, outermost first; more than one under a nested loop
+        self.original = None
+        self.stopped = threading.Event()
+        self.sampler = None
+        self.main_thread = threading.main_thread().ident
+        self.since = time.perf_counter()
+
+    def install(self):
+        """Start timing Tk callbacks; call before the widgets are created."""
+        import tkinter
+
+        profiler = self
+        self.original = original = tkinter.CallWrapper.__call__
+
+        def __call__(wrapper, *args):
+            return profiler.invoke(original, wrapper, args)
+
+        tkinter.CallWrapper.__call__ = __call__
+        self.wrapper_code = __call__.__code__
+        self.sampler = threading.Thread(target=self.sample_loop, name="ui-profiler", daemon=True)
+        self.sampler.start()
+        return self
+
+    def uninstall(self):
+        import tkinter
+
+        if self.original is not None:
+            tkinter.CallWrapper.__call__ = self.original
+            self.original = None
+        self.stopped.set()
+
+    def invoke(self, original, wrapper, args):
+        invocation = Invocation(callback_label(wrapper.func))
+        outer = self.active[-1] if self.active else None
+        if outer is not None and outer.first_nested is None:
+            # A nested event loop (messagebox, wait_window) is serving events
+            outer.first_nested = invocation.started
+        self.active.append(invocation)
+        try:
+            return original(wrapper, *args)
+        finally:
+            self.active.pop()
+            ended = time.perf_counter()
+            if outer is not None:
+                outer.last_nested = ended
+            self.finish(invocation, ended)
+
+    def finish(self, invocation, ended):
+        elapsed = ended - invocation.started
+        modal = invocation.first_nested is not None
+        if modal:
+            elapsed -= invocation.last_nested - invocation.first_nested
+        with self.lock:
+            stats = self.handlers.get(invocation.label)
+            if stats is None:
+                stats = self.handlers[invocation.label] = HandlerStats(invocation.label)
+            stats.calls += 1
+            stats.total_s += elapsed
+            stats.max_s = max(stats.max_s, elapsed)
+            if elapsed < self.threshold_s:
+                return
+            stats.stalls += 1
+            stall = Stall(invocation.label, invocation.wall, elapsed, invocation.samples, modal)
+            entry = (elapsed, next(self.sequence), stall)
+            if len(self.worst) < self.keep:
+                heapq.heappush(self.worst, entry)
+            else:
+                heapq.heappushpop(self.worst, entry)
+
+    def sample_loop(self):
+        while not self.stopped.wait(self.sample_s):
+            active = list(self.active)
+            if not active:
+                continue
+            frame = sys._current_frames().get(self.main_thread)
+            stack = self.stack_of(frame)
+            invocation = active[-1]
+            if invocation.first_nested is not None:
+                continue  # Idle in a nested event loop, waiting on a dialog
+            if stack is None or not self.active or self.active[-1] is not invocation:
+                continue
+            folded = ";".join([active[0].label] + stack)
+            invocation.samples[folded] += 1
+            with self.lock:
+                self.folded[folded] += 1
+
+    def stack_of(self, frame):
+        """Folded frames from the outermost callback down, or None outside a callback."""
+        codes = []  # Innermost first
+        outermost = None
+        while frame is not None:
+            if frame.f_code is self.wrapper_code:
+                outermost = len(codes)
+            codes.append(frame.f_code)
+            frame = frame.f_back
+        if outermost is None:
+            return None
+        # Drop the profiler's and tkinter's own frames between nested callbacks
+        return [frame_label(code) for code in reversed(codes[:outermost])
+                if code.co_filename != __file__
+                and os.path.basename(os.path.dirname(code.co_filename)) != "tkinter"]
+
+    def report(self, out=print, top=15):
+        with self.lock:
+            handlers = sorted(self.handlers.values(), key=lambda s: s.total_s, reverse=True)
+            worst = sorted(self.worst, reverse=True)
+        wall = time.perf_counter() - self.since
+        busy = sum(s.total_s for s in handlers)
+        out(f"Tk main loop: {wall:.1f} s wall, {busy:.2f} s in {sum(s.calls for s in handlers):,} "
+            f"callbacks ({busy / max(wall, 1e-9):.1%} busy); stall threshold {self.threshold_s * 1000:g} ms")
+        out(f"  {'total ms':>10} {'calls':>7} {'mean ms':>8} {'max ms':>8} {'stalls':>6}  handler")
+        for stats in handlers[:top]:
+            out(f"  {stats.total_s * 1000:10.1f} {stats.calls:7} {stats.total_s * 1000 / stats.calls:8.1f} "
+                f"{stats.max_s * 1000:8.1f} {stats.stalls:6}  {stats.label}")
+
+        out(f"\nWorst stalls ({len(worst)} kept):")
+        for duration, _, stall in worst:
+            modal = ", ran a nested event loop" if stall.modal else ""
+            out(f"  {duration * 1000:8.1f} ms  {stall.label} at {stall.started:%H:%M:%S}{modal}")
+            samples = sum(stall.samples.values())
+            for stack, count in stall.samples.most_common(3):
+                innermost = " < ".join(reversed(stack.split(";")[-4:]))
+                out(f"      {count / samples:4.0%}  {innermost}")
+
+    def dump(self, path):
+        """Write the folded stacks to ``path`` and the report to ``path`` + ".txt"."""
+        path = Path(path)
+        with self.lock:
+            folded = sorted(self.folded.items())
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in folded:
+                f.write(f"{stack} {count}\n")
+        lines = []
+        self.report(out=lines.append)
+        text = "\n".join(lines) + "\n"
+        path.with_name(path.name + ".txt").write_text(text, encoding="utf-8")
+        return text